@@ -11,6 +11,8 @@ import sys
 import matplotlib.pyplot as plt
 import pandas as pd
 
+from result_store import GAME_COLUMNS, aggregate_tests, iter_records, load_columns
+
 
 class AntsAIAnalyzer:
     def __init__(self, results_file: str = None):
@@ -21,13 +23,16 @@ class AntsAIAnalyzer:
         self.load_results()
 
     def load_results(self):
-        """Load results from JSON file into pandas DataFrame"""
+        """Load results from a JSON file or a JSONL result store"""
         try:
-            with open(self.results_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if self.results_file.endswith(".jsonl"):
+                self._load_store()
+            else:
+                with open(self.results_file, "r", encoding="utf-8") as f:
+                    data = json.load(f)
 
-            self.df = pd.DataFrame(data)
-            self.game_data = pd.DataFrame(self._extract_game_rows())
+                self.df = pd.DataFrame(data)
+                self.game_data = pd.DataFrame(self._extract_game_rows())
 
             print(f"✅ Loaded {len(self.df)} test results")
             if not self.game_data.empty:
@@ -40,6 +45,18 @@ class AntsAIAnalyzer:
             print(f"❌ Error loading results: {e}")
             sys.exit(1)
 
+    def _load_store(self):
+        """Stream a JSONL result store, reading only the analysis columns.
+
+        Replay data lives in sidecar files referenced by ``replay_path`` and
+        is never opened here.
+        """
+        summary_columns = ("test_name", "timestamp", "result", "turns")
+        self.df = pd.DataFrame(
+            aggregate_tests(iter_records(self.results_file, summary_columns))
+        )
+        self.game_data = pd.DataFrame(load_columns(self.results_file, GAME_COLUMNS))
+
     def _extract_game_rows(self):
         """Return normalized per-game dictionaries from aggregate rows."""
         if "game_results" not in self.df.columns:
@@ -403,7 +420,7 @@ def main():
         "--file",
         "-f",
         default="parallel_statistics.json",
-        help="Results file to analyze",
+        help="Results file to analyze (.json summary or .jsonl result store)",
     )
     parser.add_argument(
         "--validate",
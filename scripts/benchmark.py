@@ -11,6 +11,8 @@ Usage:
     python3 scripts/benchmark.py --games 10         # more games per matchup
     python3 scripts/benchmark.py --bot foo.py       # alternative bot
     python3 scripts/benchmark.py --map maps/foo.map # single map override
+    python3 scripts/benchmark.py --jobs 4 --seed 42 # 4 games at a time, resumable
+    python3 scripts/benchmark.py --sprt --games 40  # stop each matchup early
 
 Win/Loss is computed from ``player_0``'s perspective using the engine's
 own ranking (``rank`` field of the game result):
@@ -21,24 +23,61 @@ own ranking (``rank`` field of the game result):
 
 The script depends on the ``RESULT game_id=...`` line that ``playgame.py``
 prints by default; that contract is locked in by ``tests/test_playgame_result_line.py``.
+
+Finished games are appended to a JSONL result cache (``--cache``, default
+``<output-dir>/game_cache.jsonl``) keyed by the SHA-256 of every bot file and
+the helper modules beside it that it imports, the engine sources, the map
+file, both per-game seeds and the turn limit. Re-running with the same
+``--seed`` replays cached games and only plays the ones whose inputs changed,
+so editing one bot re-runs just the matchups it takes part in and an
+interrupted run resumes where it stopped. Games that end in ERROR are never
+cached.
+
+With ``--sprt`` the ``--games`` value becomes a per-matchup cap: games are
+played in batches (``--batch-size``, default ``--jobs``) and Wald's sequential
+probability ratio test on player_0's win rate runs after every batch. A
+matchup stops as soon as the win rate is confidently above or below
+``--sprt-threshold``; the decision, the test parameters and the games saved
+are recorded in the summary JSON under ``stopping_rule``.
+
+``playgame.py`` also prints a ``LATENCY`` line with every player's per-turn
+response time (engine-measured, resume to ``go``). The benchmark keeps those
+samples with each game and reports p50/p95/p99/max per bot for every matchup
+and every map size, warning when a bot's p99 reaches ``--latency-warn`` of the
+engine ``turntime``.
+
+Every freshly played game is also appended to the JSONL result store
+(``--store``, default ``<output-dir>/games.jsonl``) that
+``scripts/analyze_results.py`` reads; the store references each game's
+replay file in ``--log-dir`` instead of embedding it.
 """
 
 from __future__ import annotations
 
 import argparse
+import ast
+import functools
+import hashlib
 import json
+import math
 import random
 import re
 import shlex
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from result_store import ResultStore
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 PLAYGAME = REPO_ROOT / "src" / "tools" / "playgame.py"
+# Everything that decides a game besides the bots, the map and the seeds.
+ENGINE_PATHS = (REPO_ROOT / "src" / "ants", PLAYGAME)
 
 RESULT_RE = re.compile(
     r"^RESULT\s+game_id=(?P<game_id>\d+)\s+turns=(?P<turns>\d+)\s+winner=(?P<winner>\S+)\s+(?P<players>.*)$",
@@ -49,6 +88,13 @@ PLAYER_RE = re.compile(
     r"player_(?P<idx>\d+)=(?P<name>[^:]+):rank=(?P<rank>-?\d+),score=(?P<score>-?\d+),status=(?P<status>\S+)"
 )
 
+LATENCY_RE = re.compile(
+    r"^LATENCY\s+game_id=(?P<game_id>\d+)\s+turntime=(?P<turntime>\d+)(?P<players>.*)$",
+    re.MULTILINE,
+)
+
+LATENCY_PLAYER_RE = re.compile(r"player_(?P<idx>\d+)=(?P<samples>[\d.,]*)")
+
 
 @dataclass
 class GameOutcome:
@@ -60,6 +106,10 @@ class GameOutcome:
     engine_seed: Optional[int] = None
     player_seed: Optional[int] = None
     raw_stdout: str = ""
+    cached: bool = False
+    turntime_ms: Optional[int] = None
+    # per seat, per turn: ms from the engine resuming the bot to its "go"
+    latency_ms: List[List[float]] = field(default_factory=list)
 
     @property
     def our_score(self) -> int:
@@ -80,11 +130,181 @@ class GameOutcome:
             return "DRAW" if "player_0" in self.winner else "LOSS"
         return "WIN" if self.winner == "player_0" else "LOSS"
 
+    def to_dict(self) -> dict:
+        return {
+            "game_id": self.game_id,
+            "turns": self.turns,
+            "winner": self.winner,
+            "outcome": self.outcome_label(),
+            "duration_s": self.duration_s,
+            "engine_seed": self.engine_seed,
+            "player_seed": self.player_seed,
+            "players": self.players,
+            "turntime_ms": self.turntime_ms,
+            "latency_ms": self.latency_ms,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "GameOutcome":
+        return cls(
+            game_id=int(data["game_id"]),
+            turns=int(data["turns"]),
+            winner=str(data["winner"]),
+            players=list(data["players"]),
+            duration_s=float(data["duration_s"]),
+            engine_seed=data.get("engine_seed"),
+            player_seed=data.get("player_seed"),
+            turntime_ms=data.get("turntime_ms"),
+            latency_ms=data.get("latency_ms") or [],
+        )
+
+    def seat_labels(self) -> List[str]:
+        """Player names, disambiguated by seat when a bot plays itself."""
+
+        names = [str(p["name"]) for p in self.players]
+        return [
+            name if names.count(name) == 1 else "{0}[{1}]".format(name, i)
+            for i, name in enumerate(names)
+        ]
+
+
+@dataclass(frozen=True)
+class SprtRule:
+    """Wald's SPRT on player_0's win rate, treated as a Bernoulli trial.
+
+    H0 is ``p = threshold - margin`` and H1 is ``p = threshold + margin``;
+    ``alpha`` / ``beta`` are the false-positive / false-negative rates. Draws
+    and losses count as non-wins and ERROR games are left out of the test.
+    """
+
+    threshold: float = 0.5
+    margin: float = 0.2
+    alpha: float = 0.05
+    beta: float = 0.05
+
+    @property
+    def p0(self) -> float:
+        return self.threshold - self.margin
+
+    @property
+    def p1(self) -> float:
+        return self.threshold + self.margin
+
+    @property
+    def upper(self) -> float:
+        return math.log((1.0 - self.beta) / self.alpha)
+
+    @property
+    def lower(self) -> float:
+        return math.log(self.beta / (1.0 - self.alpha))
+
+    def llr(self, wins: int, trials: int) -> float:
+        """Log-likelihood ratio of H1 over H0 after ``wins`` of ``trials``."""
+
+        return wins * math.log(self.p1 / self.p0) + (trials - wins) * math.log(
+            (1.0 - self.p1) / (1.0 - self.p0)
+        )
+
+    def decide(self, wins: int, trials: int) -> Optional[str]:
+        """``"above"`` / ``"below"`` once a bound is crossed, else ``None``."""
+
+        llr = self.llr(wins, trials)
+        if llr >= self.upper:
+            return "above"
+        if llr <= self.lower:
+            return "below"
+        return None
+
+    def describe(self) -> dict:
+        return {
+            "rule": "sprt",
+            "threshold": self.threshold,
+            "margin": self.margin,
+            "p0": self.p0,
+            "p1": self.p1,
+            "alpha": self.alpha,
+            "beta": self.beta,
+            "llr_lower": self.lower,
+            "llr_upper": self.upper,
+        }
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending sequence (``q`` in 0..100)."""
+
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(q / 100.0 * len(sorted_values)))
+    return float(sorted_values[rank - 1])
+
+
+def latency_stats(samples: Iterable[float]) -> dict:
+    values = sorted(samples)
+    return {
+        "samples": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "max": float(values[-1]) if values else 0.0,
+    }
+
+
+def latency_warnings(
+    stats: Dict[str, dict], turntime_ms: Optional[int], fraction: float
+) -> List[str]:
+    """Bots whose p99 latency is at least ``fraction`` of ``turntime_ms``."""
+
+    if not turntime_ms:
+        return []
+    limit = fraction * turntime_ms
+    return [
+        "{0} p99={1:.0f}ms is {2:.0f}% of turntime {3}ms".format(
+            bot, st["p99"], 100.0 * st["p99"] / turntime_ms, turntime_ms
+        )
+        for bot, st in sorted(stats.items())
+        if st["samples"] and st["p99"] >= limit
+    ]
+
+
+def map_dimensions(map_file: Path) -> str:
+    """``"<rows>x<cols>"`` from a map header, or ``""`` if unreadable."""
+
+    rows = cols = None
+    try:
+        with open(map_file, "r", encoding="utf-8") as fh:
+            for line in fh:
+                if line.startswith("rows"):
+                    rows = int(line.split()[1])
+                elif line.startswith("cols"):
+                    cols = int(line.split()[1])
+                if rows is not None and cols is not None:
+                    return "{0}x{1}".format(rows, cols)
+    except OSError:
+        pass
+    return ""
+
 
 @dataclass
 class MatchupSummary:
     name: str
     games: List[GameOutcome] = field(default_factory=list)
+    stopping_rule: dict = field(default_factory=dict)
+    map_size: str = ""
+
+    def latency_samples(self) -> Dict[str, List[float]]:
+        samples: Dict[str, List[float]] = {}
+        for g in self.games:
+            for label, seat in zip(g.seat_labels(), g.latency_ms):
+                samples.setdefault(label, []).extend(seat)
+        return samples
+
+    def latency(self) -> Dict[str, dict]:
+        return {
+            bot: latency_stats(values) for bot, values in self.latency_samples().items()
+        }
+
+    def turntime_ms(self) -> Optional[int]:
+        return max((g.turntime_ms or 0 for g in self.games), default=0) or None
 
     def tally(self) -> dict:
         wins = sum(1 for g in self.games if g.outcome_label() == "WIN")
@@ -125,13 +345,232 @@ def parse_result_line(stdout: str) -> Optional[GameOutcome]:
         )
     if not players:
         return None
-    return GameOutcome(
+    outcome = GameOutcome(
         game_id=int(m.group("game_id")),
         turns=int(m.group("turns")),
         winner=m.group("winner"),
         players=players,
         duration_s=0.0,  # filled in by caller
     )
+    latency = parse_latency_line(stdout)
+    if latency is not None:
+        outcome.turntime_ms, outcome.latency_ms = latency
+    return outcome
+
+
+def parse_latency_line(stdout: str) -> Optional[tuple]:
+    """``(turntime_ms, per-seat latency lists)`` from the last LATENCY line."""
+
+    matches = list(LATENCY_RE.finditer(stdout))
+    if not matches:
+        return None
+    m = matches[-1]
+    seats: Dict[int, List[float]] = {}
+    for pm in LATENCY_PLAYER_RE.finditer(m.group("players")):
+        raw = pm.group("samples")
+        seats[int(pm.group("idx"))] = [float(v) for v in raw.split(",") if v]
+    return int(m.group("turntime")), [seats[i] for i in sorted(seats)]
+
+
+@functools.lru_cache(maxsize=None)
+def file_sha256(path: Path) -> str:
+    """Hex SHA-256 of a file's bytes (memoised for the life of the run)."""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def local_imports(path: Path) -> List[Path]:
+    """Modules in ``path``'s directory that ``path`` imports.
+
+    Both ``import helper`` and ``from <dir>.helper import ...`` (the bots'
+    package-style fallback) count; a file that does not parse imports
+    nothing.
+    """
+
+    try:
+        tree = ast.parse(path.read_bytes())
+    except (SyntaxError, ValueError):
+        return []
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            names.update(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level <= 1:
+            names.add(node.module)
+    found = []
+    for name in sorted(names):
+        parts = name.split(".")
+        if len(parts) == 2 and parts[0] == path.parent.name:
+            parts = parts[1:]
+        if len(parts) != 1:
+            continue
+        sibling = path.parent / f"{parts[0]}.py"
+        if sibling.is_file() and sibling != path:
+            found.append(sibling)
+    return found
+
+
+def bot_fingerprint(bot_cmd: str) -> str:
+    """Identify a bot by the content of the script its command runs.
+
+    The last command token that names an existing file is hashed, together
+    with the modules beside it that it imports, directly or through another
+    such module, so editing a shared helper replays every bot that uses it.
+    Commands without a file (e.g. ``java -cp dir HunterBot``) fall back to
+    the command text itself.
+    """
+
+    for token in reversed(shlex.split(bot_cmd)):
+        path = Path(token)
+        if not path.is_absolute():
+            path = REPO_ROOT / path
+        if path.is_file():
+            script = path.resolve()
+            if script.suffix != ".py":
+                return file_sha256(script)
+            seen = {script: file_sha256(script)}
+            pending = [script]
+            while pending:
+                for module in local_imports(pending.pop()):
+                    if module not in seen:
+                        seen[module] = file_sha256(module)
+                        pending.append(module)
+            if len(seen) == 1:
+                return seen[script]
+            hashes = {module.name: digest for module, digest in seen.items()}
+            blob = json.dumps(hashes, sort_keys=True).encode("utf-8")
+            return hashlib.sha256(blob).hexdigest()
+    return "cmd:" + bot_cmd
+
+
+@functools.lru_cache(maxsize=None)
+def engine_fingerprint() -> str:
+    """Hash of the engine and game runner sources (``ENGINE_PATHS``)."""
+
+    hashes = {}
+    for root in ENGINE_PATHS:
+        files = sorted(root.glob("*.py")) if root.is_dir() else [root]
+        for path in files:
+            if path.is_file():
+                hashes[str(path.relative_to(REPO_ROOT))] = file_sha256(path)
+    blob = json.dumps(hashes, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+def game_cache_key(
+    *,
+    bots: Sequence[str],
+    map_file: Path,
+    turns: int,
+    engine_seed: int,
+    player_seed: int,
+) -> str:
+    payload = {
+        "bots": [bot_fingerprint(b) for b in bots],
+        "map": file_sha256(Path(map_file).resolve()),
+        "engine": engine_fingerprint(),
+        "turns": turns,
+        "engine_seed": engine_seed,
+        "player_seed": player_seed,
+    }
+    blob = json.dumps(payload, sort_keys=True).encode("utf-8")
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ResultCache:
+    """Append-only JSONL store of finished games keyed by ``game_cache_key``.
+
+    Every ``put`` is written and flushed immediately so a run killed midway
+    keeps all games it completed. A truncated trailing line (the game that was
+    being written when the process died) is ignored on load.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self._entries: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as fh:
+                for line in fh:
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+                    if isinstance(record, dict) and "key" in record:
+                        self._entries[record["key"]] = record["outcome"]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[GameOutcome]:
+        data = self._entries.get(key)
+        if data is None:
+            return None
+        outcome = GameOutcome.from_dict(data)
+        outcome.cached = True
+        return outcome
+
+    def put(self, key: str, outcome: GameOutcome) -> None:
+        if outcome.outcome_label() == "ERROR":
+            return
+        data = outcome.to_dict()
+        line = json.dumps({"key": key, "outcome": data}, sort_keys=True)
+        with self._lock:
+            self._entries[key] = data
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(line + "\n")
+                fh.flush()
+
+
+def store_record(
+    outcome: GameOutcome, *, test_name: str, game: int, timestamp: str, map_file: Path
+) -> dict:
+    """Flatten a game into the analyzer's per-game columns.
+
+    The "enemy" is the highest-scoring opponent, which is the only opponent
+    in 2-player matchups.
+    """
+
+    opponents = sorted(outcome.players[1:], key=lambda p: -int(p["score"]))
+    enemy = opponents[0] if opponents else {"score": 0, "status": "unknown"}
+    try:
+        map_name = str(Path(map_file).resolve().relative_to(REPO_ROOT))
+    except ValueError:
+        map_name = str(map_file)
+    return {
+        "test_name": test_name,
+        "timestamp": timestamp,
+        "game": game,
+        "result": outcome.outcome_label(),
+        "our_score": outcome.our_score if outcome.players else 0,
+        "enemy_score": int(enemy["score"]),
+        "our_status": outcome.our_status if outcome.players else "unknown",
+        "enemy_status": str(enemy["status"]),
+        "turns": outcome.turns,
+        "time": outcome.duration_s,
+        "engine_seed": outcome.engine_seed,
+        "player_seed": outcome.player_seed,
+        "map": map_name,
+    }
+
+
+def _append_to_store(store: ResultStore, record: dict, replay_path: Path) -> None:
+    replaydata = None
+    if replay_path.exists():
+        try:
+            replaydata = json.loads(replay_path.read_text()).get("replaydata")
+        except (OSError, ValueError):
+            replaydata = None
+    store.append(
+        record,
+        replaydata=replaydata,
+        replay_path=replay_path if replaydata is not None else None,
+    )
 
 
 def run_one_game(
@@ -143,10 +582,13 @@ def run_one_game(
     engine_seed: int,
     player_seed: int,
     end_wait: float = 0.1,
+    game_id: int = 0,
 ) -> GameOutcome:
     cmd = [
         sys.executable,
         str(PLAYGAME),
+        "--game",
+        str(game_id),
         "--engine_seed",
         str(engine_seed),
         "--player_seed",
@@ -200,6 +642,23 @@ def run_one_game(
     return outcome
 
 
+def _print_game(i: int, games: int, outcome: GameOutcome) -> None:
+    scores = ",".join(str(p["score"]) for p in outcome.players)
+    statuses = ",".join(p["status"] for p in outcome.players)
+    timing = "cached" if outcome.cached else "{0:.2f}s".format(outcome.duration_s)
+    print(
+        "  game {0}/{1}  {2:>5s}  turns={3:<4}  scores=[{4}]  status=[{5}]  ({6})".format(
+            i,
+            games,
+            outcome.outcome_label(),
+            outcome.turns,
+            scores,
+            statuses,
+            timing,
+        )
+    )
+
+
 def run_matchup(
     *,
     name: str,
@@ -209,12 +668,31 @@ def run_matchup(
     log_dir: Path,
     turns: int,
     rng: random.Random,
+    jobs: int = 1,
+    cache: Optional[ResultCache] = None,
+    sprt: Optional[SprtRule] = None,
+    batch_size: Optional[int] = None,
+    latency_warn: float = 0.8,
+    store: Optional[ResultStore] = None,
+    timestamp: str = "",
 ) -> MatchupSummary:
     print("\n[matchup] {0}  ({1} games on {2})".format(name, games, map_file.name))
-    summary = MatchupSummary(name=name)
-    for i in range(1, games + 1):
-        engine_seed = rng.randint(1, 1_000_000)
-        player_seed = rng.randint(1, 1_000_000)
+    summary = MatchupSummary(name=name, map_size=map_dimensions(map_file))
+    # Draw every seed up front, in the historical order (engine then player
+    # per game), so results don't depend on which worker finishes first.
+    seeds = [
+        (rng.randint(1, 1_000_000), rng.randint(1, 1_000_000)) for _ in range(games)
+    ]
+    outcomes: List[Optional[GameOutcome]] = [None] * games
+    if sprt is None:
+        batch = games
+    else:
+        batch = batch_size or max(1, jobs)
+
+    def play(i: int, key: Optional[str]) -> GameOutcome:
+        engine_seed, player_seed = seeds[i]
+        # Concurrent games must not share ``<game_id>.replay``; the engine
+        # seed is unique per game and ties each replay back to its seeds.
         outcome = run_one_game(
             bots=bots,
             map_file=map_file,
@@ -222,21 +700,65 @@ def run_matchup(
             turns=turns,
             engine_seed=engine_seed,
             player_seed=player_seed,
+            game_id=engine_seed,
         )
-        scores = ",".join(str(p["score"]) for p in outcome.players)
-        statuses = ",".join(p["status"] for p in outcome.players)
-        print(
-            "  game {0}/{1}  {2:>5s}  turns={3:<4}  scores=[{4}]  status=[{5}]  ({6:.2f}s)".format(
-                i,
-                games,
-                outcome.outcome_label(),
-                outcome.turns,
-                scores,
-                statuses,
-                outcome.duration_s,
+        if cache is not None and key is not None:
+            cache.put(key, outcome)
+        if store is not None:
+            record = store_record(
+                outcome,
+                test_name=name,
+                game=i + 1,
+                timestamp=timestamp,
+                map_file=map_file,
             )
-        )
-        summary.games.append(outcome)
+            _append_to_store(store, record, log_dir / "{0}.replay".format(engine_seed))
+        _print_game(i + 1, games, outcome)
+        return outcome
+
+    decision = None
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as pool:
+        for start in range(0, games, max(1, batch)):
+            pending = []
+            for i in range(start, min(start + batch, games)):
+                key = None
+                if cache is not None:
+                    engine_seed, player_seed = seeds[i]
+                    key = game_cache_key(
+                        bots=bots,
+                        map_file=map_file,
+                        turns=turns,
+                        engine_seed=engine_seed,
+                        player_seed=player_seed,
+                    )
+                    outcomes[i] = cache.get(key)
+                if outcomes[i] is None:
+                    pending.append((i, key))
+                else:
+                    _print_game(i + 1, games, outcomes[i])
+            futures = [(i, pool.submit(play, i, key)) for i, key in pending]
+            for i, future in futures:
+                outcomes[i] = future.result()
+            if sprt is not None:
+                wins, trials = _sprt_counts(o for o in outcomes if o is not None)
+                decision = sprt.decide(wins, trials)
+                if decision is not None:
+                    break
+    summary.games.extend(o for o in outcomes if o is not None)
+    if sprt is None:
+        summary.stopping_rule = {"rule": "fixed", "games": games}
+    else:
+        wins, trials = _sprt_counts(summary.games)
+        played = len(summary.games)
+        summary.stopping_rule = {
+            **sprt.describe(),
+            "batch_size": batch,
+            "max_games": games,
+            "games_played": played,
+            "games_saved": games - played,
+            "llr": sprt.llr(wins, trials),
+            "decision": decision or "inconclusive",
+        }
     t = summary.tally()
     print(
         "  → {0} wins / {1} losses / {2} draws / {3} errors  win_rate={4:.0f}%  avg_turns={5:.0f}".format(
@@ -248,12 +770,59 @@ def run_matchup(
             t["avg_turns"],
         )
     )
+    if sprt is not None:
+        rule = summary.stopping_rule
+        print(
+            "  → SPRT {0} (p0={1:.2f}, p1={2:.2f}) after {3}/{4} games, {5} saved".format(
+                rule["decision"],
+                rule["p0"],
+                rule["p1"],
+                rule["games_played"],
+                rule["max_games"],
+                rule["games_saved"],
+            )
+        )
+    stats = summary.latency()
+    for bot, st in sorted(stats.items()):
+        print(
+            "  latency {0}: p50={1:.0f}ms p95={2:.0f}ms p99={3:.0f}ms max={4:.0f}ms".format(
+                bot, st["p50"], st["p95"], st["p99"], st["max"]
+            )
+        )
+    for warning in latency_warnings(stats, summary.turntime_ms(), latency_warn):
+        print("  ! latency warning: {0}".format(warning))
     return summary
 
 
+def _sprt_counts(outcomes: Iterable[GameOutcome]) -> tuple:
+    """(wins, trials) for the SPRT; ERROR games are not trials."""
+
+    labels = [o.outcome_label() for o in outcomes]
+    trials = sum(1 for label in labels if label != "ERROR")
+    return labels.count("WIN"), trials
+
+
+def latency_by_map_size(summaries: Iterable[MatchupSummary]) -> Dict[str, dict]:
+    """Per map size, per bot latency stats pooled across matchups."""
+
+    pooled: Dict[str, Dict[str, List[float]]] = {}
+    for s in summaries:
+        by_bot = pooled.setdefault(s.map_size or "unknown", {})
+        for bot, values in s.latency_samples().items():
+            by_bot.setdefault(bot, []).extend(values)
+    return {
+        size: {bot: latency_stats(values) for bot, values in by_bot.items()}
+        for size, by_bot in pooled.items()
+    }
+
+
 def write_summary(
-    summaries: Iterable[MatchupSummary], output_dir: Path, master_seed: int
+    summaries: Iterable[MatchupSummary],
+    output_dir: Path,
+    master_seed: int,
+    latency_warn: float = 0.8,
 ) -> Path:
+    summaries = list(summaries)
     output_dir.mkdir(parents=True, exist_ok=True)
     timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
     summary_path = output_dir / f"summary_{timestamp}.md"
@@ -270,8 +839,34 @@ def write_summary(
     )
     lines.append("|---|---:|---:|---:|---:|---:|---:|---:|")
     json_blob = []
+    stop_lines = []
+    latency_lines = []
+    warnings = []
     for s in summaries:
         t = s.tally()
+        rule = s.stopping_rule
+        stats = s.latency()
+        for bot, st in sorted(stats.items()):
+            latency_lines.append(
+                "| {0} | {1} | {2} | {3} | {p50:.0f} | {p95:.0f} | {p99:.0f} | {max:.0f} |".format(
+                    s.name, s.map_size, bot, st["samples"], **st
+                )
+            )
+        warnings += [
+            "{0}: {1}".format(s.name, w)
+            for w in latency_warnings(stats, s.turntime_ms(), latency_warn)
+        ]
+        if rule.get("rule") == "sprt":
+            stop_lines.append(
+                "| {0} | {1} | {2} | {3} | {4} | {5:.2f} |".format(
+                    s.name,
+                    rule["decision"],
+                    rule["games_played"],
+                    rule["max_games"],
+                    rule["games_saved"],
+                    rule["llr"],
+                )
+            )
         lines.append(
             "| {name} | {wins} | {losses} | {draws} | {errors} | {win_rate:.0f}% | {avg_turns:.0f} | {avg_time:.1f}s |".format(
                 name=s.name,
@@ -283,23 +878,64 @@ def write_summary(
                 "matchup": s.name,
                 "master_seed": master_seed,
                 "tally": t,
-                "games": [
-                    {
-                        "game_id": g.game_id,
-                        "turns": g.turns,
-                        "winner": g.winner,
-                        "outcome": g.outcome_label(),
-                        "duration_s": g.duration_s,
-                        "engine_seed": g.engine_seed,
-                        "player_seed": g.player_seed,
-                        "players": g.players,
-                    }
-                    for g in s.games
-                ],
+                "stopping_rule": rule,
+                "map_size": s.map_size,
+                "turntime_ms": s.turntime_ms(),
+                "latency": stats,
+                "games": [g.to_dict() for g in s.games],
             }
         )
+    if stop_lines:
+        lines += [
+            "",
+            "## Sequential stopping (SPRT)",
+            "",
+            "| Matchup | Decision | Played | Cap | Saved | LLR |",
+            "|---|---|---:|---:|---:|---:|",
+            *stop_lines,
+        ]
+    by_size = latency_by_map_size(summaries)
+    if latency_lines:
+        lines += [
+            "",
+            "## Turn latency (ms, resume to go)",
+            "",
+            "| Matchup | Map size | Bot | Turns | p50 | p95 | p99 | max |",
+            "|---|---|---|---:|---:|---:|---:|---:|",
+            *latency_lines,
+            "",
+            "| Map size | Bot | Turns | p50 | p95 | p99 | max |",
+            "|---|---|---:|---:|---:|---:|---:|",
+        ]
+        for size in sorted(by_size):
+            for bot, st in sorted(by_size[size].items()):
+                lines.append(
+                    "| {0} | {1} | {2} | {p50:.0f} | {p95:.0f} | {p99:.0f} | {max:.0f} |".format(
+                        size, bot, st["samples"], **st
+                    )
+                )
+    if warnings:
+        lines += [
+            "",
+            "Latency warnings (p99 >= {0:.0%} of turntime):".format(latency_warn),
+            "",
+        ]
+        lines += ["- " + w for w in warnings]
     summary_path.write_text("\n".join(lines) + "\n")
     json_path.write_text(json.dumps(json_blob, indent=2) + "\n")
+    latency_path = output_dir / f"latency_{timestamp}.json"
+    latency_path.write_text(
+        json.dumps(
+            {
+                "latency_warn_fraction": latency_warn,
+                "by_matchup": {s.name: s.latency() for s in summaries},
+                "by_map_size": by_size,
+                "warnings": warnings,
+            },
+            indent=2,
+        )
+        + "\n"
+    )
     return summary_path
 
 
@@ -348,7 +984,74 @@ def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
         action="store_true",
         help="Quick smoke-suite: 2 games per matchup, 200 turns",
     )
-    return p.parse_args(argv)
+    p.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Games to run concurrently within a matchup (default: 1)",
+    )
+    p.add_argument(
+        "--cache",
+        default=None,
+        help="JSONL result cache (default: <output-dir>/game_cache.jsonl)",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Play every game even if a cached result exists",
+    )
+    p.add_argument(
+        "--store",
+        default=None,
+        help="JSONL result store for analyze_results.py "
+        "(default: <output-dir>/games.jsonl)",
+    )
+    p.add_argument(
+        "--sprt",
+        action="store_true",
+        help="Stop each matchup early with a sequential probability ratio "
+        "test; --games becomes the per-matchup cap",
+    )
+    p.add_argument(
+        "--sprt-threshold",
+        type=float,
+        default=0.5,
+        help="Win rate the SPRT decides above/below (default: 0.5)",
+    )
+    p.add_argument(
+        "--sprt-margin",
+        type=float,
+        default=0.2,
+        help="Half-width of the indifference region around the threshold "
+        "(default: 0.2, i.e. H0 p=0.3 vs H1 p=0.7)",
+    )
+    p.add_argument(
+        "--sprt-alpha", type=float, default=0.05, help="SPRT false-positive rate"
+    )
+    p.add_argument(
+        "--sprt-beta", type=float, default=0.05, help="SPRT false-negative rate"
+    )
+    p.add_argument(
+        "--batch-size",
+        type=int,
+        default=None,
+        help="Games per SPRT batch (default: --jobs)",
+    )
+    p.add_argument(
+        "--latency-warn",
+        type=float,
+        default=0.8,
+        help="Warn when a bot's p99 turn latency reaches this fraction of "
+        "turntime (default: 0.8)",
+    )
+    args = p.parse_args(argv)
+    if args.sprt and not (
+        0.0 < args.sprt_threshold - args.sprt_margin
+        and args.sprt_threshold + args.sprt_margin < 1.0
+    ):
+        p.error("--sprt-threshold +/- --sprt-margin must stay inside (0, 1)")
+    return args
 
 
 def main(argv: Optional[Sequence[str]] = None) -> int:
@@ -370,6 +1073,18 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     map_4p = (REPO_ROOT / args.map_4p).resolve()
     log_dir = (REPO_ROOT / args.log_dir).resolve()
     log_dir.mkdir(parents=True, exist_ok=True)
+    cache = None
+    if not args.no_cache:
+        cache_path = (
+            Path(args.cache)
+            if args.cache
+            else REPO_ROOT / args.output_dir / "game_cache.jsonl"
+        )
+        cache = ResultCache(cache_path)
+    store = ResultStore(
+        Path(args.store) if args.store else REPO_ROOT / args.output_dir / "games.jsonl"
+    )
+    run_timestamp = time.strftime("%Y-%m-%d_%H-%M-%S")
 
     xathis = "{0} src/bots/xathis_bot.py".format(sys.executable)
 
@@ -401,6 +1116,22 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
     print("Master seed    : {0}".format(master_seed))
     print("2P map         : {0}".format(args.map))
     print("4P map         : {0}".format(args.map_4p))
+    print("Jobs           : {0}".format(args.jobs))
+    sprt = None
+    if args.sprt:
+        sprt = SprtRule(
+            threshold=args.sprt_threshold,
+            margin=args.sprt_margin,
+            alpha=args.sprt_alpha,
+            beta=args.sprt_beta,
+        )
+        print(
+            "Stopping rule  : SPRT p0={0:.2f} p1={1:.2f} alpha={2} beta={3}".format(
+                sprt.p0, sprt.p1, sprt.alpha, sprt.beta
+            )
+        )
+    if cache is not None:
+        print("Result cache   : {0} ({1} games)".format(cache.path, len(cache)))
 
     summaries = []
     for name, bots, mp in matchups:
@@ -416,10 +1147,19 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
                 log_dir=log_dir,
                 turns=args.turns,
                 rng=rng,
+                jobs=args.jobs,
+                cache=cache,
+                sprt=sprt,
+                batch_size=args.batch_size,
+                latency_warn=args.latency_warn,
+                store=store,
+                timestamp=run_timestamp,
             )
         )
 
-    summary_path = write_summary(summaries, REPO_ROOT / args.output_dir, master_seed)
+    summary_path = write_summary(
+        summaries, REPO_ROOT / args.output_dir, master_seed, args.latency_warn
+    )
     try:
         display_path = summary_path.relative_to(REPO_ROOT)
     except ValueError:
@@ -433,6 +1173,9 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
             overall_wins, overall_total, 100.0 * overall_wins / overall_total
         )
     )
+    if sprt is not None:
+        saved = sum(s.stopping_rule["games_saved"] for s in summaries)
+        print("SPRT saved {0} of {1} games".format(saved, args.games * len(summaries)))
     return 0
 
 
@@ -0,0 +1,316 @@
+#!/usr/bin/env python3
+"""Mine per-turn metrics out of ``game_logs/*.replay`` files.
+
+A replay stores every ant, food item and hill as an interval record
+(``[row, col, start_turn, end_turn, ...]``) plus, for ants, one order
+character per turn. That is enough to rebuild per-turn aggregates directly,
+without running the engine:
+
+* ``ants_alive``    ants on the board at the end of each turn, per player;
+* ``food_taken``    cumulative food gathered by each player;
+* ``hills_razed``   cumulative hills each player has lost;
+* ``first_contact`` first turn an ant of each player was within view radius
+  of an enemy ant (``None`` if it never happened).
+
+Every game contributes one row per metric to an append-only JSONL store
+(``values`` holds the per-player series), so ``result_store.load_columns``
+can read any column without touching the replays again. Replays are decoded
+in a process pool, and a replay already in the store with the same size and
+mtime is skipped, so re-running after more games only mines the new files.
+
+Usage:
+    python3 scripts/replay_miner.py
+    python3 scripts/replay_miner.py --jobs 8 game_logs/*.replay
+    python3 scripts/replay_miner.py --store results/metrics.jsonl other_logs
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from result_store import ResultStore, iter_records
+
+DEFAULT_STORE = "game_logs/replay_metrics.jsonl"
+DEFAULT_INPUTS = ("game_logs/*.replay",)
+METRICS = ("ants_alive", "food_taken", "hills_razed", "first_contact")
+
+DIRECTIONS = {"n": (-1, 0), "e": (0, 1), "s": (1, 0), "w": (0, -1)}
+
+SourceKey = Tuple[str, int, int]
+
+
+def load_replaydata(path) -> Tuple[dict, dict]:
+    """``(replaydata, game_result)`` from a playgame replay or a bare sidecar."""
+
+    with open(path, "r", encoding="utf-8") as fh:
+        data = json.load(fh)
+    if "replaydata" in data:
+        return data["replaydata"], data
+    return data, {}
+
+
+def game_length(replay: dict) -> int:
+    """Last turn played; ``turns`` in the replay is only the limit."""
+
+    scores = replay.get("scores") or []
+    if scores:
+        return max(len(history) for history in scores) - 1
+    return int(replay.get("turns", 0))
+
+
+def _interval_counts(intervals, players: int, length: int) -> List[List[int]]:
+    """Per-player count of ``(owner, start, end)`` intervals live at each turn."""
+
+    deltas = [[0] * (length + 2) for _ in range(players)]
+    for owner, start, end in intervals:
+        deltas[owner][min(start, length + 1)] += 1
+        deltas[owner][min(end, length + 1)] -= 1
+    counts = []
+    for row in deltas:
+        running, series = 0, []
+        for delta in row[: length + 1]:
+            running += delta
+            series.append(running)
+        counts.append(series)
+    return counts
+
+
+def ants_alive(replay: dict, length: int) -> List[List[int]]:
+    """An ant is on the board at the end of turns ``spawn .. end - 1``."""
+
+    return _interval_counts(
+        ((ant[4], ant[2], ant[3]) for ant in replay.get("ants", [])),
+        replay["players"],
+        length,
+    )
+
+
+def food_taken(replay: dict, length: int) -> List[List[int]]:
+    """Food records carry an owner only when an ant gathered them."""
+
+    return _interval_counts(
+        (
+            (food[4], food[3], length + 1)
+            for food in replay.get("food", [])
+            if len(food) > 4
+        ),
+        replay["players"],
+        length,
+    )
+
+
+def hills_razed(replay: dict, length: int) -> List[List[int]]:
+    """Surviving hills end at ``length + 1``; anything earlier was razed."""
+
+    return _interval_counts(
+        (
+            (hill[2], hill[3], length + 1)
+            for hill in replay.get("hills", [])
+            if hill[3] <= length
+        ),
+        replay["players"],
+        length,
+    )
+
+
+def first_contact(replay: dict, length: int) -> List[Optional[int]]:
+    """First turn each player had an ant within view radius of an enemy.
+
+    Ant positions are replayed from their order strings (order ``k`` is the
+    move made on turn ``spawn + k + 1``). Each turn the live ants are hashed
+    into a torus grid of cells at least one view radius wide, so only the
+    3x3 cell neighbourhood is compared. Stops once every player has made
+    contact.
+    """
+
+    players = replay["players"]
+    rows, cols = replay["map"]["rows"], replay["map"]["cols"]
+    radius2 = replay.get("viewradius2", 77)
+    span = max(1, int(radius2**0.5) + 1)
+    cell_rows, cell_cols = max(1, rows // span), max(1, cols // span)
+    contact: List[Optional[int]] = [None] * players
+
+    pending = sorted(replay.get("ants", []), key=lambda ant: ant[2])
+    alive: List[list] = []
+    cursor = 0
+    for turn in range(length + 1):
+        while cursor < len(pending) and pending[cursor][2] <= turn:
+            row, col, spawn, end, owner, orders = pending[cursor][:6]
+            alive.append([row, col, spawn, end, owner, orders])
+            cursor += 1
+        still_alive = []
+        for ant in alive:
+            if ant[3] <= turn:
+                continue
+            step = turn - ant[2] - 1
+            if 0 <= step < len(ant[5]):
+                d_row, d_col = DIRECTIONS.get(ant[5][step], (0, 0))
+                ant[0] = (ant[0] + d_row) % rows
+                ant[1] = (ant[1] + d_col) % cols
+            still_alive.append(ant)
+        alive = still_alive
+
+        cells: Dict[Tuple[int, int], List[list]] = {}
+        for ant in alive:
+            key = (ant[0] * cell_rows // rows, ant[1] * cell_cols // cols)
+            cells.setdefault(key, []).append(ant)
+        for ant in alive:
+            if contact[ant[4]] is not None:
+                continue
+            cell_row = ant[0] * cell_rows // rows
+            cell_col = ant[1] * cell_cols // cols
+            neighbours = {
+                ((cell_row + dr) % cell_rows, (cell_col + dc) % cell_cols)
+                for dr in (-1, 0, 1)
+                for dc in (-1, 0, 1)
+            }
+            for key in neighbours:
+                for other in cells.get(key, ()):
+                    if other[4] == ant[4]:
+                        continue
+                    d_row = abs(ant[0] - other[0])
+                    d_col = abs(ant[1] - other[1])
+                    d_row = min(d_row, rows - d_row)
+                    d_col = min(d_col, cols - d_col)
+                    if d_row * d_row + d_col * d_col <= radius2:
+                        contact[ant[4]] = turn
+                        if contact[other[4]] is None:
+                            contact[other[4]] = turn
+                        break
+                if contact[ant[4]] is not None:
+                    break
+        if all(seen is not None for seen in contact):
+            break
+    return contact
+
+
+def source_key(path) -> SourceKey:
+    stat = os.stat(path)
+    return (str(path), stat.st_size, stat.st_mtime_ns)
+
+
+def mine_replay(path) -> List[dict]:
+    """One store row per metric for ``path`` (an ``error`` row on failure)."""
+
+    replay_path, size, mtime_ns = source_key(path)
+    base = {"replay": replay_path, "replay_size": size, "replay_mtime_ns": mtime_ns}
+    try:
+        replay, result = load_replaydata(path)
+        length = game_length(replay)
+        base.update(
+            {
+                "game_id": result.get("game_id"),
+                "playernames": result.get("playernames"),
+                "players": replay["players"],
+                "turns": length,
+                "map_size": "{0}x{1}".format(
+                    replay["map"]["rows"], replay["map"]["cols"]
+                ),
+                "engine_seed": replay.get("engine_seed"),
+                "player_seed": replay.get("player_seed"),
+            }
+        )
+        values = {
+            "ants_alive": ants_alive(replay, length),
+            "food_taken": food_taken(replay, length),
+            "hills_razed": hills_razed(replay, length),
+            "first_contact": first_contact(replay, length),
+        }
+    except (OSError, ValueError, KeyError, IndexError, TypeError) as exc:
+        return [dict(base, metric="error", values=None, error=repr(exc))]
+    return [dict(base, metric=name, values=values[name]) for name in METRICS]
+
+
+def processed_sources(store_path) -> Set[SourceKey]:
+    """Replays (path, size, mtime) already present in the store."""
+
+    if not Path(store_path).exists():
+        return set()
+    columns = ("replay", "replay_size", "replay_mtime_ns")
+    return {
+        (row["replay"], row["replay_size"], row["replay_mtime_ns"])
+        for row in iter_records(store_path, columns)
+    }
+
+
+def expand_inputs(inputs: Sequence[str]) -> List[str]:
+    """Replay paths from files, directories and globs, sorted and unique."""
+
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "*.replay")))
+        else:
+            paths.update(glob.glob(item))
+    return sorted(paths)
+
+
+def mine(paths: Sequence[str], store: ResultStore, jobs: int = 1) -> Dict[str, int]:
+    """Mine ``paths`` into ``store``, skipping replays it already holds.
+
+    Each game's rows are written together as soon as its worker finishes, so
+    an interrupted run keeps everything mined so far.
+    """
+
+    done = processed_sources(store.path)
+    todo = [path for path in paths if source_key(path) not in done]
+    counts = {"mined": 0, "skipped": len(paths) - len(todo), "failed": 0}
+
+    def record(rows: List[dict]) -> None:
+        store.extend(rows)
+        if rows and rows[0]["metric"] == "error":
+            counts["failed"] += 1
+        else:
+            counts["mined"] += 1
+
+    if jobs <= 1 or len(todo) <= 1:
+        for path in todo:
+            record(mine_replay(path))
+        return counts
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(mine_replay, path) for path in todo]
+        for future in as_completed(futures):
+            record(future.result())
+    return counts
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Mine per-turn metrics from replays.")
+    p.add_argument(
+        "inputs",
+        nargs="*",
+        default=list(DEFAULT_INPUTS),
+        help="Replay files, directories or globs (default: game_logs/*.replay)",
+    )
+    p.add_argument(
+        "--store",
+        default=DEFAULT_STORE,
+        help="JSONL metric store (default: {0})".format(DEFAULT_STORE),
+    )
+    p.add_argument(
+        "--jobs", "-j", type=int, default=os.cpu_count() or 1, help="Worker processes"
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    counts = mine(paths, ResultStore(args.store), jobs=args.jobs)
+    print(
+        "Mined {0} replays into {1} ({2} already mined, {3} unreadable)".format(
+            counts["mined"], args.store, counts["skipped"], counts["failed"]
+        )
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""Re-simulate recorded games from their orders, with no bot processes.
+
+Every replay records each ant's orders, one character per turn, and
+``playgame.py --log_output`` additionally saves the order lines each bot
+sent. Feeding those orders back through ``engine.replay_game`` with the
+recorded ``engine_seed`` replays the game at engine speed, without bots or
+time limits. That makes it possible to:
+
+* profile engine changes on real games (``--profile``), and
+* check that an engine change is behaviour-preserving: the re-simulated
+  scores and replay must match the recorded ones byte for byte.
+
+The exit status is 1 when any game diverges.
+
+Usage:
+    python3 scripts/resimulate.py game_logs/*.replay
+    python3 scripts/resimulate.py --orders logs game_logs/3.replay
+    python3 scripts/resimulate.py --profile 25 game_logs
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import glob
+import itertools
+import json
+import os
+import pstats
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.ants.ants import AIM, Ants  # noqa: E402
+from src.ants.engine import replay_game  # noqa: E402
+
+# ``playgame.py`` defaults for the options the replay does not record. The
+# food ranges are resolved with the engine RNG, so they have to be passed
+# as ranges again for the RNG to stay in step.
+PLAYGAME_DEFAULTS = {
+    "attack": "focus",
+    "food": "symmetric",
+    "kill_points": 2,
+    "food_visible": (3, 5),
+    "cutoff_turn": 150,
+    "cutoff_percent": 0.85,
+}
+FOOD_RANGES = {"food_rate": (5, 11), "food_turn": (19, 37), "food_start": (75, 175)}
+
+# Statuses for which ``run_game`` removed a bot that still had ants.
+KILL_STATUSES = ("crashed", "crashed 0", "timeout", "invalid")
+
+
+@dataclass
+class Check:
+    """Outcome of re-simulating one recorded game."""
+
+    path: str
+    turns: int
+    seconds: float
+    scores_match: bool
+    replay_match: bool
+    detail: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.scores_match and self.replay_match
+
+
+def load_game(path) -> dict:
+    """The ``game_result`` JSON ``playgame.py`` writes as ``<game_id>.replay``."""
+
+    with open(path, "r", encoding="utf-8") as fh:
+        result = json.load(fh)
+    if "replaydata" not in result:
+        raise ValueError("{0} has no replaydata".format(path))
+    return result
+
+
+def map_text(replay: dict) -> str:
+    """Rebuild the starting map: water from the final map, hills from the log."""
+
+    rows, cols = replay["map"]["rows"], replay["map"]["cols"]
+    grid = [["%" if c == "%" else "." for c in line] for line in replay["map"]["data"]]
+    for row, col, owner, _end in replay["hills"]:
+        grid[row][col] = str(owner)
+    lines = ["rows {0}".format(rows), "cols {0}".format(cols)]
+    lines.append("players {0}".format(replay["players"]))
+    lines.extend("m " + "".join(line) for line in grid)
+    return "\n".join(lines) + "\n"
+
+
+def build_game(replay: dict) -> Ants:
+    """An ``Ants`` engine in the state the recorded game started from.
+
+    The recorded ``food_*`` values may have been drawn from the playgame
+    ranges or given explicitly; each combination is tried (defaults first)
+    until the engine resolves to the recorded values.
+    """
+
+    options = dict(PLAYGAME_DEFAULTS)
+    options.update(
+        {
+            "map": map_text(replay),
+            "turns": replay["turns"],
+            "loadtime": replay["loadtime"],
+            "turntime": replay["turntime"],
+            "viewradius2": replay["viewradius2"],
+            "attackradius2": replay["attackradius2"],
+            "spawnradius2": replay["spawnradius2"],
+            "engine_seed": replay["engine_seed"],
+            "player_seed": replay["player_seed"],
+        }
+    )
+    names = list(FOOD_RANGES)
+    for explicit in itertools.product((False, True), repeat=len(names)):
+        for name, fixed in zip(names, explicit):
+            options[name] = replay[name] if fixed else FOOD_RANGES[name]
+        game = Ants(options)
+        if all(getattr(game, name) == replay[name] for name in names):
+            return game
+    raise ValueError("cannot reproduce the recorded food settings")
+
+
+def orders_from_replay(replay: dict) -> List[Dict[int, List[str]]]:
+    """Per-player ``{turn: [order lines]}`` rebuilt from the ant records.
+
+    Order ``k`` of an ant is the move it made on turn ``spawn + k + 1``.
+    """
+
+    rows, cols = replay["map"]["rows"], replay["map"]["cols"]
+    turn_orders: List[Dict[int, List[str]]] = [{} for _ in range(replay["players"])]
+    for row, col, spawn, _end, owner, orders in replay["ants"]:
+        for turn, direction in enumerate(orders, spawn + 1):
+            if direction not in AIM:
+                continue
+            turn_orders[owner].setdefault(turn, []).append(
+                "o {0} {1} {2}".format(row, col, direction)
+            )
+            d_row, d_col = AIM[direction]
+            row, col = (row + d_row) % rows, (col + d_col) % cols
+    return turn_orders
+
+
+def orders_from_logs(log_dir, game_id, players: int) -> List[Dict[int, List[str]]]:
+    """Per-player orders from ``--log_output`` files, in the order sent.
+
+    Ignored and invalid orders are echoed into the log with a ``#`` reason;
+    they never moved an ant, so they are dropped.
+    """
+
+    turn_orders: List[Dict[int, List[str]]] = []
+    for b in range(players):
+        path = os.path.join(str(log_dir), "{0}.bot{1}.output".format(game_id, b))
+        orders: Dict[int, List[str]] = {}
+        turn = None
+        with open(path, "r", encoding="utf-8") as fh:
+            for line in fh:
+                line = line.strip()
+                if line.startswith("# turn "):
+                    turn = int(line.split()[2])
+                elif line and "#" not in line and turn is not None:
+                    orders.setdefault(turn, []).append(line)
+        turn_orders.append(orders)
+    return turn_orders
+
+
+def recorded_kills(result: dict) -> dict:
+    """``{player: (turn, status)}`` for bots the engine removed mid-game."""
+
+    statuses = result.get("status", [])
+    turns = result.get("playerturns", [])
+    return {
+        b: (turns[b], status)
+        for b, status in enumerate(statuses)
+        if status in KILL_STATUSES
+    }
+
+
+def canonical(replaydata: dict) -> str:
+    return json.dumps(replaydata, sort_keys=True)
+
+
+def resimulate(path, orders: str = "replay") -> Check:
+    """Re-run the game recorded at ``path`` and compare it with the record."""
+
+    result = load_game(path)
+    replay = result["replaydata"]
+    if orders == "logs":
+        turn_orders = orders_from_logs(
+            os.path.dirname(str(path)), result.get("game_id", 0), replay["players"]
+        )
+    else:
+        turn_orders = orders_from_replay(replay)
+    game = build_game(replay)
+    options = {
+        "turns": replay["turns"],
+        "kills": recorded_kills(result),
+        "game_id": result.get("game_id", 0),
+    }
+    start = time.perf_counter()
+    rerun = replay_game(game, turn_orders, options)
+    seconds = time.perf_counter() - start
+
+    scores_match = rerun["score"] == result["score"]
+    replay_match = canonical(rerun["replaydata"]) == canonical(replay)
+    detail = ""
+    if not replay_match:
+        differing = sorted(
+            key
+            for key in set(replay) | set(rerun["replaydata"])
+            if replay.get(key) != rerun["replaydata"].get(key)
+        )
+        detail = "replay fields differ: {0}".format(", ".join(differing))
+    return Check(
+        path=str(path),
+        turns=rerun["game_length"],
+        seconds=seconds,
+        scores_match=scores_match,
+        replay_match=replay_match,
+        detail=detail,
+    )
+
+
+def expand_inputs(inputs: Sequence[str]) -> List[str]:
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.update(glob.glob(os.path.join(item, "*.replay")))
+        else:
+            paths.update(glob.glob(item))
+    return sorted(paths)
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Re-simulate recorded games and verify they reproduce."
+    )
+    p.add_argument(
+        "inputs",
+        nargs="*",
+        default=["game_logs/*.replay"],
+        help="Replay files, directories or globs (default: game_logs/*.replay)",
+    )
+    p.add_argument(
+        "--orders",
+        choices=("replay", "logs"),
+        default="replay",
+        help="Take orders from the replay's ant records or the --log_output "
+        "files next to it (default: replay)",
+    )
+    p.add_argument(
+        "--profile",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Profile the engine across all games and print the top N functions",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    paths = expand_inputs(args.inputs)
+    profiler = cProfile.Profile() if args.profile else None
+    failures = 0
+    total_turns, total_seconds = 0, 0.0
+    for path in paths:
+        try:
+            if profiler:
+                profiler.enable()
+            check = resimulate(path, orders=args.orders)
+        except (OSError, ValueError, KeyError) as exc:
+            print("{0}: ERROR {1}".format(path, exc))
+            failures += 1
+            continue
+        finally:
+            if profiler:
+                profiler.disable()
+        total_turns += check.turns
+        total_seconds += check.seconds
+        status = "ok" if check.ok else "MISMATCH"
+        if not check.scores_match:
+            status += " (scores differ)"
+        print(
+            "{0}: {1} turns in {2:.2f}s {3} {4}".format(
+                path, check.turns, check.seconds, status, check.detail
+            ).rstrip()
+        )
+        if not check.ok:
+            failures += 1
+
+    if total_seconds:
+        print(
+            "{0} games, {1} turns, {2:.0f} turns/s, {3} diverged".format(
+                len(paths), total_turns, total_turns / total_seconds, failures
+            )
+        )
+    if profiler:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.profile)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
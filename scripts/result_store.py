@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""Append-only JSONL store for per-game results.
+
+The legacy runners rewrite one JSON array per run with every game's
+``replaydata`` embedded, and ``analyze_results.py`` has to ``json.load`` the
+whole thing before it can look at a single score. This store keeps one small
+JSON object per line instead, written as each game finishes:
+
+* heavy replay data is written once to a sidecar file (or left where
+  ``playgame.py`` already wrote it) and referenced by ``replay_path``;
+* the few replay-derived numbers the analyzer needs (``food_collected``,
+  ``enemy_food_collected``) are stored as plain columns at write time;
+* readers stream the file line by line and keep only the columns they ask
+  for, so loading cost does not grow with replay size.
+
+Usage from the shell runners (playgame ``--json`` output on stdin):
+
+    python3 src/tools/playgame.py ... --json | \\
+        python3 scripts/result_store.py append statistics.jsonl \\
+            --test-name "vs RandomBot" --game 3 --timestamp "$TIMESTAMP"
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Columns ``analyze_results.py`` builds its game-level frame from.
+GAME_COLUMNS = (
+    "test_name",
+    "timestamp",
+    "game",
+    "result",
+    "our_score",
+    "enemy_score",
+    "turns",
+    "food_collected",
+    "enemy_food_collected",
+)
+
+# Statuses the shell runners treat as an automatic loss for that player.
+FAILED_STATUSES = ("crashed", "timeout", "invalid")
+
+
+def food_totals(replaydata: Optional[dict]) -> dict:
+    """Final hive totals for players 0 and 1 (0 when history is missing)."""
+
+    hive_history = (replaydata or {}).get("hive_history", [])
+    if len(hive_history) < 2:
+        return {"food_collected": 0, "enemy_food_collected": 0}
+    player_history, enemy_history = hive_history[0], hive_history[1]
+    return {
+        "food_collected": player_history[-1] if player_history else 0,
+        "enemy_food_collected": enemy_history[-1] if enemy_history else 0,
+    }
+
+
+def classify(our_score, enemy_score, our_status, enemy_status) -> str:
+    """WIN/LOSS/DRAW with the same precedence the shell runners use."""
+
+    if our_status in FAILED_STATUSES:
+        return "LOSS"
+    if enemy_status in FAILED_STATUSES:
+        return "WIN"
+    if our_score > enemy_score:
+        return "WIN"
+    if enemy_score > our_score:
+        return "LOSS"
+    return "DRAW"
+
+
+def record_from_playgame(result: dict, **fields) -> dict:
+    """Build a store record from ``playgame.py --json`` output.
+
+    ``fields`` (``test_name``, ``game``, ``timestamp``, ``time``...) are
+    copied onto the record. ``replaydata`` is left on the result for
+    :meth:`ResultStore.append` to move into a sidecar file.
+    """
+
+    scores = result.get("score", [])
+    statuses = result.get("status", [])
+    our_score = scores[0] if scores else 0
+    enemy_score = max(scores[1:]) if len(scores) > 1 else 0
+    our_status = statuses[0] if statuses else "unknown"
+    enemy_status = statuses[1] if len(statuses) > 1 else "unknown"
+    record = dict(fields)
+    record.update(
+        {
+            "result": (
+                "ERROR"
+                if "error" in result
+                else classify(our_score, enemy_score, our_status, enemy_status)
+            ),
+            "our_score": our_score,
+            "enemy_score": enemy_score,
+            "our_status": our_status,
+            "enemy_status": enemy_status,
+            "turns": result.get("game_length", 0),
+        }
+    )
+    return record
+
+
+class ResultStore:
+    """One JSON object per line; ``append`` is a single ``O_APPEND`` write.
+
+    A single ``write`` per record keeps lines intact when several runner
+    processes append to the same store concurrently.
+    """
+
+    def __init__(self, path, replay_dir=None) -> None:
+        self.path = Path(path)
+        self.replay_dir = (
+            Path(replay_dir)
+            if replay_dir is not None
+            else self.path.with_name(self.path.stem + "_replays")
+        )
+
+    def append(
+        self,
+        record: dict,
+        replaydata: Optional[dict] = None,
+        replay_path=None,
+    ) -> dict:
+        """Write ``record``; replay data is stored by reference, never inline."""
+
+        record = dict(record)
+        embedded = record.pop("replaydata", None)
+        if replaydata is None:
+            replaydata = embedded
+        if replaydata is not None:
+            for key, value in food_totals(replaydata).items():
+                record.setdefault(key, value)
+            if replay_path is None:
+                replay_path = self._write_sidecar(replaydata)
+        if replay_path is not None:
+            record["replay_path"] = str(replay_path)
+        self._write_lines([record])
+        return record
+
+    def extend(self, records: Sequence[dict]) -> None:
+        """Write several records with one ``write`` so they land together."""
+
+        if records:
+            self._write_lines(records)
+
+    def _write_lines(self, records: Sequence[dict]) -> None:
+        blob = "".join(json.dumps(record, sort_keys=True) + "\n" for record in records)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, blob.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+    def _write_sidecar(self, replaydata: dict) -> Path:
+        blob = json.dumps(replaydata, sort_keys=True).encode("utf-8")
+        digest = hashlib.sha256(blob).hexdigest()
+        self.replay_dir.mkdir(parents=True, exist_ok=True)
+        target = self.replay_dir / "{0}.json".format(digest)
+        if not target.exists():
+            tmp = target.with_suffix(".tmp{0}".format(os.getpid()))
+            tmp.write_bytes(blob)
+            os.replace(tmp, target)
+        return target
+
+
+def iter_records(path, columns: Optional[Sequence[str]] = None) -> Iterator[dict]:
+    """Stream records, projected onto ``columns`` when given.
+
+    Blank lines and a truncated final line (a writer killed mid-append) are
+    skipped.
+    """
+
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if columns is None:
+                yield record
+            else:
+                yield {name: record.get(name) for name in columns}
+
+
+def load_columns(path, columns: Sequence[str] = GAME_COLUMNS) -> Dict[str, List]:
+    """Column-oriented dict of lists, ready for ``pandas.DataFrame``."""
+
+    data: Dict[str, List] = {name: [] for name in columns}
+    for record in iter_records(path, columns):
+        for name in columns:
+            data[name].append(record[name])
+    return data
+
+
+def aggregate_tests(records: Iterable[dict]) -> List[dict]:
+    """Per-test summary rows in the legacy ``statistics.json`` shape.
+
+    Runs in a single pass holding one accumulator per test name.
+    """
+
+    totals: Dict[str, dict] = {}
+    for record in records:
+        name = record.get("test_name") or "unknown"
+        row = totals.setdefault(
+            name,
+            {
+                "test_name": name,
+                "timestamp": record.get("timestamp"),
+                "games": 0,
+                "wins": 0,
+                "losses": 0,
+                "draws": 0,
+                "_turns": 0,
+            },
+        )
+        row["games"] += 1
+        result = record.get("result")
+        if result == "WIN":
+            row["wins"] += 1
+        elif result == "LOSS":
+            row["losses"] += 1
+        elif result == "DRAW":
+            row["draws"] += 1
+        row["_turns"] += int(record.get("turns") or 0)
+    rows = []
+    for row in totals.values():
+        games = row["games"] or 1
+        turns = row.pop("_turns")
+        row["win_rate"] = 100.0 * row["wins"] / games
+        row["average_turns"] = turns / games
+        rows.append(row)
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Append to a JSONL result store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    append = sub.add_parser(
+        "append", help="Append one playgame --json result read from stdin"
+    )
+    append.add_argument("store", help="Path of the .jsonl store")
+    append.add_argument("--test-name", required=True)
+    append.add_argument("--game", type=int, required=True)
+    append.add_argument("--timestamp", default=None)
+    append.add_argument("--time", type=float, default=None, help="Wall seconds")
+    append.add_argument("--seed", type=int, default=None, help="Player seed")
+    args = parser.parse_args(argv)
+
+    try:
+        result = json.loads(sys.stdin.read())
+    except json.JSONDecodeError:
+        result = {"error": "no parseable playgame --json output"}
+    fields = {"test_name": args.test_name, "game": args.game}
+    for name in ("timestamp", "time", "seed"):
+        value = getattr(args, name)
+        if value is not None:
+            fields[name] = value
+    record = record_from_playgame(result, **fields)
+    ResultStore(args.store).append(record, replaydata=result.get("replaydata"))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
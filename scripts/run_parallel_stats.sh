@@ -14,6 +14,8 @@ NC='\033[0m' # No Color
 # Configuration
 LOG_DIR="game_logs"
 STATS_FILE="parallel_statistics.json"
+# Append-only per-game history read by scripts/analyze_results.py
+STORE_FILE=${STORE_FILE:-parallel_statistics.jsonl}
 TIMESTAMP=$(date +"%Y-%m-%d_%H-%M-%S")
 GAMES_PER_TEST=${GAMES_PER_TEST:-100}
 TURNS_PER_GAME=${TURNS_PER_GAME:-1000}
@@ -48,6 +50,11 @@ run_single_game() {
         --map_file "$map_file" \
         "$bot1" "$bot2" \
         --nolaunch --json 2>/dev/null)
+
+    # Record the game in the JSONL store as soon as it finishes
+    echo "$game_json" | python3 scripts/result_store.py append "$STORE_FILE" \
+        --test-name "$test_name" --game "$game_num" --timestamp "$TIMESTAMP" \
+        --seed "$seed"
     
     # Parse results
     local our_score=$(echo "$game_json" | jq -r '.score[0]')
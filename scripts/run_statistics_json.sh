@@ -14,6 +14,8 @@ NC='\033[0m' # No Color
 # Configuration
 LOG_DIR="game_logs"
 STATS_FILE="statistics.json"
+# Append-only per-game history read by scripts/analyze_results.py
+STORE_FILE=${STORE_FILE:-statistics.jsonl}
 TIMESTAMP=$(date +"%Y-%m-%d_%H-%M-%S")
 GAMES_PER_TEST=${GAMES_PER_TEST:-2}
 TURNS_PER_GAME=${TURNS_PER_GAME:-1000}
@@ -58,6 +60,11 @@ run_statistics() {
         local game_json=$(eval "$test_command" 2>/dev/null)
         local end_time=$(date +%s.%N)
         local game_time=$(echo "$end_time - $start_time" | bc)
+
+        # Record the game in the JSONL store (replay kept in a sidecar file)
+        echo "$game_json" | python3 scripts/result_store.py append "$STORE_FILE" \
+            --test-name "$test_name" --game "$i" --timestamp "$TIMESTAMP" \
+            --time "$game_time"
         
         # Parse JSON results using yq
         local our_score=$(echo "$game_json" | yq eval '.score[0]' -)
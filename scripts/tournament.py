@@ -0,0 +1,518 @@
+#!/usr/bin/env python3
+"""Rate the whole bot pool with an Elo tournament over the map corpus.
+
+``scripts/benchmark.py`` measures one bot under test against a fixed list of
+opponents. This runner ranks *every* bot: ``AdvancedBot``, ``InfluenceBot``,
+``XathisBot`` and the Python sample bots, on every map in ``maps/maze``,
+``maps/multi_hill_maze`` and ``maps/random_walk`` whose player count the pool
+can fill, including the multi-player maps.
+
+Usage:
+    python3 scripts/tournament.py --seed 42 --jobs 4
+    python3 scripts/tournament.py --pairing swiss --rounds 10 --turns 300
+    python3 scripts/tournament.py --bots src/bots/bot.py src/bots/xathis_bot.py
+
+Pairing modes:
+
+* ``round-robin``  every round plays every group of distinct bots on every
+  map (all pairs on 2-player maps). Maps whose group count exceeds
+  ``--max-groups`` play a seeded random sample of the groups instead.
+* ``swiss``        every round picks the next map in the corpus, sorts the
+  pool by rating and seats neighbours together, so strong bots meet strong
+  bots. Players left over when the pool doesn't divide evenly sit out.
+
+Ratings are multi-player Elo: a game of ``n`` players is scored as the
+``n * (n - 1) / 2`` pairwise results implied by the engine ranks, each with
+``K / (n - 1)``. They are updated as each game finishes, so with ``--jobs``
+the update order follows completion order.
+
+After every game the ratings and round state are checkpointed to
+``<output-dir>/tournament_checkpoint.json`` and the game is appended to
+``<output-dir>/tournament_games.jsonl``; re-running with the same arguments
+resumes from the checkpoint.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import itertools
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from benchmark import REPO_ROOT, GameOutcome, file_sha256, run_one_game
+
+DEFAULT_MAP_GLOBS = (
+    "maps/maze/*.map",
+    "maps/multi_hill_maze/*.map",
+    "maps/random_walk/*.map",
+)
+
+# Rule-based bots in ``src/bots`` and their display names.
+PROJECT_BOTS = (
+    ("AdvancedBot", "src/bots/bot.py"),
+    ("InfluenceBot", "src/bots/influence_bot.py"),
+    ("XathisBot", "src/bots/xathis_bot.py"),
+)
+
+# Sample bots that exist to exercise engine error paths, not to play.
+FAULT_INJECTION_BOTS = ("ErrorBot", "InvalidBot", "TimeoutBot")
+
+CHECKPOINT_NAME = "tournament_checkpoint.json"
+GAMES_NAME = "tournament_games.jsonl"
+
+
+@dataclass(frozen=True)
+class Entrant:
+    name: str
+    path: str
+
+    def command(self) -> str:
+        return "{0} {1}".format(sys.executable, self.path)
+
+
+@dataclass(frozen=True)
+class MapInfo:
+    path: str
+    players: int
+
+
+def default_pool() -> List[Entrant]:
+    pool = [Entrant(name, path) for name, path in PROJECT_BOTS]
+    sample_dir = REPO_ROOT / "src" / "sample_bots" / "python"
+    for path in sorted(sample_dir.glob("*Bot.py")):
+        if path.stem in FAULT_INJECTION_BOTS:
+            continue
+        pool.append(Entrant(path.stem, str(path.relative_to(REPO_ROOT))))
+    return pool
+
+
+def pool_from_paths(paths: Sequence[str]) -> List[Entrant]:
+    names = {path: name for name, path in PROJECT_BOTS}
+    pool = []
+    for path in paths:
+        name = names.get(path, Path(path).stem)
+        if any(e.name == name for e in pool):
+            raise ValueError("duplicate bot in pool: {0}".format(path))
+        pool.append(Entrant(name, path))
+    return pool
+
+
+def read_map_players(path: Path) -> int:
+    """Player count from a map's ``players N`` header line."""
+
+    with open(path, "r", encoding="utf-8") as fh:
+        for line in fh:
+            if line.startswith("players"):
+                return int(line.split()[1])
+    raise ValueError("{0} has no 'players' line".format(path))
+
+
+def discover_maps(patterns: Sequence[str]) -> List[MapInfo]:
+    maps = []
+    for pattern in patterns:
+        for path in sorted(REPO_ROOT.glob(pattern)):
+            rel = str(path.relative_to(REPO_ROOT))
+            maps.append(MapInfo(rel, read_map_players(path)))
+    return maps
+
+
+class EloRatings:
+    """Incremental multi-player Elo table keyed by entrant name."""
+
+    def __init__(
+        self, names: Sequence[str], k: float = 32.0, initial: float = 1500.0
+    ) -> None:
+        self.k = k
+        self.ratings: Dict[str, float] = {name: initial for name in names}
+        self.games: Dict[str, int] = {name: 0 for name in names}
+
+    def expected(self, a: str, b: str) -> float:
+        return 1.0 / (1.0 + 10.0 ** ((self.ratings[b] - self.ratings[a]) / 400.0))
+
+    def update(self, seats: Sequence[str], ranks: Sequence[int]) -> None:
+        """Apply one game; lower rank is better, equal ranks are a draw."""
+
+        n = len(seats)
+        if n < 2:
+            return
+        k = self.k / (n - 1)
+        deltas = {name: 0.0 for name in seats}
+        for i, j in itertools.combinations(range(n), 2):
+            a, b = seats[i], seats[j]
+            if ranks[i] < ranks[j]:
+                score = 1.0
+            elif ranks[i] > ranks[j]:
+                score = 0.0
+            else:
+                score = 0.5
+            delta = k * (score - self.expected(a, b))
+            deltas[a] += delta
+            deltas[b] -= delta
+        for name, delta in deltas.items():
+            self.ratings[name] += delta
+            self.games[name] += 1
+
+    def leaderboard(self) -> List[tuple]:
+        return sorted(self.ratings.items(), key=lambda item: (-item[1], item[0]))
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "ratings": self.ratings, "games": self.games}
+
+    def load(self, data: dict) -> None:
+        self.ratings.update(data["ratings"])
+        self.games.update(data["games"])
+
+
+def _game_spec(map_info: MapInfo, seats: Sequence[str], rng: random.Random) -> dict:
+    spec = {
+        "map": map_info.path,
+        "seats": list(seats),
+        "engine_seed": rng.randint(1, 1_000_000),
+        "player_seed": rng.randint(1, 1_000_000),
+    }
+    blob = json.dumps(spec, sort_keys=True).encode("utf-8")
+    spec["key"] = hashlib.sha256(blob).hexdigest()
+    return spec
+
+
+def round_robin_round(
+    pool: Sequence[Entrant],
+    maps: Sequence[MapInfo],
+    rng: random.Random,
+    max_groups: int,
+) -> List[dict]:
+    names = [e.name for e in pool]
+    specs = []
+    for map_info in maps:
+        if map_info.players > len(names):
+            continue
+        groups = list(itertools.combinations(names, map_info.players))
+        if len(groups) > max_groups:
+            groups = rng.sample(groups, max_groups)
+        for group in groups:
+            seats = list(group)
+            rng.shuffle(seats)
+            specs.append(_game_spec(map_info, seats, rng))
+    return specs
+
+
+def swiss_round(
+    pool: Sequence[Entrant],
+    maps: Sequence[MapInfo],
+    ratings: EloRatings,
+    round_index: int,
+    rng: random.Random,
+) -> List[dict]:
+    playable = [m for m in maps if m.players <= len(pool)]
+    if not playable:
+        return []
+    map_info = playable[round_index % len(playable)]
+    # Random tie-break so equal ratings (round 0) don't always seat the same
+    # neighbours together.
+    order = sorted(
+        (e.name for e in pool),
+        key=lambda name: (-ratings.ratings[name], rng.random()),
+    )
+    size = map_info.players
+    byes = len(order) % size
+    if byes:
+        # Rotate the bye through the table instead of always benching last.
+        start = (round_index * byes) % len(order)
+        benched = {order[(start + i) % len(order)] for i in range(byes)}
+        order = [name for name in order if name not in benched]
+    specs = []
+    for i in range(0, len(order), size):
+        seats = order[i : i + size]
+        rng.shuffle(seats)
+        specs.append(_game_spec(map_info, seats, rng))
+    return specs
+
+
+@dataclass
+class Tournament:
+    pool: List[Entrant]
+    maps: List[MapInfo]
+    pairing: str
+    rounds: int
+    turns: int
+    master_seed: int
+    output_dir: Path
+    log_dir: Path
+    jobs: int = 1
+    max_groups: int = 36
+    k: float = 32.0
+    ratings: EloRatings = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.ratings = EloRatings([e.name for e in self.pool], k=self.k)
+        self.by_name = {e.name: e for e in self.pool}
+        self.checkpoint_path = self.output_dir / CHECKPOINT_NAME
+        self.games_path = self.output_dir / GAMES_NAME
+
+    def config(self) -> dict:
+        return {
+            "pairing": self.pairing,
+            "turns": self.turns,
+            "master_seed": self.master_seed,
+            "max_groups": self.max_groups,
+            "k": self.k,
+            "pool": [
+                {
+                    "name": e.name,
+                    "path": e.path,
+                    "sha256": file_sha256(REPO_ROOT / e.path),
+                }
+                for e in self.pool
+            ],
+            "maps": [m.path for m in self.maps],
+        }
+
+    def schedule(self, round_index: int) -> List[dict]:
+        rng = random.Random("{0}:{1}".format(self.master_seed, round_index))
+        if self.pairing == "swiss":
+            return swiss_round(self.pool, self.maps, self.ratings, round_index, rng)
+        return round_robin_round(self.pool, self.maps, rng, self.max_groups)
+
+    def load_checkpoint(self) -> dict:
+        if not self.checkpoint_path.exists():
+            return {"round": 0, "current": None, "completed": []}
+        state = json.loads(self.checkpoint_path.read_text())
+        if state.get("config") != self.config():
+            raise ValueError(
+                "{0} was written by a different tournament configuration; "
+                "pass --fresh or another --output-dir".format(self.checkpoint_path)
+            )
+        self.ratings.load(state["elo"])
+        return state
+
+    def save_checkpoint(self, state: dict) -> None:
+        state = dict(state, config=self.config(), elo=self.ratings.to_dict())
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        tmp = self.checkpoint_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(state, indent=2, sort_keys=True) + "\n")
+        os.replace(tmp, self.checkpoint_path)
+
+    def play(self, spec: dict) -> GameOutcome:
+        return run_one_game(
+            bots=[self.by_name[name].command() for name in spec["seats"]],
+            map_file=REPO_ROOT / spec["map"],
+            log_dir=self.log_dir,
+            turns=self.turns,
+            engine_seed=spec["engine_seed"],
+            player_seed=spec["player_seed"],
+            game_id=spec["engine_seed"],
+        )
+
+    def record(self, spec: dict, outcome: GameOutcome) -> None:
+        ranks = [p["rank"] for p in outcome.players]
+        if outcome.outcome_label() != "ERROR" and len(ranks) == len(spec["seats"]):
+            self.ratings.update(spec["seats"], ranks)
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.games_path, "a", encoding="utf-8") as fh:
+            record = dict(
+                outcome.to_dict(), key=spec["key"], map=spec["map"], seats=spec["seats"]
+            )
+            fh.write(json.dumps(record, sort_keys=True) + "\n")
+
+    def run(self) -> EloRatings:
+        state = self.load_checkpoint()
+        while state["round"] < self.rounds:
+            round_index = state["round"]
+            if state["current"] is None:
+                state = {
+                    "round": round_index,
+                    "current": self.schedule(round_index),
+                    "completed": [],
+                }
+                self.save_checkpoint(state)
+            done = set(state["completed"])
+            pending = [spec for spec in state["current"] if spec["key"] not in done]
+            print(
+                "\n[round {0}/{1}] {2} games ({3} already played)".format(
+                    round_index + 1, self.rounds, len(state["current"]), len(done)
+                )
+            )
+            with ThreadPoolExecutor(max_workers=max(1, self.jobs)) as pool:
+                futures = {pool.submit(self.play, spec): spec for spec in pending}
+                for future in as_completed(futures):
+                    spec = futures[future]
+                    outcome = future.result()
+                    self.record(spec, outcome)
+                    state["completed"].append(spec["key"])
+                    self.save_checkpoint(state)
+                    _print_game(spec, outcome)
+            state = {"round": round_index + 1, "current": None, "completed": []}
+            self.save_checkpoint(state)
+        return self.ratings
+
+
+def _print_game(spec: dict, outcome: GameOutcome) -> None:
+    placings = " ".join(
+        "{0}:{1}".format(name, p["rank"])
+        for name, p in zip(spec["seats"], outcome.players)
+    )
+    print(
+        "  {0:<40s} winner={1:<18s} turns={2:<4}  ranks=[{3}]  ({4:.1f}s)".format(
+            spec["map"],
+            outcome.winner,
+            outcome.turns,
+            placings,
+            outcome.duration_s,
+        )
+    )
+
+
+def write_leaderboard(ratings: EloRatings, output_dir: Path, master_seed: int) -> Path:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    path = output_dir / "leaderboard.md"
+    lines = [
+        "# ants-strategy-agent tournament leaderboard",
+        "",
+        "Generated: {0}".format(time.strftime("%Y-%m-%d_%H-%M-%S")),
+        "Master seed: {0}".format(master_seed),
+        "",
+        "| Rank | Bot | Elo | Games |",
+        "|---:|---|---:|---:|",
+    ]
+    for place, (name, rating) in enumerate(ratings.leaderboard(), start=1):
+        lines.append(
+            "| {0} | {1} | {2:.0f} | {3} |".format(
+                place, name, rating, ratings.games[name]
+            )
+        )
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
+    p = argparse.ArgumentParser(
+        description="Elo tournament across every bot and map in the corpus."
+    )
+    p.add_argument(
+        "--bots",
+        nargs="+",
+        default=None,
+        help="Bot scripts to enter (default: project bots + Python sample bots)",
+    )
+    p.add_argument(
+        "--maps",
+        nargs="+",
+        default=list(DEFAULT_MAP_GLOBS),
+        help="Map globs relative to the repo root",
+    )
+    p.add_argument(
+        "--pairing",
+        choices=("round-robin", "swiss"),
+        default="round-robin",
+        help="Group schedule (default: round-robin)",
+    )
+    p.add_argument("--rounds", type=int, default=1, help="Rounds to play (default: 1)")
+    p.add_argument(
+        "--turns", type=int, default=500, help="Maximum turns per game (default: 500)"
+    )
+    p.add_argument(
+        "--max-groups",
+        type=int,
+        default=36,
+        help="Round-robin cap on groups per map per round (default: 36)",
+    )
+    p.add_argument("--k", type=float, default=32.0, help="Elo K-factor (default: 32)")
+    p.add_argument(
+        "--jobs", "-j", type=int, default=1, help="Games to run concurrently"
+    )
+    p.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help="Master seed for schedules and per-game seeds "
+        "(default: generated and reported)",
+    )
+    p.add_argument(
+        "--log-dir",
+        default="game_logs",
+        help="Where playgame.py writes per-game replay/log files",
+    )
+    p.add_argument(
+        "--output-dir",
+        default="tournament_results",
+        help="Where the checkpoint, game log and leaderboard land",
+    )
+    p.add_argument(
+        "--fresh",
+        action="store_true",
+        help="Discard an existing checkpoint instead of resuming it",
+    )
+    return p.parse_args(argv)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    args = parse_args(argv)
+    output_dir = (REPO_ROOT / args.output_dir).resolve()
+    checkpoint = output_dir / CHECKPOINT_NAME
+    if args.seed is None and checkpoint.exists() and not args.fresh:
+        master_seed = json.loads(checkpoint.read_text())["config"]["master_seed"]
+    elif args.seed is None:
+        master_seed = random.SystemRandom().randint(1, 2**63 - 1)
+    else:
+        master_seed = args.seed
+    if args.fresh:
+        for name in (CHECKPOINT_NAME, GAMES_NAME):
+            (output_dir / name).unlink(missing_ok=True)
+
+    pool = pool_from_paths(args.bots) if args.bots else default_pool()
+    maps = discover_maps(args.maps)
+    log_dir = (REPO_ROOT / args.log_dir).resolve()
+    log_dir.mkdir(parents=True, exist_ok=True)
+
+    tournament = Tournament(
+        pool=pool,
+        maps=maps,
+        pairing=args.pairing,
+        rounds=args.rounds,
+        turns=args.turns,
+        master_seed=master_seed,
+        output_dir=output_dir,
+        log_dir=log_dir,
+        jobs=args.jobs,
+        max_groups=args.max_groups,
+        k=args.k,
+    )
+
+    print("ants-strategy-agent tournament")
+    print("==============================")
+    print("Bots           : {0}".format(", ".join(e.name for e in pool)))
+    print("Maps           : {0}".format(len(maps)))
+    print("Pairing        : {0}".format(args.pairing))
+    print("Rounds         : {0}".format(args.rounds))
+    print("Turn limit     : {0}".format(args.turns))
+    print("Master seed    : {0}".format(master_seed))
+    print("Jobs           : {0}".format(args.jobs))
+
+    try:
+        ratings = tournament.run()
+    except ValueError as exc:
+        print("error: {0}".format(exc), file=sys.stderr)
+        return 2
+
+    path = write_leaderboard(ratings, output_dir, master_seed)
+    print("\nLeaderboard")
+    for place, (name, rating) in enumerate(ratings.leaderboard(), start=1):
+        print(
+            "  {0:>2}. {1:<16s} {2:7.1f}  ({3} games)".format(
+                place, name, rating, ratings.games[name]
+            )
+        )
+    print("\nLeaderboard written to {0}".format(path))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
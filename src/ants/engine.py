@@ -99,6 +99,7 @@ def run_game(game, botcmds, options):
     bots = []
     bot_status = []
     bot_turns = []
+    bot_latency = []
     if capture_errors:
         error_logs = [HeadTail(log, capture_errors_max) for log in error_logs]
     try:
@@ -110,6 +111,7 @@ def run_game(game, botcmds, options):
             bots.append(sandbox)
             bot_status.append("survived")
             bot_turns.append(0)
+            bot_latency.append([])
 
             # ensure it started
             if not sandbox.is_alive:
@@ -181,11 +183,16 @@ def run_game(game, botcmds, options):
             random.shuffle(bot_list)
             for group_num in range(0, len(bot_list), simul_num):
                 pnums, pbots = zip(*bot_list[group_num : group_num + simul_num])
-                moves, errors, status = get_moves(game, pbots, pnums, time_limit, turn)
+                moves, errors, status, latency = get_moves(
+                    game, pbots, pnums, time_limit, turn
+                )
                 for p, b in enumerate(pnums):
                     bot_moves[b] = moves[p]
                     error_lines[b] = errors[p]
                     statuses[b] = status[p]
+                    # turn 0 is the untimed-by-turntime setup phase
+                    if turn > 0 and latency[p] is not None:
+                        bot_latency[b].append(round(latency[p] * 1000, 1))
 
             # handle any logs that get_moves produced
             for b, errors in enumerate(error_lines):
@@ -367,6 +374,8 @@ def run_game(game, botcmds, options):
             "replayformat": "json",
             "replaydata": game.get_replay(),
             "game_length": turn,
+            "turntime": int(options["turntime"]),
+            "turn_latency_ms": bot_latency,
         }
         if capture_errors:
             game_result["errors"] = [head.headtail() for head in error_logs]
@@ -377,11 +386,92 @@ def run_game(game, botcmds, options):
     return game_result
 
 
+def replay_game(game, turn_orders, options):
+    """Re-run a recorded game from its orders, without bot processes.
+
+    ``turn_orders[b]`` maps a turn number to the order lines player ``b``
+    sent on that turn. ``options["kills"]`` maps a player to the
+    ``(turn, status)`` at which the original run removed it for a crash,
+    timeout or (under ``--strict``) invalid orders. The game is driven through
+    the same sequence of calls as ``run_game``, including the per-turn
+    shuffle of the global RNG the engine seed also drives, so a faithful
+    engine reproduces the original scores and replay exactly.
+    """
+    turns = int(options["turns"])
+    kills = options.get("kills", {})
+    num_players = len(turn_orders)
+
+    bot_status = ["survived"] * num_players
+    bot_turns = [0] * num_players
+    for b, (turn, status) in kills.items():
+        if status == "crashed 0":  # the bot never started
+            bot_status[b] = status
+            game.kill_player(b)
+
+    for turn in range(turns + 1):
+        if turn == 0:
+            game.start_game()
+        else:
+            for b in range(num_players):
+                if game.is_alive(b):
+                    bot_turns[b] = turn
+            game.start_turn()
+
+        # run_game shuffles the live bots every turn; keep the RNG in step
+        bot_list = [b for b in range(num_players) if game.is_alive(b)]
+        random.shuffle(bot_list)
+        for b in bot_list:
+            kill_turn, status = kills.get(b, (None, None))
+            if kill_turn == turn and status in ("crashed", "timeout"):
+                bot_status[b] = status
+                bot_turns[b] = turn
+                game.kill_player(b)
+
+        bot_alive = [game.is_alive(b) for b in range(num_players)]
+        if turn > 0 and not game.game_over():
+            for b, orders in enumerate(turn_orders):
+                if game.is_alive(b):
+                    game.do_moves(b, orders.get(turn, []))
+                    if kills.get(b) == (turn, "invalid"):
+                        game.kill_player(b)
+                        bot_status[b] = "invalid"
+                        bot_turns[b] = turn
+
+        if turn > 0:
+            game.finish_turn()
+
+        for b, alive in enumerate(bot_alive):
+            if alive and not game.is_alive(b) and bot_status[b] == "survived":
+                bot_status[b] = "eliminated"
+                bot_turns[b] = turn
+
+        if game.game_over():
+            break
+
+    game.finish_game()
+    scores = game.get_scores()
+    return {
+        "challenge": game.__class__.__name__.lower(),
+        "location": options.get("location", "localhost"),
+        "game_id": options.get("game_id", 0),
+        "status": bot_status,
+        "playerturns": bot_turns,
+        "score": scores,
+        "rank": [sorted(scores, reverse=True).index(x) for x in scores],
+        "replayformat": "json",
+        "replaydata": game.get_replay(),
+        "game_length": turn,
+    }
+
+
 def get_moves(game, bots, bot_nums, time_limit, turn):
     bot_finished = [not game.is_alive(bot_nums[b]) for b in range(len(bots))]
     bot_moves = [[] for _ in bots]
     error_lines = [[] for _ in bots]
     statuses = [None for _ in bots]
+    # seconds from resume until the bot's "go"; None if it crashed. The
+    # loop below polls every 10ms, which is the resolution of this figure.
+    latencies = [None for _ in bots]
 
     # resume all bots
     for bot in bots:
@@ -422,6 +512,7 @@ def get_moves(game, bots, bot_nums, time_limit, turn):
                 line = line.strip()
                 if line.lower() == "go":
                     bot_finished[b] = True
+                    latencies[b] = time.time() - start_time
                     # bot finished sending data for this turn
                     break
                 bot_moves[b].append(line)
@@ -443,6 +534,7 @@ def get_moves(game, bots, bot_nums, time_limit, turn):
                 unicode("turn %4d bot %s timed out") % (turn, bot_nums[b])
             )
             statuses[b] = "timeout"
+            latencies[b] = time.time() - start_time
             bot = bots[b]
             for _ in range(100):
                 line = bot.read_error()
@@ -452,4 +544,4 @@ def get_moves(game, bots, bot_nums, time_limit, turn):
             game.kill_player(bot_nums[b])
             bots[b].kill()
 
-    return bot_moves, error_lines, statuses
+    return bot_moves, error_lines, statuses, latencies
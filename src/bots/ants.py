@@ -1,5 +1,8 @@
 #!/usr/bin/env python
+import os
+import re
 import sys
+import time
 import traceback
 import random
 
@@ -8,6 +11,12 @@ try:
 except ImportError:
     from sys import maxsize as maxint
 
+# bots run as scripts from this directory; tests import it as ``bots``
+try:
+    from bfs import SKIP, STOP, TorusBFS
+except ImportError:
+    from bots.bfs import SKIP, STOP, TorusBFS
+
 MY_ANT = 0
 ANTS = 0
 DEAD = -1
@@ -23,6 +32,21 @@ PLAYER_HILL = string = "0123456789"
 MAP_OBJECT = "?%*.!"
 MAP_RENDER = PLAYER_ANT + HILL_ANT + PLAYER_HILL + MAP_OBJECT
 
+# a "ready" or "go" line ends each block the engine sends
+BLOCK_END = re.compile(rb"^(ready|go)\r?\n", re.MULTILINE | re.IGNORECASE)
+READ_SIZE = 1 << 16
+
+
+# phase priorities for TurnScheduler, most important first
+ESSENTIAL = 0
+HIGH = 1
+NORMAL = 2
+LOW = 3
+# share of the turn that must still be left for a phase of each priority to
+# start, or to carry on between its units of work; ESSENTIAL always runs
+PRIORITY_RESERVE = (0.0, 0.1, 0.2, 0.35)
+# kept back on top of the reserve for writing orders and pipe latency
+SAFETY_MS = 50
 
 AIM = {"n": (-1, 0), "e": (0, 1), "s": (1, 0), "w": (0, -1)}
 RIGHT = {"n": "e", "e": "s", "s": "w", "w": "n"}
@@ -35,10 +59,34 @@ class Ants:
         self.width = None
         self.height = None
         self.map = None
+        self.turntime = 1000
+        # when the engine's "go" arrived (time.monotonic()), see time_remaining
+        self.turn_start = None
+        # stream for per-turn debug lines (phase timings), None when off
+        self.debug = None
+        # location -> owner; food and dead ants are dicts used as ordered
+        # sets so they keep the engine's (sorted) order with O(1) lookups
         self.ant_list = {}
-        self.food_list = []
-        self.dead_list = []
+        self.food_list = {}
+        self.dead_list = {}
         self.hill_list = {}
+        self._my_ants = []
+        self._enemy_ants = []
+        self._my_hills = []
+        self._enemy_hills = []
+        self._orders = []
+        # unseen squares next to seen, passable ones, and the per-turn
+        # distance field grown from them (see closest_unseen)
+        self.unseen_frontier = set()
+        # water squares first seen this turn, for bots that cache paths
+        self.new_water = []
+        self._field_current = False
+        # flat-index searchers sharing one neighbour table (water removed):
+        # one holds the unseen field for the turn, the other does one-off
+        # searches; ``_open`` flags seen squares that are not water
+        self._field = None
+        self._bfs = None
+        self._open = None
 
     def setup(self, data):
         "parse initial input and setup starting game state"
@@ -64,76 +112,110 @@ class Ants:
                 elif key == "spawnradius2":
                     self.spawnradius2 = int(tokens[1])
         self.map = [[UNSEEN for _ in range(self.width)] for _ in range(self.height)]
+        self._field = TorusBFS(self.height, self.width)
+        self._bfs = TorusBFS(self.height, self.width, neighbors=self._field.neighbors)
+        self._open = bytearray(self.height * self.width)
 
     def update(self, data):
-        # clear ant and food data
-        for (row, col), owner in self.ant_list.items():
-            self.map[row][col] = LAND
-        self.ant_list = {}
-        for row, col in self.food_list:
-            self.map[row][col] = LAND
-        self.food_list = []
-        for row, col in self.dead_list:
-            self.map[row][col] = LAND
-        self.dead_list = []
-        for (row, col), owner in self.hill_list.items():
-            self.map[row][col] = LAND
-        self.hill_list = {}
+        """Apply one turn of engine updates.
 
-        # update map and create new ant and food lists
+        The turn text is tokenised in a single pass into fresh ant, food,
+        dead and hill tables. Only cells whose contents changed are written:
+        cells that held an object last turn and hold none now revert to LAND.
+        """
+        grid = self.map
+        ant_list = {}
+        food_list = {}
+        dead_list = {}
+        hill_list = {}
+        revealed = []
+        new_water = []
         for line in data.split("\n"):
-            line = line.strip().lower()
-            if len(line) > 0:
-                tokens = line.split()
-                if len(tokens) >= 3:
-                    row = int(tokens[1])
-                    col = int(tokens[2])
-                    if tokens[0] == "a":
-                        owner = int(tokens[3])
-                        self.map[row][col] = owner
-                        self.ant_list[(row, col)] = owner
-                    elif tokens[0] == "f":
-                        self.map[row][col] = FOOD
-                        self.food_list.append((row, col))
-                    elif tokens[0] == "w":
-                        self.map[row][col] = WATER
-                    elif tokens[0] == "l":
-                        self.map[row][col] = LAND
-                    elif tokens[0] == "d":
-                        # food could spawn on a spot where an ant just died
-                        # don't overwrite the space unless it is land
-                        if self.map[row][col] == LAND:
-                            self.map[row][col] = DEAD
-                        # but always add to the dead list
-                        self.dead_list.append((row, col))
-                    elif tokens[0] == "h":
-                        owner = int(tokens[3])
-                        self.hill_list[(row, col)] = owner
+            tokens = line.split()
+            if len(tokens) < 3:
+                continue
+            kind = tokens[0]
+            row = int(tokens[1])
+            col = int(tokens[2])
+            if kind in "afwl" and grid[row][col] == UNSEEN:
+                revealed.append((row, col))
+            if kind == "a":
+                owner = int(tokens[3])
+                grid[row][col] = owner
+                ant_list[(row, col)] = owner
+            elif kind == "f":
+                grid[row][col] = FOOD
+                food_list[(row, col)] = None
+            elif kind == "w":
+                if grid[row][col] != WATER:
+                    new_water.append((row, col))
+                grid[row][col] = WATER
+            elif kind == "l":
+                grid[row][col] = LAND
+            elif kind == "d":
+                dead_list[(row, col)] = None
+            elif kind == "h":
+                hill_list[(row, col)] = int(tokens[3])
+
+        # clear objects that have gone since last turn
+        for old in (self.ant_list, self.food_list, self.dead_list, self.hill_list):
+            for loc in old:
+                if loc not in ant_list and loc not in food_list:
+                    grid[loc[0]][loc[1]] = LAND
+        # dead ants arrive last: food could spawn on a spot where an ant just
+        # died, so only mark the square if nothing else is on it
+        for row, col in dead_list:
+            if grid[row][col] == LAND:
+                grid[row][col] = DEAD
+
+        if revealed:
+            self._reveal(revealed)
+
+        self.new_water = new_water
+        self.ant_list = ant_list
+        self.food_list = food_list
+        self.dead_list = dead_list
+        self.hill_list = hill_list
+        self._my_ants = [loc for loc, owner in ant_list.items() if owner == MY_ANT]
+        self._enemy_ants = [
+            (loc, owner) for loc, owner in ant_list.items() if owner != MY_ANT
+        ]
+        self._my_hills = [loc for loc, owner in hill_list.items() if owner == MY_ANT]
+        self._enemy_hills = [
+            (loc, owner) for loc, owner in hill_list.items() if owner != MY_ANT
+        ]
+
+    def time_remaining(self):
+        "milliseconds left of this turn's turntime"
+        if self.turn_start is None:
+            return self.turntime
+        return self.turntime - (time.monotonic() - self.turn_start) * 1000
 
     def issue_order(self, order):
-        sys.stdout.write("o %s %s %s\n" % (order[0], order[1], order[2]))
-        sys.stdout.flush()
+        # buffered until finish_turn so a turn costs one write
+        self._orders.append("o %s %s %s\n" % (order[0], order[1], order[2]))
 
     def finish_turn(self):
-        sys.stdout.write("go\n")
+        self._orders.append("go\n")
+        sys.stdout.write("".join(self._orders))
         sys.stdout.flush()
+        self._orders = []
 
+    # the lists are built once per turn in update(); callers get copies
     def my_ants(self):
-        return [loc for loc, owner in self.ant_list.items() if owner == MY_ANT]
+        return self._my_ants[:]
 
     def enemy_ants(self):
-        return [(loc, owner) for loc, owner in self.ant_list.items() if owner != MY_ANT]
+        return self._enemy_ants[:]
 
     def my_hills(self):
-        return [loc for loc, owner in self.hill_list.items() if owner == MY_ANT]
+        return self._my_hills[:]
 
     def enemy_hills(self):
-        return [
-            (loc, owner) for loc, owner in self.hill_list.items() if owner != MY_ANT
-        ]
+        return self._enemy_hills[:]
 
     def food(self):
-        return self.food_list[:]
+        return list(self.food_list)
 
     def passable(self, row, col):
         return self.map[row][col] != WATER
@@ -198,7 +280,7 @@ class Ants:
         # find the closest enemy ant from this row/col
         min_dist = maxint
         closest_ant = None
-        for ant in self.enemy_ants():
+        for ant in self._enemy_ants:
             if filter is None or ant not in filter:
                 dist = self.distance(row1, col1, ant[0][0], ant[0][1])
                 if dist < min_dist:
@@ -210,7 +292,7 @@ class Ants:
         # find the closest enemy hill from this row/col
         min_dist = maxint
         closest_hill = None
-        for hill in self.enemy_hills():
+        for hill in self._enemy_hills:
             if filter is None or hill[0] not in filter:
                 dist = self.distance(row1, col1, hill[0][0], hill[0][1])
                 if dist < min_dist:
@@ -218,19 +300,83 @@ class Ants:
                     closest_hill = hill[0]
         return closest_hill
 
+    def searcher(self):
+        """A new TorusBFS over this map for the bot's own searches.
+
+        It shares the helper's neighbour table, so water stays out of its
+        searches as it is revealed; unseen squares count as passable.
+        """
+        return TorusBFS(self.height, self.width, neighbors=self._field.neighbors)
+
+    def _reveal(self, locs):
+        """Move newly seen squares out of the unseen frontier."""
+        grid = self.map
+        frontier = self.unseen_frontier
+        for row, col in locs:
+            frontier.discard((row, col))
+            index = row * self.width + col
+            if grid[row][col] == WATER:
+                self._field.block(index)
+                continue
+            self._open[index] = 1
+            for direction in "nesw":
+                n_row, n_col = self.destination(row, col, direction)
+                if grid[n_row][n_col] == UNSEEN:
+                    frontier.add((n_row, n_col))
+        self._field_current = False
+
+    def _unseen_field(self):
+        """The searcher holding each seen square's nearest frontier square.
+
+        A multi-source BFS from the frontier through seen, passable squares;
+        rebuilt at most once per turn, and only after something was revealed.
+        """
+        field = self._field
+        if not self._field_current:
+            frontier = sorted(self.unseen_frontier)
+            width = self.width
+            field.search(
+                [row * width + col for row, col in frontier],
+                labels=frontier,
+                passable=self._open,
+            )
+            self._field_current = True
+        return field
+
     def closest_unseen(self, row1, col1, filter=None):
-        # find the closest unseen from this row/col
-        min_dist = maxint
-        closest_unseen = None
-        for row in range(self.height):
-            for col in range(self.width):
-                if filter is None or (row, col) not in filter:
-                    if self.map[row][col] == UNSEEN:
-                        dist = self.distance(row1, col1, row, col)
-                        if dist < min_dist:
-                            min_dist = dist
-                            closest_unseen = (row, col)
-        return closest_unseen
+        # find the closest unseen square by walking distance from this row/col
+        row1 %= self.height
+        col1 %= self.width
+        field = self._unseen_field()
+        index = row1 * self.width + col1
+        if field.reached(index):
+            target = field.label[index]
+            if filter is None or target not in filter:
+                return target
+        return self._search_unseen(row1, col1, filter)
+
+    def _search_unseen(self, row1, col1, filter):
+        """BFS from one square to the nearest unseen square not in ``filter``.
+
+        Used when the shared field's answer is excluded by ``filter``.
+        """
+        excluded = set(filter or ())
+        grid = self.map
+        bfs = self._bfs
+        start = row1 * self.width + col1
+        found = []
+
+        def visit(index):
+            row, col = bfs.loc(index)
+            if grid[row][col] != UNSEEN:
+                return None
+            if (row, col) not in excluded:
+                found.append((row, col))
+                return STOP
+            return None if index == start else SKIP
+
+        bfs.search([start], visit=visit)
+        return found[0] if found else None
 
     def render_text_map(self):
         tmp = ""
@@ -238,28 +384,111 @@ class Ants:
             tmp += "# %s\n" % "".join([MAP_RENDER[col] for col in row])
         return tmp
 
+    @staticmethod
+    def read_blocks(stream):
+        """Yield ``(block_text, terminator)`` for each block on ``stream``.
+
+        ``stream`` is a binary stream; input is read in large chunks and
+        split on the ``ready``/``go`` lines, so a turn costs a constant
+        number of reads however many lines it has. Each byte is scanned
+        for a terminator once, however many chunks a block arrives in.
+        """
+        read = getattr(stream, "read1", stream.read)
+        pending = bytearray()
+        while True:
+            chunk = read(READ_SIZE)
+            if not chunk:
+                return
+            # a terminator may have started at the end of the last chunk
+            scan = max(0, len(pending) - len(b"ready\r\n"))
+            pending += chunk
+            start = 0
+            for match in BLOCK_END.finditer(pending, scan):
+                block = pending[start : match.start()]
+                yield block.decode("ascii"), match.group(1).lower().decode("ascii")
+                start = match.end()
+            del pending[:start]
+
     @staticmethod
     def run(bot):
         ants = Ants()
-        map_data = ""
-        while True:
-            try:
-                current_line = sys.stdin.readline().rstrip(
-                    "\r\n"
-                )  # strip new line char
-                if current_line.lower() == "ready":
+        if os.environ.get("ANTS_DEBUG"):
+            ants.debug = sys.stderr
+        stdin = getattr(sys.stdin, "buffer", sys.stdin)
+        try:
+            for map_data, terminator in Ants.read_blocks(stdin):
+                if terminator == "ready":
                     ants.setup(map_data)
                     ants.finish_turn()
-                    map_data = ""
-                elif current_line.lower() == "go":
+                else:
+                    ants.turn_start = time.monotonic()
                     ants.update(map_data)
                     bot.do_turn(ants)
                     ants.finish_turn()
-                    map_data = ""
-                else:
-                    map_data += current_line + "\n"
-            except EOFError:
-                break
-            except Exception:
-                traceback.print_exc(file=sys.stderr)
-                break
+        except Exception:
+            traceback.print_exc(file=sys.stderr)
+
+
+class TurnScheduler:
+    """Run a bot's turn as prioritised phases against the turn deadline.
+
+    Phases are added each turn with ``add`` and run, in the order added, by
+    ``run``. A phase is a callable; when it returns a generator, each
+    ``yield`` ends a unit of work and is a point where it can be cut short.
+    A phase starts, and carries on after each unit, only while the time
+    left is above ``PRIORITY_RESERVE`` for its priority plus ``SAFETY_MS``;
+    otherwise it is skipped or truncated. ESSENTIAL phases always run to
+    the end.
+
+    ``last`` holds this turn's milliseconds per phase and ``totals`` the
+    running ``[ms, runs, skipped, truncated]``. When ``ants.debug`` is set
+    (``ANTS_DEBUG`` in the bot's environment) one line per turn is written
+    to it, so phase costs can be tuned from the bot's stderr log.
+    """
+
+    def __init__(self, safety_ms=SAFETY_MS):
+        self.safety_ms = safety_ms
+        self.phases = []
+        self.turn = 0
+        self.last = {}
+        self.totals = {}
+
+    def add(self, name, work, priority=NORMAL):
+        self.phases.append((name, work, priority))
+
+    def run(self, ants):
+        self.turn += 1
+        self.last = {}
+        notes = []
+        phases, self.phases = self.phases, []
+        for name, work, priority in phases:
+            total = self.totals.setdefault(name, [0.0, 0, 0, 0])
+            reserve = None
+            if priority != ESSENTIAL:
+                reserve = self.safety_ms + PRIORITY_RESERVE[priority] * ants.turntime
+                if ants.time_remaining() < reserve:
+                    total[2] += 1
+                    notes.append("%s=skipped" % name)
+                    continue
+            start = time.monotonic()
+            units = work()
+            cut = False
+            if hasattr(units, "send"):
+                for _ in units:
+                    if reserve is not None and ants.time_remaining() < reserve:
+                        units.close()
+                        cut = True
+                        break
+            spent = (time.monotonic() - start) * 1000
+            self.last[name] = spent
+            total[0] += spent
+            total[1] += 1
+            if cut:
+                total[3] += 1
+            notes.append("%s=%.1f%s" % (name, spent, "(cut)" if cut else ""))
+        if ants.debug is not None:
+            ants.debug.write(
+                "# phases turn=%d left=%.0f %s\n"
+                % (self.turn, ants.time_remaining(), " ".join(notes))
+            )
+            ants.debug.flush()
@@ -0,0 +1,422 @@
+"""Breadth-first search on the torus over flat cell indices.
+
+Every bot needs the same handful of searches: nearest food, distance from a
+hill, which first step leads toward the most fog, a path to one far square.
+This module is the one implementation they share, so its cost is measured
+and tuned in one place.
+
+Cells are numbered ``row * cols + col``. A :class:`TorusBFS` owns the
+neighbour table and a set of scratch arrays (``dist``, ``parent``, ``label``,
+``first`` and the queue ``order``) that are allocated once and reused by
+every search. Instead of clearing them, each search bumps ``generation`` and
+a cell counts as reached only while ``stamp[index] == generation``; entries
+for unreached cells are stale and must not be read.
+
+Example::
+
+    bfs = TorusBFS(rows, cols)
+    for row, col in water:
+        bfs.block(bfs.index(row, col))
+    count = bfs.search(food_indices, labels=food_locs, max_depth=13)
+    for index in bfs.order[:count]:
+        ...  # bfs.dist[index], bfs.label[index], bfs.parent[index]
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+# n, e, s, w: the order of ``AIM`` in the bot helper.
+OFFSETS: Tuple[Tuple[int, int], ...] = ((-1, 0), (0, 1), (1, 0), (0, -1))
+
+# Return values for a ``visit`` callback. ``None`` behaves like EXPAND.
+EXPAND = 0  # expand the cell as usual
+SKIP = 1  # keep the cell but do not expand it
+STOP = 2  # end the search; the cell is not expanded
+
+Visit = Callable[[int], Optional[int]]
+
+
+class TorusBFS:
+    """Reusable breadth-first search over a ``rows`` x ``cols`` torus.
+
+    ``offsets`` fixes the order neighbours are expanded in, which decides
+    the order cells of equal depth appear in ``order``. A prebuilt
+    ``neighbors`` table (one tuple of indices per cell) may be passed
+    instead; it is used as is, so two searchers can share one table and
+    see each other's :meth:`block` calls.
+    """
+
+    def __init__(
+        self,
+        rows: int,
+        cols: int,
+        offsets: Sequence[Tuple[int, int]] = OFFSETS,
+        neighbors: Optional[List[Tuple[int, ...]]] = None,
+    ) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.size = size = rows * cols
+        self.offsets = tuple(offsets)
+        if neighbors is None:
+            neighbors = [
+                tuple(
+                    ((row + d_row) % rows) * cols + (col + d_col) % cols
+                    for d_row, d_col in offsets
+                )
+                for row in range(rows)
+                for col in range(cols)
+            ]
+        self.neighbors = neighbors
+        self.stamp = [-1] * size
+        self.generation = 0
+        self.dist = [0] * size
+        self.parent = [-1] * size
+        self.label: list = [None] * size
+        self.first = [0] * size
+        self.order = [0] * size
+        self.count = 0
+
+    def index(self, row: int, col: int) -> int:
+        return (row % self.rows) * self.cols + col % self.cols
+
+    def loc(self, index: int) -> Tuple[int, int]:
+        return divmod(index, self.cols)
+
+    def block(self, index: int) -> None:
+        """Make ``index`` impassable (water) for every later search.
+
+        Only the edges into the cell are removed, so a blocked cell can
+        still be used as a source.
+        """
+        neighbors = self.neighbors
+        row, col = divmod(index, self.cols)
+        for d_row, d_col in self.offsets:
+            n = ((row - d_row) % self.rows) * self.cols + (col - d_col) % self.cols
+            if index in neighbors[n]:
+                neighbors[n] = tuple(x for x in neighbors[n] if x != index)
+
+    def reached(self, index: int) -> bool:
+        """Whether the last search reached ``index``."""
+        return self.stamp[index] == self.generation
+
+    def path(self, index: int) -> List[int]:
+        """Cells from the source to ``index`` along the last search's parents."""
+        steps = []
+        while index >= 0:
+            steps.append(index)
+            index = self.parent[index]
+        steps.reverse()
+        return steps
+
+    def search(
+        self,
+        sources: Iterable[int],
+        labels: Optional[Iterable] = None,
+        max_depth: Optional[int] = None,
+        visit: Optional[Visit] = None,
+        passable: Optional[Sequence] = None,
+        track_first: bool = False,
+    ) -> int:
+        """Search outward from every source at once.
+
+        Sources are queued in the order given (duplicates are ignored) and
+        every reached cell records ``dist`` and ``parent`` (``-1`` for
+        sources). Optionally:
+
+        * ``labels`` - one per source; each cell inherits the label of the
+          source whose wave reached it first.
+        * ``max_depth`` - cells at this depth are reached but not expanded.
+        * ``visit(index)`` - called as each cell is dequeued, sources
+          included; return :data:`SKIP` to leave it unexpanded or
+          :data:`STOP` to end the search there.
+        * ``passable`` - per-cell flags; cells with a falsy flag are never
+          entered (sources are always queued).
+        * ``track_first`` - ``first[index]`` becomes a bit mask over the
+          source's neighbour slots: bit ``k`` is set when some shortest path
+          to the cell leaves the source through ``neighbors[source][k]``.
+          Meant for single-source searches.
+
+        Returns the number of cells reached; ``order[:count]`` lists them in
+        the order they were reached.
+        """
+        self.generation += 1
+        gen = self.generation
+        stamp = self.stamp
+        dist = self.dist
+        parent = self.parent
+        order = self.order
+        tail = 0
+        if labels is None:
+            for source in sources:
+                if stamp[source] != gen:
+                    stamp[source] = gen
+                    dist[source] = 0
+                    parent[source] = -1
+                    order[tail] = source
+                    tail += 1
+        else:
+            label = self.label
+            for source, name in zip(sources, labels):
+                if stamp[source] != gen:
+                    stamp[source] = gen
+                    dist[source] = 0
+                    parent[source] = -1
+                    label[source] = name
+                    order[tail] = source
+                    tail += 1
+        limit = self.size if max_depth is None else max_depth
+        if track_first and labels is None and visit is None and passable is None:
+            tail = self._plain_first_steps(tail, limit)
+        elif track_first:
+            tail = self._first_steps(tail, limit, labels is not None, visit, passable)
+        elif labels is None and passable is None:
+            tail = self._plain(tail, limit, visit)
+        else:
+            tail = self._general(tail, limit, labels is not None, visit, passable)
+        self.count = tail
+        return tail
+
+    def astar(
+        self,
+        source: int,
+        target: int,
+        max_cost: int,
+        enter: Optional[Callable[[int, int], bool]] = None,
+    ) -> Optional[List[int]]:
+        """Find a path from ``source`` to ``target`` by A* search.
+
+        Cells are expanded cheapest estimate first, the estimate being the
+        steps taken plus the Manhattan distance left on the torus; equal
+        estimates go first come, first served. A cell is closed as soon as
+        it is reached. Cells ``max_cost`` steps out are not expanded, and
+        cells whose estimate exceeds it are not queued. ``enter(cell, n)``
+        returning False forbids the step from ``cell`` into ``n``.
+
+        Returns the cells after ``source`` up to and including ``target``,
+        or None if no path was found. ``dist`` and ``parent`` hold the
+        search as for :meth:`search`, but ``order`` is left alone.
+        """
+        self.generation += 1
+        gen = self.generation
+        stamp = self.stamp
+        dist = self.dist
+        parent = self.parent
+        neighbors = self.neighbors
+        rows, cols = self.rows, self.cols
+        target_row, target_col = divmod(target, cols)
+        stamp[source] = gen
+        dist[source] = 0
+        parent[source] = -1
+        heap = [(0, 0, source)]
+        pushed = 0
+        found = False
+        while heap and not found:
+            cell = heapq.heappop(heap)[2]
+            depth = dist[cell]
+            if depth >= max_cost:
+                continue
+            depth += 1
+            for n in neighbors[cell]:
+                if stamp[n] == gen or (enter is not None and not enter(cell, n)):
+                    continue
+                if n == target:
+                    dist[n] = depth
+                    parent[n] = cell
+                    found = True
+                    break
+                row, col = divmod(n, cols)
+                d_row = abs(row - target_row)
+                d_col = abs(col - target_col)
+                estimate = depth + min(d_row, rows - d_row) + min(d_col, cols - d_col)
+                if estimate > max_cost:
+                    continue
+                stamp[n] = gen
+                dist[n] = depth
+                parent[n] = cell
+                pushed += 1
+                heapq.heappush(heap, (estimate, pushed, n))
+        if not found:
+            return None
+        path = []
+        cell = target
+        while cell != source:
+            path.append(cell)
+            cell = parent[cell]
+        path.reverse()
+        return path
+
+    def _plain(self, tail: int, limit: int, visit: Optional[Visit]) -> int:
+        """The common case: distances and parents only."""
+        gen = self.generation
+        stamp = self.stamp
+        dist = self.dist
+        parent = self.parent
+        order = self.order
+        neighbors = self.neighbors
+        head = 0
+        while head < tail:
+            cell = order[head]
+            head += 1
+            if visit is not None:
+                action = visit(cell)
+                if action:
+                    if action == STOP:
+                        break
+                    continue
+            depth = dist[cell]
+            if depth >= limit:
+                if visit is None:
+                    break
+                continue
+            depth += 1
+            for n in neighbors[cell]:
+                if stamp[n] != gen:
+                    stamp[n] = gen
+                    dist[n] = depth
+                    parent[n] = cell
+                    order[tail] = n
+                    tail += 1
+        return tail
+
+    def _general(  # pylint: disable=too-many-arguments
+        self,
+        tail: int,
+        limit: int,
+        labelled: bool,
+        visit: Optional[Visit],
+        passable: Optional[Sequence],
+    ) -> int:
+        """Labels and/or passability flags on top of :meth:`_plain`."""
+        gen = self.generation
+        stamp = self.stamp
+        dist = self.dist
+        parent = self.parent
+        label = self.label
+        order = self.order
+        neighbors = self.neighbors
+        head = 0
+        while head < tail:
+            cell = order[head]
+            head += 1
+            if visit is not None:
+                action = visit(cell)
+                if action:
+                    if action == STOP:
+                        break
+                    continue
+            depth = dist[cell]
+            if depth >= limit:
+                continue
+            depth += 1
+            name = label[cell] if labelled else None
+            for n in neighbors[cell]:
+                if stamp[n] != gen and (passable is None or passable[n]):
+                    stamp[n] = gen
+                    dist[n] = depth
+                    parent[n] = cell
+                    if labelled:
+                        label[n] = name
+                    order[tail] = n
+                    tail += 1
+        return tail
+
+    def _plain_first_steps(self, tail: int, limit: int) -> int:
+        """:meth:`_plain` plus the ``first`` step masks, without callbacks."""
+        gen = self.generation
+        stamp = self.stamp
+        dist = self.dist
+        parent = self.parent
+        first = self.first
+        order = self.order
+        neighbors = self.neighbors
+        for i in range(tail):
+            first[order[i]] = 0
+        head = 0
+        while head < tail:
+            cell = order[head]
+            head += 1
+            depth = dist[cell]
+            if depth >= limit:
+                break
+            depth += 1
+            if depth == 1:
+                for slot, n in enumerate(neighbors[cell]):
+                    if stamp[n] == gen:
+                        if dist[n] == 1:
+                            first[n] |= 1 << slot
+                        continue
+                    stamp[n] = gen
+                    dist[n] = 1
+                    parent[n] = cell
+                    first[n] = 1 << slot
+                    order[tail] = n
+                    tail += 1
+                continue
+            mask = first[cell]
+            for n in neighbors[cell]:
+                if stamp[n] == gen:
+                    # another shortest path to ``n`` through this cell
+                    if dist[n] == depth:
+                        first[n] |= mask
+                    continue
+                stamp[n] = gen
+                dist[n] = depth
+                parent[n] = cell
+                first[n] = mask
+                order[tail] = n
+                tail += 1
+        return tail
+
+    def _first_steps(  # pylint: disable=too-many-arguments,too-many-branches
+        self,
+        tail: int,
+        limit: int,
+        labelled: bool,
+        visit: Optional[Visit],
+        passable: Optional[Sequence],
+    ) -> int:
+        """:meth:`_general` plus the ``first`` step masks."""
+        gen = self.generation
+        stamp = self.stamp
+        dist = self.dist
+        parent = self.parent
+        label = self.label
+        first = self.first
+        order = self.order
+        neighbors = self.neighbors
+        for i in range(tail):
+            first[order[i]] = 0
+        head = 0
+        while head < tail:
+            cell = order[head]
+            head += 1
+            if visit is not None:
+                action = visit(cell)
+                if action:
+                    if action == STOP:
+                        break
+                    continue
+            depth = dist[cell]
+            if depth >= limit:
+                continue
+            depth += 1
+            for slot, n in enumerate(neighbors[cell]):
+                mask = first[cell] if depth > 1 else 1 << slot
+                if stamp[n] == gen:
+                    # another shortest path to ``n`` through this cell
+                    if dist[n] == depth:
+                        first[n] |= mask
+                    continue
+                if passable is not None and not passable[n]:
+                    continue
+                stamp[n] = gen
+                dist[n] = depth
+                parent[n] = cell
+                if labelled:
+                    label[n] = label[cell]
+                first[n] = mask
+                order[tail] = n
+                tail += 1
+        return tail
@@ -1,20 +1,64 @@
 #!/usr/bin/env python
 from ants import (  # pylint: disable=no-name-in-module
+    AIM,
     ANTS,
     BEHIND,
+    ESSENTIAL,
     FOOD,
+    HIGH,
     HILL,
     LEFT,
+    LOW,
+    NORMAL,
     RIGHT,
     UNSEEN,
     Ants,
+    TurnScheduler,
 )
 
+# bots run as scripts from this directory; tests import it as ``bots``
+try:
+    from bfs import STOP
+except ImportError:
+    from bots.bfs import STOP
+
+# Ants further than a class's distance limit from every target in a
+# straight line are dropped before its search while there are at most this
+# many (ant, target) pairs to check; see AdvancedBot.assign.
+ASSIGN_FILTER_PAIRS = 4000
+
 # ============================================================================
 # LEARNED WINNING BOT - Based on LeftyBot + GreedyBot insights
 # ============================================================================
 
 
+class PathTree:
+    """A BFS tree grown outward from one target, kept across turns.
+
+    ``next`` maps a square (flat index) to the next square toward the
+    target, ``-1`` at the target itself. A ``complete`` tree holds every
+    square that can reach the target. ``water`` collects the squares of the
+    tree later seen to be water; paths through them are no longer valid.
+    """
+
+    __slots__ = ("next", "depth", "complete", "water")
+
+    def __init__(self, steps, depth, complete):
+        self.next = steps
+        self.depth = depth
+        self.complete = complete
+        self.water = set()
+
+    def blocked(self, index):
+        """Whether the path from ``index`` crosses water seen since growing."""
+        steps, water = self.next, self.water
+        while index >= 0:
+            if index in water:
+                return True
+            index = steps[index]
+        return False
+
+
 class AdvancedBot:
     """
     More Aggressive WINNING BOT - Designed to BEAT LeftyBot
@@ -36,6 +80,9 @@ class AdvancedBot:
         self.ants_lefty = {}  # Ants following walls (from LeftyBot)
         self.standing_orders = []  # Continue tasks across turns (from GreedyBot)
         self.turn_count = 0
+        self.bfs = None  # the helper's searcher, for the assignment phase
+        self.paths = {}  # target -> PathTree, see path_step
+        self.scheduler = TurnScheduler()
 
     def get_initial_direction(self, a_row, a_col):
         """Get initial direction for new ants based on position (from LeftyBot)"""
@@ -51,21 +98,162 @@ class AdvancedBot:
                 return "w"
 
     def do_turn(self, ants):
-        """Combined LeftyBot exploration + GreedyBot priority system"""
+        """Combined LeftyBot exploration + GreedyBot priority system
+
+        Priorities 1-4 are settled for the whole colony at once, one target
+        class at a time (see ``assign``); the ants left over explore.
+        """
         self.turn_count += 1
-        destinations = []
+        destinations = set()
         new_straight = {}
         new_lefty = {}
         orders = []
-        hunted = []
-
+        hunted = set()
+        if self.bfs is None:
+            self.bfs = ants.searcher()
+        self.note_water(ants, ants.new_water)
+
+        # More Aggressive priority system to beat LeftyBot. The phases run in
+        # this order; when the turn runs short the later ones give way.
+        free = []
+        args = (ants, free, destinations, hunted, orders)
+        scheduler = self.scheduler
         # Continue standing orders from previous turn (from GreedyBot)
+        scheduler.add("orders", lambda: self.continue_orders(*args), ESSENTIAL)
+        # PRIORITY 1: Return to hill for multiplication (More Aggressive)
+        scheduler.add("hill", lambda: self.return_to_hill(*args), HIGH)
+        # PRIORITY 2: Hunt enemy hills (strategic)
+        scheduler.add("enemy_hills", lambda: self.hunt_hills(*args), HIGH)
+        # PRIORITY 3: Hunt food (More Aggressive)
+        scheduler.add("food", lambda: self.hunt_food(*args), HIGH)
+        # PRIORITY 4: Hunt enemy ants (strategic combat)
+        scheduler.add("enemy_ants", lambda: self.hunt_ants(*args), NORMAL)
+        # PRIORITIES 5-6: explore, one ant at a time
+        scheduler.add(
+            "explore", lambda: self.explore(*args, new_straight, new_lefty), LOW
+        )
+        scheduler.run(ants)
+
+        # Update tracking dictionaries (from LeftyBot)
+        self.ants_straight = new_straight
+        self.ants_lefty = new_lefty
+        self.standing_orders = orders
+        targets = set(order[2] for order in orders)
+        self.paths = {
+            dest: path for dest, path in self.paths.items() if dest in targets
+        }
+
+        # Update standing orders for next turn (from GreedyBot)
+        for order in self.standing_orders:
+            order[0] = order[1]
+
+    def assign(self, ants, free, targets, max_distance=None, exclusive=True):
+        """Pair free ants with targets, closest pairs first.
+
+        One multi-source BFS from the targets gives every square its nearest
+        target by walking distance, so water is walked around. Ants are
+        served in the order the search reaches them; with ``exclusive`` each
+        target goes to one ant only, and ants whose target was taken are
+        matched again against the targets left. Ants no target reaches
+        within ``max_distance`` are left out. Returns ``[(ant, target)]``.
+
+        A walk is never shorter than the straight line, so ants further than
+        ``max_distance`` from every target in a straight line are dropped
+        first. Otherwise the search would run to ``max_distance`` looking for
+        them, which on a small colony costs more than the scans it replaced.
+        """
+        waiting = list(free)
+        targets = list(targets)
+        if not exclusive and max_distance is None and len(targets) == 1:
+            # every ant heads for the one target; nothing to search
+            return [(loc, targets[0]) for loc in waiting]
+        if (
+            max_distance is not None
+            and len(waiting) * len(targets) <= ASSIGN_FILTER_PAIRS
+        ):
+            waiting = self.within_reach(ants, waiting, targets, max_distance)
+        pairs = []
+        while waiting and targets:
+            reached = self.nearest_targets(
+                ants, waiting, targets, max_distance, exclusive
+            )
+            if not exclusive:
+                return reached
+            taken = set()
+            waiting = []
+            for loc, target in reached:
+                if target in taken:
+                    waiting.append(loc)
+                else:
+                    taken.add(target)
+                    pairs.append((loc, target))
+            targets = [target for target in targets if target not in taken]
+        return pairs
+
+    def within_reach(self, ants, locs, targets, max_distance):
+        """The ants in ``locs`` within ``max_distance`` of some target in a
+        straight line."""
+        height, width = ants.height, ants.width
+        near = []
+        for row, col in locs:
+            for t_row, t_col in targets:
+                d_row = abs(row - t_row)
+                d_col = abs(col - t_col)
+                if (
+                    min(d_row, height - d_row) + min(d_col, width - d_col)
+                    <= max_distance
+                ):
+                    near.append((row, col))
+                    break
+        return near
+
+    def nearest_targets(self, ants, locs, targets, max_distance, exclusive=False):
+        """``[(ant, nearest target)]`` for the ants in ``locs``, nearest first.
+
+        One multi-source BFS from the targets gives every square its nearest
+        target by walking distance. The search stops as soon as it has
+        reached every ant, or with ``exclusive`` once every target has been
+        reached by an ant: any ant found after that would lose its target.
+        """
+        bfs = self.bfs
+        width = ants.width
+        cells = {row * width + col: (row, col) for row, col in locs}
+        reached = []
+        claimed = set()
+        label = bfs.label
+
+        def visit(index):
+            loc = cells.get(index)
+            if loc is not None:
+                reached.append((loc, label[index]))
+                if len(reached) == len(cells):
+                    return STOP
+                if exclusive:
+                    claimed.add(label[index])
+                    if len(claimed) == len(targets):
+                        return STOP
+            return None
+
+        bfs.search(
+            [row * width + col for row, col in targets],
+            labels=targets,
+            max_depth=max_distance,
+            visit=visit,
+        )
+        return reached
+
+    def continue_orders(self, ants, free, destinations, hunted, orders):
+        """Keep last turn's orders whose target is still there; collect the
+        ants left without one in ``free``."""
+        enemy_hills = set(loc for loc, _ in ants.enemy_hills())
+        food = set(ants.food())
+        enemy_ants = set(loc for loc, _ in ants.enemy_ants())
         for order in self.standing_orders:
             ant_loc, _, dest_loc, order_type = order
             if (
-                (order_type == HILL and dest_loc in ants.enemy_hills())
-                or (order_type == FOOD and dest_loc in ants.food())
-                or (order_type == ANTS and dest_loc in ants.enemy_ants())
+                (order_type == HILL and dest_loc in enemy_hills)
+                or (order_type == FOOD and dest_loc in food)
+                or (order_type == ANTS and dest_loc in enemy_ants)
                 or (
                     order_type == UNSEEN
                     and ants.map[dest_loc[0]][dest_loc[1]] == UNSEEN
@@ -75,153 +263,94 @@ class AdvancedBot:
                     ants, order_type, ant_loc, dest_loc, destinations, hunted, orders
                 )
 
-        origins = [order[0] for order in orders]
-
-        # More Aggressive priority system to beat LeftyBot
-        for a_row, a_col in ants.my_ants():
-            if (a_row, a_col) not in origins:
-                # PRIORITY 1: Return to hill for multiplication (More Aggressive)
-                if self.return_to_hill(
-                    ants, a_row, a_col, destinations, hunted, orders
-                ):
-                    continue
-
-                # PRIORITY 2: Hunt enemy hills (strategic)
-                if self.hunt_hills(ants, a_row, a_col, destinations, hunted, orders):
-                    continue
-
-                # PRIORITY 3: Hunt food (More Aggressive)
-                if self.hunt_food(ants, a_row, a_col, destinations, hunted, orders):
-                    continue
-
-                # PRIORITY 4: Hunt enemy ants (strategic combat)
-                if self.hunt_ants(ants, a_row, a_col, destinations, hunted, orders):
-                    continue
-
-                # PRIORITY 5: Hunt unseen areas (exploration)
-                if self.hunt_unseen(ants, a_row, a_col, destinations, hunted, orders):
-                    continue
+        origins = set(order[0] for order in orders)
+        free.extend(loc for loc in ants.my_ants() if loc not in origins)
 
+    def explore(  # pylint: disable=too-many-arguments
+        self, ants, free, destinations, hunted, orders, new_straight, new_lefty
+    ):
+        """Send the ants still free exploring, yielding after each one."""
+        for a_row, a_col in free:
+            # PRIORITY 5: Hunt unseen areas (exploration)
+            if not self.hunt_unseen(ants, a_row, a_col, destinations, hunted, orders):
                 # PRIORITY 6: Use LeftyBot's exploration strategy (but better)
                 self.wall_following_strategy(
                     ants, a_row, a_col, destinations, new_straight, new_lefty
                 )
-
-        # Update tracking dictionaries (from LeftyBot)
-        self.ants_straight = new_straight
-        self.ants_lefty = new_lefty
-        self.standing_orders = orders
-
-        # Update standing orders for next turn (from GreedyBot)
-        for order in self.standing_orders:
-            order[0] = order[1]
-
-    def hunt_hills(self, ants, a_row, a_col, destinations, hunted, orders):
-        """Find and move toward closest enemy hill"""
-        closest_enemy_hill = ants.closest_enemy_hill(a_row, a_col)
-        if closest_enemy_hill is not None:
-            return self.do_order(
-                ants,
-                HILL,
-                (a_row, a_col),
-                closest_enemy_hill,
-                destinations,
-                hunted,
-                orders,
-            )
-        return False
-
-    def hunt_food(self, ants, a_row, a_col, destinations, hunted, orders):
+            yield
+
+    def serve(self, ants, order_type, pairs, free, destinations, hunted, orders):
+        """Order each paired ant toward its target; drop them from ``free``."""
+        moved = set()
+        for loc, target in pairs:
+            if self.do_order(
+                ants, order_type, loc, target, destinations, hunted, orders
+            ):
+                moved.add(loc)
+        free[:] = [loc for loc in free if loc not in moved]
+        return free
+
+    def hunt_hills(self, ants, free, destinations, hunted, orders):
+        """Send every free ant toward its closest enemy hill"""
+        enemy_hills = [loc for loc, _ in ants.enemy_hills()]
+        if not enemy_hills or not free:
+            return free
+        pairs = self.assign(ants, free, enemy_hills, exclusive=False)
+        return self.serve(ants, HILL, pairs, free, destinations, hunted, orders)
+
+    def hunt_food(self, ants, free, destinations, hunted, orders):
         """More Aggressive food hunting to beat LeftyBot"""
-        closest_food = ants.closest_food(a_row, a_col, hunted)
-        if closest_food is not None:
-            # More Aggressive: Hunt food from much further away than LeftyBot
-            distance = ants.distance(a_row, a_col, closest_food[0], closest_food[1])
-            my_ants = ants.my_ants()
-            total_ants = len(my_ants)
-
-            # Be more aggressive when we have fewer ants (critical for beating LeftyBot)
-            if total_ants <= 5:
-                max_distance = 50  # Very aggressive when we need to catch up
-            elif total_ants <= 10:
-                max_distance = 40  # Still very aggressive
-            elif total_ants <= 20:
-                max_distance = 35  # Aggressive
-            else:
-                max_distance = 30  # Still aggressive even with many ants
-
-            if distance <= max_distance:
-                return self.do_order(
-                    ants,
-                    FOOD,
-                    (a_row, a_col),
-                    closest_food,
-                    destinations,
-                    hunted,
-                    orders,
-                )
-        return False
+        food = [loc for loc in ants.food() if loc not in hunted]
+        if not food or not free:
+            return free
+        # More Aggressive: Hunt food from much further away than LeftyBot
+        total_ants = len(ants.my_ants())
+
+        # Be more aggressive when we have fewer ants (critical for beating LeftyBot)
+        if total_ants <= 5:
+            max_distance = 50  # Very aggressive when we need to catch up
+        elif total_ants <= 10:
+            max_distance = 40  # Still very aggressive
+        elif total_ants <= 20:
+            max_distance = 35  # Aggressive
+        else:
+            max_distance = 30  # Still aggressive even with many ants
 
-    def hunt_ants(self, ants, a_row, a_col, destinations, hunted, orders):
-        """More Aggressive enemy ant hunting to beat LeftyBot"""
-        closest_enemy_ant = ants.closest_enemy_ant(a_row, a_col, hunted)
-        if closest_enemy_ant is not None:
-            # Only hunt enemy ants if we have more ants than them (strategic advantage)
-            my_ants = ants.my_ants()
-            enemy_ants = ants.enemy_ants()
-            if len(my_ants) > len(enemy_ants):
-                distance = ants.distance(
-                    a_row, a_col, closest_enemy_ant[0], closest_enemy_ant[1]
-                )
-                # Hunt enemy ants from far away when we have advantage
-                if distance <= 25:
-                    return self.do_order(
-                        ants,
-                        ANTS,
-                        (a_row, a_col),
-                        closest_enemy_ant,
-                        destinations,
-                        hunted,
-                        orders,
-                    )
-        return False
+        # one ant per food
+        pairs = self.assign(ants, free, food, max_distance)
+        return self.serve(ants, FOOD, pairs, free, destinations, hunted, orders)
 
-    def return_to_hill(self, ants, a_row, a_col, destinations, hunted, orders):
+    def hunt_ants(self, ants, free, destinations, hunted, orders):
+        """More Aggressive enemy ant hunting to beat LeftyBot"""
+        enemy_ants = [loc for loc, _ in ants.enemy_ants()]
+        if not enemy_ants or not free:
+            return free
+        # Only hunt enemy ants if we have more ants than them (strategic advantage)
+        if len(ants.my_ants()) <= len(enemy_ants):
+            return free
+        # Hunt enemy ants from far away when we have advantage; several ants
+        # may gang up on one enemy
+        pairs = self.assign(ants, free, enemy_ants, 25, exclusive=False)
+        return self.serve(ants, ANTS, pairs, free, destinations, hunted, orders)
+
+    def return_to_hill(self, ants, free, destinations, hunted, orders):
         """More Aggressive hill return for maximum multiplication"""
         my_hills = ants.my_hills()
-        if not my_hills:
-            return False
-
-        # Find closest hill
-        closest_hill = min(
-            my_hills, key=lambda hill: ants.distance(a_row, a_col, hill[0], hill[1])
-        )
-        distance_to_hill = ants.distance(a_row, a_col, closest_hill[0], closest_hill[1])
-
-        my_ants = ants.my_ants()
-        total_ants = len(my_ants)
-        enemy_ants = ants.enemy_ants()
-        enemy_count = len(enemy_ants)
-
-        # More Aggressive multiplication strategy to beat LeftyBot
-        if total_ants <= 20:  # Very aggressive when we have few ants
-            return self.do_order(
-                ants, HILL, (a_row, a_col), closest_hill, destinations, hunted, orders
-            )
-
-        # Return to hill if we're losing the ant race
-        if enemy_count > total_ants:
-            return self.do_order(
-                ants, HILL, (a_row, a_col), closest_hill, destinations, hunted, orders
-            )
+        if not my_hills or not free:
+            return free
 
-        # Return to hill if we're close enough
-        if distance_to_hill <= 15:  # Very aggressive distance
-            return self.do_order(
-                ants, HILL, (a_row, a_col), closest_hill, destinations, hunted, orders
-            )
+        total_ants = len(ants.my_ants())
+        enemy_count = len(ants.enemy_ants())
 
-        return False
+        # More Aggressive multiplication strategy to beat LeftyBot: every ant
+        # returns when we have few ants (very aggressive) or are losing the
+        # ant race, otherwise only those close enough (very aggressive distance)
+        if total_ants <= 20 or enemy_count > total_ants:
+            max_distance = None
+        else:
+            max_distance = 15
+        pairs = self.assign(ants, free, my_hills, max_distance, exclusive=False)
+        return self.serve(ants, HILL, pairs, free, destinations, hunted, orders)
 
     def hunt_unseen(self, ants, a_row, a_col, destinations, hunted, orders):
         """Find and move toward closest unseen area"""
@@ -239,20 +368,87 @@ class AdvancedBot:
         return False
 
     def do_order(self, ants, order_type, loc, dest, destinations, hunted, orders):
-        """Execute an order (from GreedyBot)"""
+        """Execute an order (from GreedyBot)
+
+        The first step along a shortest path is tried first, then the
+        straight-line directions.
+        """
         a_row, a_col = loc
         directions = ants.direction(a_row, a_col, dest[0], dest[1])
+        step = self.path_step(ants, loc, dest)
+        if step is not None:
+            directions = [step] + [d for d in directions if d != step]
 
         for direction in directions:
             n_row, n_col = ants.destination(a_row, a_col, direction)
             if (n_row, n_col) not in destinations and ants.unoccupied(n_row, n_col):
                 ants.issue_order((a_row, a_col, direction))
-                destinations.append((n_row, n_col))
-                hunted.append(dest)
+                destinations.add((n_row, n_col))
+                hunted.add(dest)
                 orders.append([loc, (n_row, n_col), dest, order_type])
                 return True
         return False
 
+    def path_step(self, ants, loc, dest):
+        """Direction of the first step on a shortest path from loc to dest.
+
+        The path comes from the ``PathTree`` kept for ``dest``. It is grown
+        again, at least twice as deep, when an ant outside it asks, and at
+        the same depth when water has been seen on the ant's path. Returns
+        None when there is no path or ``loc`` is ``dest``.
+        """
+        width = ants.width
+        index = loc[0] * width + loc[1]
+        tree = self.paths.get(dest)
+        if tree is None:
+            tree = self.paths[dest] = self.grow_path_tree(dest, width, index, 0)
+        elif index not in tree.next and not tree.complete:
+            tree = self.paths[dest] = self.grow_path_tree(
+                dest, width, index, 2 * tree.depth
+            )
+        elif tree.water and tree.blocked(index):
+            tree = self.paths[dest] = self.grow_path_tree(
+                dest, width, index, tree.depth
+            )
+        step = tree.next.get(index, -1)
+        if step < 0:
+            return None
+        row, col = divmod(step, width)
+        for direction in AIM:
+            if ants.destination(loc[0], loc[1], direction) == (row, col):
+                return direction
+        return None
+
+    def grow_path_tree(self, dest, width, index, depth):
+        """BFS from ``dest`` until it has reached ``index`` and ``depth``."""
+        bfs = self.bfs
+        stamp = bfs.stamp
+        dist = bfs.dist
+
+        def visit(cell):
+            if dist[cell] >= depth and stamp[index] == bfs.generation:
+                return STOP
+            return None
+
+        count = bfs.search([dest[0] * width + dest[1]], visit=visit)
+        parent = bfs.parent
+        return PathTree(
+            {cell: parent[cell] for cell in bfs.order[:count]},
+            dist[bfs.order[count - 1]],
+            not bfs.reached(index),
+        )
+
+    def note_water(self, ants, water):
+        """Record newly seen water on the path trees it lies on."""
+        if not water or not self.paths:
+            return
+        width = ants.width
+        cells = [row * width + col for row, col in water]
+        for tree in self.paths.values():
+            for cell in cells:
+                if cell in tree.next:
+                    tree.water.add(cell)
+
     def wall_following_strategy(
         self, ants, a_row, a_col, destinations, new_straight, new_lefty
     ):
@@ -273,7 +469,7 @@ class AdvancedBot:
                 if ants.unoccupied(n_row, n_col) and (n_row, n_col) not in destinations:
                     ants.issue_order((a_row, a_col, direction))
                     new_straight[(n_row, n_col)] = direction
-                    destinations.append((n_row, n_col))
+                    destinations.add((n_row, n_col))
                 else:
                     # IMPROVEMENT: Try alternative directions instead of just turning
                     for alt_dir in [LEFT[direction], RIGHT[direction]]:
@@ -285,12 +481,12 @@ class AdvancedBot:
                         ):
                             ants.issue_order((a_row, a_col, alt_dir))
                             new_straight[(alt_row, alt_col)] = alt_dir
-                            destinations.append((alt_row, alt_col))
+                            destinations.add((alt_row, alt_col))
                             break
                     else:
                         # pause ant, turn and try again next turn
                         new_straight[(a_row, a_col)] = LEFT[direction]
-                        destinations.append((a_row, a_col))
+                        destinations.add((a_row, a_col))
             else:
                 # hit a wall, start following it
                 new_lefty[(a_row, a_col)] = RIGHT[direction]
@@ -314,7 +510,7 @@ class AdvancedBot:
                     ):
                         ants.issue_order((a_row, a_col, new_direction))
                         new_lefty[(n_row, n_col)] = new_direction
-                        destinations.append((n_row, n_col))
+                        destinations.add((n_row, n_col))
                         break
                     else:
                         # IMPROVEMENT: Try alternative directions when blocked
@@ -327,12 +523,12 @@ class AdvancedBot:
                             ):
                                 ants.issue_order((a_row, a_col, alt_dir))
                                 new_lefty[(alt_row, alt_col)] = alt_dir
-                                destinations.append((alt_row, alt_col))
+                                destinations.add((alt_row, alt_col))
                                 break
                         else:
                             # have ant wait until it is clear
                             new_straight[(a_row, a_col)] = RIGHT[direction]
-                            destinations.append((a_row, a_col))
+                            destinations.add((a_row, a_col))
                         break
 
 
@@ -46,7 +46,23 @@ ants in motion are less likely to be killed and can explore/pick up food.
 
 from math import sqrt
 
-from ants import FOOD, WATER, Ants  # pylint: disable=no-name-in-module
+from ants import (  # pylint: disable=no-name-in-module
+    ESSENTIAL,
+    FOOD,
+    HIGH,
+    LAND,
+    LOW,
+    WATER,
+    Ants,
+    TurnScheduler,
+)
+
+try:
+    from bfs import STOP, TorusBFS
+    from moves import resolve
+except ImportError:  # imported as part of the ``bots`` package
+    from bots.bfs import STOP, TorusBFS
+    from bots.moves import resolve
 
 # custom
 MY_HILL = 10
@@ -65,8 +81,14 @@ number_of_influences = {FOOD: 1, WAVE: 2, NOT_VISIBLE: 1, MY_HILL: 4}
 stop_propagation = [WATER]
 stop_locs = set()
 
+# order influence spreads in: e, w, s, n
+propagation = ((0, 1), (0, -1), (1, 0), (-1, 0))
+
 blocked = [FOOD, WATER]
 
+# fog edge influencers spread per unit of scheduled work
+EDGE_CHUNK = 16
+
 nrows = 0  # pylint: disable=invalid-name
 ncols = 0  # pylint: disable=invalid-name
 
@@ -96,6 +118,47 @@ class Wave:  # pylint: disable=too-few-public-methods
         self.locs = [wrap_loc((l[0] + move[0], l[1] + move[1])) for l in self.locs]
 
 
+class HillField:
+    """How influence spreads from a source that never moves (a hill).
+
+    ``order`` lists the cells in the order ``spread_influence`` reaches them
+    when no ant cutoff stops it and ``depth`` their distances. ``found[i]``
+    counts the cells reached once ``order[i]`` has been expanded and
+    ``position`` maps each reached cell to its index in ``order``.
+
+    Water found later inside the field is collected in ``water``, and
+    ``first_water`` is the earliest position it holds. Everything reached
+    before that cell would have been expanded is still exact, so the field
+    is only rebuilt when a cutoff falls beyond it.
+    """
+
+    __slots__ = ("order", "depth", "found", "position", "water", "first_water")
+
+    def __init__(self, bfs, source):
+        count = bfs.search([source])
+        order = bfs.order[:count]
+        parent = bfs.parent
+        position = {cell: i for i, cell in enumerate(order)}
+        found = [1] * count
+        for cell in order[1:]:
+            found[position[parent[cell]]] += 1
+        for i in range(1, count):
+            found[i] += found[i - 1] - 1
+        self.order = order
+        self.depth = [bfs.dist[cell] for cell in order]
+        self.found = found
+        self.position = position
+        self.water = set()
+        self.first_water = count
+
+    def add_water(self, cell):
+        """Note water found at ``cell`` if the field reaches it."""
+        i = self.position.get(cell)
+        if i is not None:
+            self.water.add(cell)
+            self.first_water = min(self.first_water, i)
+
+
 class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-attributes
     """Historical influence-map strategy with a current-protocol adapter."""
 
@@ -109,7 +172,15 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         self.visibility_map = []
         self._vision_offsets = ()
         self._visible_locs = set()
+        self._bfs = None
+        self._cell_row = ()
+        self._cell_col = ()
+        # the bot's own map: known water plus this turn's food and markers
+        self._amap = []
+        self._marked = []
+        self._fields = {}  # hill cell -> HillField
         self._is_setup = False
+        self.scheduler = TurnScheduler()
 
     def do_setup(self, ants):
         """Set initial variables"""
@@ -127,6 +198,21 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         nrows = len(self.visibility_map)
         ncols = len(self.visibility_map[0])
         stop_locs.clear()
+        self._bfs = TorusBFS(nrows, ncols, offsets=propagation)
+        self._cell_row = tuple(cell // ncols for cell in range(nrows * ncols))
+        self._cell_col = tuple(cell % ncols for cell in range(nrows * ncols))
+        self._amap = [[LAND] * ncols for _ in range(nrows)]
+        self._marked = []
+        self._fields = {}
+        self.set_stop_locs(
+            self._amap,
+            [
+                (r, c)
+                for r, row in enumerate(ants.map)
+                for c, tile in enumerate(row)
+                if tile in stop_propagation
+            ],
+        )
         self._is_setup = True
 
     @staticmethod
@@ -173,25 +259,46 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         for row, col in self._visible_locs:
             self.visibility_map[row][col] = 0
 
-    def set_stop_locs(self, amap):
+    def set_stop_locs(self, amap, locs=None):
         """Locations that stop propagation of the BFS
         ie. water
-        """
-        for r, row in enumerate(amap):
-            for c, col in enumerate(row):
-                if col in stop_propagation:
-                    stop_locs.add((r, c))
 
-    def influence_locs(self, amap):
+        ``locs`` lists the water first seen this turn, which is also marked
+        on ``amap`` and noted in the hill fields; without it the whole of
+        ``amap`` is scanned.
+        """
+        if locs is None:
+            locs = [
+                (r, c)
+                for r, row in enumerate(amap)
+                for c, col in enumerate(row)
+                if col in stop_propagation
+            ]
+        for r, c in locs:
+            if (r, c) not in stop_locs:
+                stop_locs.add((r, c))
+                amap[r][c] = WATER
+                cell = r * ncols + c
+                self._bfs.block(cell)
+                for field in self._fields.values():
+                    field.add_water(cell)
+
+    def influence_locs(self, amap, cells=None):
         """Iterate over map, if tile value (hills, food, etc)
         has influence value, add to list
+
+        ``cells`` limits the scan to the tiles that can hold one (this
+        turn's food and markers); they are taken in map order all the same.
         """
+        if cells is None:
+            cells = [(r, c) for r in range(len(amap)) for c in range(len(amap[0]))]
+        else:
+            cells = sorted(set(cells))
         locs = []
 
-        for r, row in enumerate(amap):
-            for c, col in enumerate(row):
-                if col in influence_values:
-                    locs.append(((r, c), influence_values[col]))
+        for r, c in cells:
+            if amap[r][c] in influence_values:
+                locs.append(((r, c), influence_values[amap[r][c]]))
 
         return locs
 
@@ -216,45 +323,49 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
                           3 2 3
                             3
 
-        If maximum number of ants is reached, stop propagation.
+        If maximum number of ants is reached, stop propagation. Every ant
+        next to an expanded tile counts, once per tile it borders, and the
+        search stops at the edge that reaches the limit.
         """
+        bfs = self._bfs
+        neighbors = bfs.neighbors
+        ant_cells = {r * ncols + c for r, c in my_ants}
 
         def build_influence(start_loc):
-            influence_locs = [[start_loc]]
-            queue = [start_loc]
-            old_locs = {start_loc}  # use set for improved performance
-            num_ants = 0
             max_ants = number_of_influences.get(
                 amap[start_loc[0]][start_loc[1]], len(my_ants)
             )
-
-            while True:
-                new_locs = []
-
-                for loc in queue:
-                    for direction in [(0, 1), (0, -1), (1, 0), (-1, 0)]:
-                        add = (loc[0] + direction[0], loc[1] + direction[1])
-                        add = wrap_loc(add)
-
-                        stop = add in stop_locs
-
-                        if add in my_ants:
-                            num_ants += 1
-
-                            if num_ants >= max_ants:
-                                influence_locs.append(new_locs)
-                                return influence_locs
-
-                        if add not in old_locs and not stop:
-                            old_locs.add(add)
-                            new_locs.append(add)
-
-                queue = new_locs
-
-                if not queue:
-                    return influence_locs
-
-                influence_locs.append(new_locs)
+            num_ants = 0
+            stopped_at = []
+
+            def count_ants(cell):
+                nonlocal num_ants
+                for slot, add in enumerate(neighbors[cell]):
+                    if add in ant_cells:
+                        num_ants += 1
+                        if num_ants >= max_ants:
+                            stopped_at.append((cell, slot))
+                            return STOP
+                return None
+
+            count = bfs.search([start_loc[0] * ncols + start_loc[1]], visit=count_ants)
+            dist = bfs.dist
+            influence_locs = []
+            for cell in bfs.order[:count]:
+                if dist[cell] == len(influence_locs):
+                    influence_locs.append([])
+                influence_locs[-1].append(divmod(cell, ncols))
+
+            if stopped_at:
+                # the tiles the stopping tile added before its ant edge
+                cell, slot = stopped_at[0]
+                if len(influence_locs) == dist[cell] + 1:
+                    influence_locs.append([])
+                added = set()
+                for add in neighbors[cell][:slot]:
+                    if not bfs.reached(add) and add not in added:
+                        added.add(add)
+                        influence_locs[-1].append(divmod(add, ncols))
 
             return influence_locs
 
@@ -272,6 +383,148 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
 
         return imap
 
+    def spread_influence(  # pylint: disable=too-many-locals,too-many-branches
+        self, imap, amap, locs, my_ants
+    ):
+        """``add_influence(imap, map_influence(amap, locs, my_ants))`` in one
+        pass, without the per-distance lists of tuples.
+
+        Each source is expanded a whole frontier at a time over flat cell
+        indices and its layer is added to ``imap`` as it is reached; ants
+        are counted from a per-cell table of bordering ants, so only the
+        tile that hits the ``max_ants`` cutoff walks its neighbours one by
+        one. Sources are added in order, so every cell sums to exactly what
+        the two-step version gives.
+        """
+        bfs = self._bfs
+        neighbors = bfs.neighbors
+        stamp = bfs.stamp
+        cell_row = self._cell_row
+        cell_col = self._cell_col
+        ant_cells = {r * ncols + c for r, c in my_ants}
+        # tile -> how many of its propagation edges lead onto an ant
+        bordering = {}
+        for ant in ant_cells:
+            r, c = divmod(ant, ncols)
+            for cell in {
+                ((r - d_r) % nrows) * ncols + (c - d_c) % ncols
+                for d_r, d_c in propagation
+            }:
+                near = neighbors[cell].count(ant)
+                if near:
+                    bordering[cell] = bordering.get(cell, 0) + near
+        default_max = len(my_ants)
+
+        for (row, col), strength in locs:
+            max_ants = number_of_influences.get(amap[row][col], default_max)
+            source = row * ncols + col
+            field = self._fields.get(source)
+            if field is not None:
+                stop = self._spread_field(
+                    imap, field, strength, max_ants, ant_cells, bordering
+                )
+                if stop is None:
+                    continue
+                if 2 * stop > len(field.order):
+                    field = self._fields[source] = HillField(bfs, source)
+                    self._spread_field(
+                        imap, field, strength, max_ants, ant_cells, bordering
+                    )
+                    continue
+                # a short spread is cheaper done directly than by
+                # rebuilding the field
+            bfs.generation += 1
+            gen = bfs.generation
+            stamp[source] = gen
+            layer = [source]
+            num_ants = 0
+            depth = 0
+            while layer:
+                val = strength / (depth + 1)
+                for cell in layer:
+                    imap[cell_row[cell]][cell_col[cell]] += val
+                depth += 1
+                following = []
+                for cell in layer:
+                    near = bordering.get(cell)
+                    if near is not None and num_ants + near >= max_ants:
+                        # stop at this tile's ant edge, keeping the tiles
+                        # it reached before that edge
+                        for n in neighbors[cell]:
+                            if n in ant_cells:
+                                num_ants += 1
+                                if num_ants >= max_ants:
+                                    break
+                            if stamp[n] != gen:
+                                stamp[n] = gen
+                                following.append(n)
+                        val = strength / (depth + 1)
+                        for n in following:
+                            imap[cell_row[n]][cell_col[n]] += val
+                        following = []
+                        break
+                    if near is not None:
+                        num_ants += near
+                    for n in neighbors[cell]:
+                        if stamp[n] != gen:
+                            stamp[n] = gen
+                            following.append(n)
+                layer = following
+
+        return imap
+
+    def _spread_field(  # pylint: disable=too-many-arguments,too-many-locals
+        self, imap, field, strength, max_ants, ant_cells, bordering
+    ):
+        """``spread_influence`` for one source with a cached ``HillField``:
+        the ant cutoff is found from the bordering tiles alone, then a
+        prefix of the cached order is added. When water found since the
+        field was built makes that prefix wrong, nothing is added and the
+        position the cutoff fell at in the stale order is returned.
+        """
+        position = field.position
+        found = field.found
+        water = field.water
+        num_ants = 0
+        reached = None
+        for i, near in sorted(
+            (position[cell], near)
+            for cell, near in bordering.items()
+            if cell in position and cell not in water
+        ):
+            if num_ants + near < max_ants:
+                num_ants += near
+                continue
+            if i > field.first_water:
+                return i
+            # as in spread_influence: the tiles reached before this one
+            # was expanded, then its new neighbours up to the ant edge
+            reached = found[i - 1] if i else 1
+            children = range(reached, found[i])
+            for n in self._bfs.neighbors[field.order[i]]:
+                if n in ant_cells:
+                    num_ants += 1
+                    if num_ants >= max_ants:
+                        break
+                if position.get(n, -1) in children:
+                    reached = max(reached, position[n] + 1)
+            break
+        if reached is None:
+            if water:
+                return len(field.order)
+            reached = len(field.order)
+
+        cell_row = self._cell_row
+        cell_col = self._cell_col
+        decay = [strength / (depth + 1) for depth in range(field.depth[-1] + 1)]
+        depth = field.depth
+        order = field.order
+        for i in range(reached):
+            cell = order[i]
+            if cell not in water:
+                imap[cell_row[cell]][cell_col[cell]] += decay[depth[i]]
+        return None
+
     def locs_within(self, loc, distance, true_distance=False):
         """Get all locations within distance from loc"""
         locs = []
@@ -364,63 +617,33 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         return []
 
     def issue_orders(self, my_ants, ants, mmap):
-        """Loop through queue of ants, removing them if they have a valid space to move into."""
-        prev_destinations = set()
-
-        level = 0
-        turns_without_order = 0
-
-        while my_ants:
-            loc = my_ants.pop(0)
-
-            # look for marker in queue, if so the following ants will choose their next best spot
-            # also check if too many turns have passed without issuing an order (this typically
-            # happens if ants want to move into each other's space)
-            if loc is None or turns_without_order >= len(my_ants) + 1:
-                level += 1
-                if level > 4:
-                    break
-                continue
-
+        """Rank each ant's moves by influence once, then settle the whole
+        colony at once so no two ants end on the same tile (see ``moves``).
+        """
+        directions = ["n", "s", "e", "w", "stay"]
+        choices = []
+        steps = []
+        for loc in my_ants:
             # add current loc to possible directions
-            directions = ["n", "s", "e", "w"]
-            surrounding = [self._destination(ants, loc, d) for d in directions] + [loc]
-            directions += ["stay"]
+            surrounding = [self._destination(ants, loc, d) for d in directions[:4]]
+            surrounding.append(loc)
 
             # sort by best score
             influences = [mmap[r][c] for r, c in surrounding]
-            max_idx = [
-                i
-                for _, i in sorted(
-                    zip(influences, range(len(influences))), reverse=True
-                )
-            ][level]
-            destination = directions[max_idx]
-
-            # highest influence is current spot
-            if destination == "stay":
-                prev_destinations.add(loc)
-                continue
-
-            move_loc = surrounding[max_idx]
-
-            # if moving into a square where another ant currently is, move to back of queue
-            if move_loc in my_ants:
-                my_ants.append(loc)
-                turns_without_order += 1
-                continue
-
-            # trying to move into a space another ant has already chosen, append marker to queue
-            if move_loc in prev_destinations:
-                if None not in my_ants:
-                    my_ants.append(None)
-                my_ants.append(loc)
-                continue
+            choices.append(
+                [
+                    surrounding[i]
+                    for _, i in sorted(
+                        zip(influences, range(len(influences))), reverse=True
+                    )
+                ]
+            )
+            steps.append(dict(zip(surrounding, directions)))
 
+        for loc, move_loc, step in zip(my_ants, resolve(my_ants, choices), steps):
             # go!
-            prev_destinations.add(move_loc)
-            turns_without_order = 0
-            ants.issue_order((loc[0], loc[1], destination))
+            if move_loc != loc:
+                ants.issue_order((loc[0], loc[1], step[move_loc]))
 
     def do_turn(self, ants):  # pylint: disable=too-many-branches
         """Baked in turn function"""
@@ -429,9 +652,15 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         my_ants = ants.my_ants()
         self.update_visibility(my_ants)
 
-        # The historical code annotated the runtime map in place. Work on a
-        # copy so strategy-only markers cannot leak into the protocol state.
-        amap = [row[:] for row in ants.map]
+        # The historical code annotated the runtime map in place. The bot
+        # keeps its own map instead, so strategy-only markers cannot leak
+        # into the protocol state: known water, plus this turn's food and
+        # markers, which are cleared again next turn.
+        amap = self._amap
+        for r, c in self._marked:
+            amap[r][c] = LAND
+        food = ants.food()
+        amap = self.add_to_map(amap, food, FOOD)
 
         # add hills if not already added
         if not self.my_hill:
@@ -459,7 +688,11 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         imap = self.map_zeros(amap)
 
         # create spots which stop propagation, such as water
-        self.set_stop_locs(amap)
+        self.set_stop_locs(amap, ants.new_water)
+        for hill in (self.my_hill, self.enemy_hill):
+            if hill and hill[0] * ncols + hill[1] not in self._fields:
+                cell = hill[0] * ncols + hill[1]
+                self._fields[cell] = HillField(self._bfs, cell)
 
         # add custom locs to map for influencing
         amap = self.add_to_map(amap, my_ants, ALLY_ANT)
@@ -470,8 +703,11 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
         if self.enemy_hill:
             amap = self.add_to_map(amap, [self.enemy_hill], ENEMY_HILL)
 
+        self._marked = marked = food + my_ants + enemy_ants
+        marked += [hill for hill in (self.my_hill, self.enemy_hill) if hill]
+
         # get influence locations from ants map
-        ilocs = self.influence_locs(amap)
+        ilocs = self.influence_locs(amap, marked)
 
         # waves
         for wave in self.waves:
@@ -479,26 +715,53 @@ class IForOneWelcomeOurNewInsectOverlords:  # pylint: disable=too-many-instance-
             for loc in wave.locs:
                 ilocs.append((loc, influence_values[WAVE]))
 
+        # Influence is summed into the map of zeros phase by phase, in the
+        # same source order as one combined pass; when the turn runs short
+        # the fog edges are cut first, then hill defense and combat.
+        scheduler = self.scheduler
+        scheduler.add(
+            "influence",
+            lambda: self.spread_influence(imap, amap, ilocs, my_ants),
+            ESSENTIAL,
+        )
         # add vision/edge influencers
-        ilocs += [(loc, NOT_VISIBLE) for loc in self.edge_locs(my_ants, ants)]
-
+        scheduler.add(
+            "edges", lambda: self.spread_edges(imap, amap, my_ants, ants), LOW
+        )
         # check if hill needs defending
-        ilocs += self.hill_defense(enemy_ants, ants)
-
-        # influence list of lists
-        influence = self.map_influence(amap, ilocs, my_ants)
-
-        # add all influencers to map of zeros
-        mmap = self.add_influence(imap, influence)
-
+        scheduler.add(
+            "hill",
+            lambda: self.spread_influence(
+                imap, amap, self.hill_defense(enemy_ants, ants), my_ants
+            ),
+            HIGH,
+        )
         # prevent ants from moving to where they will die
-        mmap = self.combat_map(mmap, my_ants, enemy_ants, ants)
-
-        # food/water tiles are blocking, so prevent movement to them
-        for r, row in enumerate(amap):
-            for c, tile in enumerate(row):
-                if tile in blocked:
-                    mmap[r][c] = -10000
+        scheduler.add(
+            "combat", lambda: self.combat_map(imap, my_ants, enemy_ants, ants), HIGH
+        )
+        scheduler.add(
+            "orders", lambda: self.block_and_order(amap, imap, my_ants, ants), ESSENTIAL
+        )
+        scheduler.run(ants)
+
+    def spread_edges(self, imap, amap, my_ants, ants):
+        """Add the fog edge influencers, yielding after each ``EDGE_CHUNK``."""
+        edges = [(loc, NOT_VISIBLE) for loc in self.edge_locs(my_ants, ants)]
+        for start in range(0, len(edges), EDGE_CHUNK):
+            chunk = edges[start : start + EDGE_CHUNK]
+            self.spread_influence(imap, amap, chunk, my_ants)
+            yield
+
+    def block_and_order(self, amap, mmap, my_ants, ants):
+        """Keep ants off food and water, then move them."""
+        # food/water tiles are blocking, so prevent movement to them; orders
+        # only read the tiles an ant stands on or next to
+        for r, c in my_ants:
+            for d_r, d_c in ((0, 0),) + propagation:
+                r2, c2 = (r + d_r) % nrows, (c + d_c) % ncols
+                if amap[r2][c2] in blocked:
+                    mmap[r2][c2] = -10000
 
         self.issue_orders(my_ants, ants, mmap)
 
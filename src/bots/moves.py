@@ -0,0 +1,96 @@
+"""Conflict-free move resolution for a whole colony at once.
+
+A bot that scores each ant's possible moves still has to turn those scores
+into orders that never put two ants on one square. Deciding ant by ant and
+re-queueing the losers costs a pass over the colony per retry; this module
+settles everyone in one sweep.
+
+Each ant brings its destinations in order of preference, its own square
+meaning "stay". Proposals are served best rank first, ants in the order
+given breaking ties. A square is taken by the first ant to claim it. A
+square still occupied by an ant that has not settled is not refused but
+deferred: the claimant waits until that ant either leaves (the square is
+then free) or stays (the claimant moves on to its next choice). When only
+waiting ants are left, they are waiting on each other in a cycle - a swap
+or a rotation, which leaves the squares occupied as before - and the last
+ant in the order gives way by moving on to its next choice. An ant's own
+square cannot be taken while it is undecided, so staying always remains
+open and every ant ends up somewhere.
+
+Example::
+
+    ranked = [best_moves(ant) for ant in my_ants]  # e.g. [(r, c), ...]
+    for ant, dest in zip(my_ants, resolve(my_ants, ranked)):
+        if dest != ant:
+            ...  # order the ant toward dest
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Dict, Hashable, List, Optional, Sequence
+
+
+def resolve(
+    starts: Sequence[Hashable], choices: Sequence[Sequence[Hashable]]
+) -> List[Hashable]:
+    """Pick a distinct destination for every ant.
+
+    ``starts[i]`` is ant ``i``'s square and ``choices[i]`` its destinations,
+    best first; squares are any hashable value. Ants are never sent past
+    staying put: choices after ``starts[i]`` are ignored, and if it is
+    missing it is tried last. Returns each ant's destination, in order.
+    """
+    prefs = []
+    for start, ranked in zip(starts, choices):
+        ranked = list(ranked)
+        if start in ranked:
+            del ranked[ranked.index(start) + 1 :]
+        else:
+            ranked.append(start)
+        prefs.append(ranked)
+    occupant = {start: i for i, start in enumerate(starts)}
+    dest: List[Optional[Hashable]] = [None] * len(prefs)
+    claimed: Dict[Hashable, int] = {}
+    rank = [0] * len(prefs)
+    waiters: Dict[int, List[int]] = {}
+    waiting_on: Dict[int, int] = {}
+    heap = [(0, i) for i in range(len(prefs))]
+
+    while True:
+        while heap:
+            _, i = heapq.heappop(heap)
+            cell = prefs[i][rank[i]]
+            if cell in claimed:
+                rank[i] += 1
+                heapq.heappush(heap, (rank[i], i))
+                continue
+            j = occupant.get(cell, i)
+            if j != i and dest[j] is None:
+                waiters.setdefault(j, []).append(i)
+                waiting_on[i] = j
+                continue
+            dest[i] = cell
+            claimed[cell] = i
+            for k in waiters.pop(i, ()):
+                if waiting_on.get(k) == i:
+                    del waiting_on[k]
+                    if cell == starts[i]:
+                        rank[k] += 1
+                    heapq.heappush(heap, (rank[k], k))
+        if not waiting_on:
+            return dest
+        # everyone left waits on an ant that waits too, so following them
+        # leads round a cycle; its last ant gives way
+        i = next(iter(waiting_on))
+        seen = set()
+        while i not in seen:
+            seen.add(i)
+            i = waiting_on[i]
+        cycle = [i]
+        while waiting_on[cycle[-1]] != i:
+            cycle.append(waiting_on[cycle[-1]])
+        i = max(cycle)
+        del waiting_on[i]
+        rank[i] += 1
+        heapq.heappush(heap, (rank[i], i))
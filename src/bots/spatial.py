@@ -0,0 +1,86 @@
+"""Bucketed spatial hash on the torus, for "who is near this square" scans.
+
+Comparing every ant with every other costs a pass over the colony per ant,
+which late in a game is hundreds of thousands of checks a turn. A
+:class:`SpatialHash` files items into square buckets at least ``radius``
+squares on a side, so everything within ``radius`` rows and ``radius``
+columns of a square lies in its own bucket or one of the eight around it.
+Queries return those candidates; the caller still applies the exact test.
+
+The bucket layout depends only on the map size, so one hash is built per
+game and refilled each turn with :meth:`SpatialHash.clear` and
+:meth:`SpatialHash.add`. Buckets wrap around the torus like the map, and a
+map too small for three buckets on an axis just has fewer, each visited
+once.
+
+Example::
+
+    near = SpatialHash(rows, cols, radius=9)
+    for ant in ants:
+        near.add(ant.row, ant.col, ant)
+    for other in near.near(row, col):
+        ...  # still check the distance to other
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Tuple
+
+
+class SpatialHash:
+    """Items filed by square on a ``rows`` x ``cols`` torus."""
+
+    def __init__(self, rows: int, cols: int, radius: int) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.radius = radius
+        # every bucket is at least ``radius`` squares tall and wide; the
+        # remainder is spread over the buckets rather than left as a sliver
+        bucket_rows = max(1, rows // radius)
+        self.bucket_cols = bucket_cols = max(1, cols // radius)
+        self._row_bucket = [row * bucket_rows // rows for row in range(rows)]
+        self._col_bucket = [col * bucket_cols // cols for col in range(cols)]
+        # the distinct buckets in the 3x3 block around each bucket
+        self._around: List[Tuple[int, ...]] = [
+            tuple(
+                sorted(
+                    {
+                        ((row + d_row) % bucket_rows) * bucket_cols
+                        + (col + d_col) % bucket_cols
+                        for d_row in (-1, 0, 1)
+                        for d_col in (-1, 0, 1)
+                    }
+                )
+            )
+            for row in range(bucket_rows)
+            for col in range(bucket_cols)
+        ]
+        self.buckets: Dict[int, List[Any]] = {}
+
+    def bucket(self, row: int, col: int) -> int:
+        """The bucket square ``(row, col)`` is filed under."""
+        return self._row_bucket[row] * self.bucket_cols + self._col_bucket[col]
+
+    def clear(self) -> None:
+        """Drop every item, keeping the layout."""
+        self.buckets.clear()
+
+    def add(self, row: int, col: int, item: Any) -> None:
+        """File ``item`` under square ``(row, col)``."""
+        bucket = self._row_bucket[row] * self.bucket_cols + self._col_bucket[col]
+        items = self.buckets.get(bucket)
+        if items is None:
+            self.buckets[bucket] = [item]
+        else:
+            items.append(item)
+
+    def near(self, row: int, col: int) -> Iterator[Any]:
+        """Every item that may lie within ``radius`` rows and ``radius``
+        columns of ``(row, col)``, bucket by bucket and in the order added
+        within a bucket; each item is returned once.
+        """
+        buckets = self.buckets
+        for bucket in self._around[self.bucket(row, col)]:
+            items = buckets.get(bucket)
+            if items:
+                yield from items
@@ -33,8 +33,22 @@ from __future__ import annotations
 
 import sys
 import time
+from array import array
 from collections import deque
-from typing import Deque, Dict, List, Optional, Set, Tuple
+from typing import (
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
 
 # Reuse the shared helper API for stdio + map state. Constants we use:
 #   MY_ANT (0), LAND (-2), FOOD (-3), WATER (-4), UNSEEN (-5), HILL (-6)
@@ -52,6 +66,13 @@ from ants import (  # type: ignore[import-not-found]  # pylint: disable=no-name-
     Ants,
 )
 
+try:
+    from bfs import SKIP, STOP, TorusBFS
+    from spatial import SpatialHash
+except ImportError:  # imported as part of the ``bots`` package
+    from bots.bfs import SKIP, STOP, TorusBFS
+    from bots.spatial import SpatialHash
+
 # ---------------------------------------------------------------------------
 # Tunable constants (lifted directly from Strategy.java)
 # ---------------------------------------------------------------------------
@@ -63,8 +84,10 @@ CLOSE_ENEMY_RADIUS2: int = CLOSE_ENEMY_RADIUS**2
 AREA_DIST: int = 20
 
 # Time budget per turn, in ms; xathis sets isTimeout at 420ms and the engine
-# default turntime is 500ms. We keep the same headroom.
+# default turntime is 500ms. We keep the same headroom, scaled to the game's
+# actual turntime each turn (see ``do_turn``).
 TURN_TIME_BUDGET_MS: int = 420
+ENGINE_TURNTIME_MS: int = 500
 
 # Hill defence horizon — Strategy.java:389
 DEFENCE_HORIZON: int = 14
@@ -78,91 +101,306 @@ EXPLORE_BFS_HORIZON: int = 11
 # Escape BFS horizon — Strategy.java:599
 ESCAPE_CHECK_DIST: int = 8
 
+# Distribute BFS radius, one less once the colony has
+# DISTRIBUTE_CROWDED_ANTS ants — Strategy.java:175
+DISTRIBUTE_CHECK_DIST: int = 9
+DISTRIBUTE_CROWDED_ANTS: int = 160
+
+# Mission path and border search limit — Strategy.java:338, 1574
+MISSION_MAX_DIST: int = 400
+
+# A mission's target is moved to the nearest border at least this often,
+# and on every turn while less than MISSION_UPDATE_TIME_MS of the 500ms
+# turn is spent — Strategy.java:294
+MISSION_UPDATE_TURNS: int = 10
+MISSION_UPDATE_TIME_MS: int = 250
+
 # Group-fight cap (per side). xathis uses dependency tables + prec-grouping
-# to handle larger groups; we cap at 4 ants per side and exhaustive-search.
-# Larger groups fall through to the safety gates and the rest of the ladder.
-FIGHT_GROUP_CAP: int = 4
+# to handle larger groups; we cap at 8 ants per side and search them with
+# FightSearch. Larger groups fall through to the safety gates and the rest
+# of the ladder.
+FIGHT_GROUP_CAP: int = 8
+
+# Ants placed per group search. A fully-mobile 8v8 fight has up to
+# 5^8 * 5^8 joint moves; past this many nodes the best joint move
+# evaluated so far is played, which keeps turn time predictable.
+FIGHT_NODE_CAP: int = 50_000
 
-# Hard ceiling on the (my_options × enemy_options) product. Even with
-# group cap = 4, a fully-mobile 4v4 fight can hit 5^4 * 5^4 = 390 625
-# combinations; we fall through past this to keep turn time predictable.
-FIGHT_BRANCHING_CAP: int = 200_000
+# Below any score the fight search can see.
+_NO_BOUND: int = -(1 << 60)
 
 
 # ---------------------------------------------------------------------------
 # Data classes
 # ---------------------------------------------------------------------------
-class Tile:
-    """A single map cell. Persisted across turns; mutable.
-
-    Mirrors ``docs/reference/xathis/Tile.java``. Many fields are scratch
-    space for various BFS passes; we reset them between phases via the
-    standard ``isReached`` / ``changedTiles`` pattern.
+class TileGraph:
+    """The map as flat per-cell arrays (a struct of arrays).
+
+    Cell ``index`` is ``row * cols + col`` and :meth:`tile` is its
+    :class:`Tile` view, made the first time it is asked for. ``neighbors``
+    is the navigation graph: one tuple of indices per cell, n/e/s/w, with
+    water pruned (``Tile.removeNeighbor``, Tile.java:67). The shared
+    :class:`TorusBFS` searches it directly.
+
+    ``terrain`` is what persists between turns (LAND or WATER) and
+    ``tile_type`` is this turn's contents on top of it. A cell's
+    ``explore_value`` is ``clock - explored[index]``, so aging every tile
+    by one is a single increment of ``clock``. The territory flags work the
+    same way: a cell is in my area, or on its border, while its entry in
+    ``in_my_area`` or ``border`` equals ``area_mark``, so bumping the mark
+    clears them all.
+
+    The distance tables are indexed by the wrapped offset between two
+    cells, :meth:`offset`: ``dist2`` is the squared Euclidean distance on
+    the torus, and ``in_alpha``/``in_beta``/``in_gamma``/``in_close`` flag
+    (1 or 0) whether two cells that far apart are in that range of each
+    other (see :meth:`XathisBot.is_alpha_dist`).
     """
 
     __slots__ = (
-        "row",
-        "col",
+        "rows",
+        "cols",
+        "size",
+        "terrain",
+        "water_count",
         "tile_type",
         "ant",
         "old_ant",
-        "neighbors",
         "is_hill",
         "hill_player",
-        # bfs scratch (not reset between turns)
-        "dist",
-        "hill_dist",
-        "prev",
-        "is_reached",
-        # food bfs
-        "source",
-        # explore
-        "explore_value",
-        "prev_firsts",
-        "has_new_land",
-        # A*
-        "f",
-        # distribute
-        "is_reached_by_me",
-        # combat simulation
-        "has_virt_ant",
-        # areas
-        "start_tile",
-        "is_in_my_area",
-        "is_border",
-        # willStay detection
-        "stay_turn_count",
+        "clock",
+        "explored",
+        "area_mark",
+        "in_my_area",
+        "border",
         "stay_value",
-        # dep tables
-        "is_checked",
+        "stay_turn_count",
+        "neighbors",
+        "_views",
+        "dist2",
+        "in_alpha",
+        "in_beta",
+        "in_gamma",
+        "in_close",
+        "_no_ants",
+        "_no_stays",
     )
 
-    def __init__(self, row: int, col: int) -> None:
-        self.row = row
-        self.col = col
-        self.tile_type: int = LAND
-        self.ant: Optional["Ant"] = None
-        self.old_ant: Optional["Ant"] = None
-        self.neighbors: Tuple["Tile", ...] = ()
-        self.is_hill: bool = False
-        self.hill_player: int = -1
-        self.dist: int = 0
-        self.hill_dist: int = 1 << 30
-        self.prev: Optional["Tile"] = None
-        self.is_reached: bool = False
-        self.source: Optional["Tile"] = None
-        self.explore_value: int = 100
-        self.prev_firsts: Set["Tile"] = set()
-        self.has_new_land: bool = False
-        self.f: int = 0
-        self.is_reached_by_me: bool = False
-        self.has_virt_ant: bool = False
-        self.start_tile: Optional["Tile"] = None
-        self.is_in_my_area: bool = False
-        self.is_border: bool = False
-        self.stay_turn_count: int = 0
-        self.stay_value: int = -1
-        self.is_checked: bool = False
+    def __init__(self, rows: int, cols: int) -> None:
+        self.rows = rows
+        self.cols = cols
+        self.size = size = rows * cols
+        self.terrain = array("b", [LAND]) * size
+        self.water_count = 0
+        self.tile_type = array("b", [LAND]) * size
+        self.ant: List[Optional["Ant"]] = [None] * size
+        self.old_ant: List[Optional["Ant"]] = [None] * size
+        self.is_hill = bytearray(size)
+        self.hill_player = array("b", [-1]) * size
+        # every tile starts with an explore value of 100
+        self.clock = 0
+        self.explored = array("i", [-100]) * size
+        self.area_mark = 0
+        self.in_my_area = array("i", [-1]) * size
+        self.border = array("i", [-1]) * size
+        self.stay_value = array("b", [-1]) * size
+        self.stay_turn_count = array("i", [0]) * size
+        # one int object per cell, shared by the tables below
+        cells = list(range(size))
+        self.neighbors: List[Tuple[int, ...]] = [
+            (
+                cells[((row - 1) % rows) * cols + col],  # n
+                cells[row * cols + (col + 1) % cols],  # e
+                cells[((row + 1) % rows) * cols + col],  # s
+                cells[row * cols + (col - 1) % cols],  # w
+            )
+            for row in range(rows)
+            for col in range(cols)
+        ]
+        self._views: List[Optional["Tile"]] = [None] * size
+        self._init_ranges()
+        # blank rows the per-turn resets copy from
+        self._no_ants: List[Optional["Ant"]] = [None] * size
+        self._no_stays = array("b", [-1]) * size
+
+    def _init_ranges(self) -> None:
+        rows, cols = self.rows, self.cols
+        col_squares = [min(col, cols - col) ** 2 for col in range(cols)]
+        self.dist2 = array("i")
+        for row in range(rows):
+            row_square = min(row, rows - row) ** 2
+            self.dist2.extend([row_square + sq for sq in col_squares])
+        self.in_alpha = bytearray(self.size)
+        self.in_beta = bytearray(self.size)
+        self.in_gamma = bytearray(self.size)
+        self.in_close = bytearray(self.size)
+        # every range fits in a 5-step box; on small maps several offsets
+        # land on one cell, which then gets its true wrapped distance
+        for d_row in range(-5, 6):
+            dr = min(d_row % rows, -d_row % rows)
+            for d_col in range(-5, 6):
+                dc = min(d_col % cols, -d_col % cols)
+                offset = (d_row % rows) * cols + d_col % cols
+                self.in_alpha[offset] = (dc <= 1 and dr <= 2) or (dc == 2 and dr <= 1)
+                self.in_beta[offset] = dr + dc <= 4 and 4 not in (dr, dc)
+                self.in_gamma[offset] = dr + dc <= 5 and 5 not in (dr, dc)
+                self.in_close[offset] = dr <= 5 and dc <= 5
+
+    def tile(self, index: int) -> "Tile":
+        """The view of cell ``index``; the same object on every call."""
+        tile = self._views[index]
+        if tile is None:
+            tile = self._views[index] = Tile(self, index)
+        return tile
+
+    def offset(self, a: int, b: int) -> int:
+        """The wrapped offset from cell ``b`` to cell ``a``, indexing the
+        distance tables.
+        """
+        cols = self.cols
+        return ((a // cols - b // cols) % self.rows) * cols + (a - b) % cols
+
+    def add_water(self, index: int) -> bool:
+        """Make ``index`` water and prune it from the navigation graph.
+
+        Returns False if it was already known to be water.
+        """
+        if self.terrain[index] == WATER:
+            return False
+        self.terrain[index] = WATER
+        self.tile_type[index] = WATER
+        self.water_count += 1
+        neighbors = self.neighbors
+        for n in neighbors[index]:
+            if index in neighbors[n]:
+                neighbors[n] = tuple(x for x in neighbors[n] if x != index)
+        neighbors[index] = ()
+        return True
+
+    def clear(self) -> None:
+        """Forget last turn's ants, food and moves; only terrain is kept."""
+        self.tile_type[:] = self.terrain
+        self.ant[:] = self._no_ants
+        self.old_ant[:] = self._no_ants
+
+    def age(self, occupied: Iterable[int]) -> None:
+        """Start a turn's aging: every explore value goes up by one, the
+        territory flags are cleared, and the stay bookkeeping is forgotten
+        on every cell but ``occupied``.
+        """
+        self.clock += 1
+        self.area_mark += 1
+        stay_value = self.stay_value
+        kept = [(index, stay_value[index]) for index in occupied]
+        stay_value[:] = self._no_stays
+        for index, value in kept:
+            stay_value[index] = value
+
+
+class TileRow:
+    """One row of the map as :class:`Tile` views, ``tiles[row][col]``;
+    the views come from :meth:`TileGraph.tile`.
+    """
+
+    __slots__ = ("graph", "start")
+
+    def __init__(self, graph: TileGraph, start: int) -> None:
+        self.graph = graph
+        self.start = start
+
+    def __len__(self) -> int:
+        return self.graph.cols
+
+    def __getitem__(self, col: int) -> "Tile":
+        cols = self.graph.cols
+        if not -cols <= col < cols:
+            raise IndexError(col)
+        return self.graph.tile(self.start + col % cols)
+
+    def __iter__(self) -> Iterator["Tile"]:
+        tile = self.graph.tile
+        return (tile(index) for index in range(self.start, self.start + len(self)))
+
+
+def _cell(name: str) -> property:
+    """A :class:`Tile` attribute stored in the graph's ``name`` array."""
+
+    def get(tile: "Tile") -> Any:
+        return getattr(tile.graph, name)[tile.index]
+
+    def put(tile: "Tile", value: Any) -> None:
+        getattr(tile.graph, name)[tile.index] = value
+
+    return property(get, put)
+
+
+class Tile:
+    """A single map cell: a view of one index of a :class:`TileGraph`.
+
+    Mirrors ``docs/reference/xathis/Tile.java``. Only the position lives on
+    the object; every other field reads and writes the graph's arrays. The
+    Java's per-tile BFS scratch fields are gone: the ported phases keep
+    their search state in the shared :class:`TorusBFS` arrays instead (see
+    :meth:`XathisBot._grid`). Views are made on first use by
+    :meth:`TileGraph.tile`, at most one per cell, so tiles compare and hash
+    by identity.
+    """
+
+    __slots__ = ("graph", "index", "row", "col")
+
+    tile_type = _cell("tile_type")
+    ant = _cell("ant")
+    old_ant = _cell("old_ant")
+    hill_player = _cell("hill_player")
+    # willStay detection
+    stay_value = _cell("stay_value")
+    stay_turn_count = _cell("stay_turn_count")
+
+    def __init__(self, graph: TileGraph, index: int) -> None:
+        self.graph = graph
+        self.index = index
+        self.row, self.col = divmod(index, graph.cols)
+
+    @property
+    def is_hill(self) -> bool:
+        return bool(self.graph.is_hill[self.index])
+
+    @is_hill.setter
+    def is_hill(self, value: bool) -> None:
+        self.graph.is_hill[self.index] = value
+
+    @property
+    def is_in_my_area(self) -> bool:
+        return self.graph.in_my_area[self.index] == self.graph.area_mark
+
+    @is_in_my_area.setter
+    def is_in_my_area(self, value: bool) -> None:
+        self.graph.in_my_area[self.index] = self.graph.area_mark if value else -1
+
+    @property
+    def is_border(self) -> bool:
+        return self.graph.border[self.index] == self.graph.area_mark
+
+    @is_border.setter
+    def is_border(self, value: bool) -> None:
+        self.graph.border[self.index] = self.graph.area_mark if value else -1
+
+    @property
+    def explore_value(self) -> int:
+        return self.graph.clock - self.graph.explored[self.index]
+
+    @explore_value.setter
+    def explore_value(self, value: int) -> None:
+        self.graph.explored[self.index] = self.graph.clock - value
+
+    @property
+    def neighbors(self) -> Tuple["Tile", ...]:
+        tile = self.graph.tile
+        return tuple(tile(n) for n in self.graph.neighbors[self.index])
+
+    @neighbors.setter
+    def neighbors(self, value: Iterable["Tile"]) -> None:
+        self.graph.neighbors[self.index] = tuple(n.index for n in value)
 
     def is_free(self) -> bool:
         """True if this tile is land (not water, food, ant, or hill).
@@ -171,10 +409,10 @@ class Tile:
         in the Java version 'free' means LAND specifically, and food /
         hills / ants are considered occupied.
         """
-        return self.tile_type == LAND
+        return self.graph.tile_type[self.index] == LAND
 
     def is_enemy(self) -> bool:
-        return self.tile_type > MY_ANT  # players 1..9
+        return self.graph.tile_type[self.index] > MY_ANT  # players 1..9
 
     def dir_to(self, other: "Tile") -> str:
         """Return the cardinal direction ('n'/'e'/'s'/'w') from this tile
@@ -271,16 +509,331 @@ class Mission:
     """A long-running goal: an ant heading toward a target tile.
 
     Mirrors ``Strategy.Mission`` (Strategy.java:256). Persists across
-    turns; the path is recomputed via A* every time.
+    turns. Unlike the Java, which runs A* for every mission every turn,
+    the planned path is kept and walked until it stops being usable (see
+    :meth:`XathisBot._mission_step`).
     """
 
-    __slots__ = ("target", "curr_tile", "last_updated", "is_removed")
+    __slots__ = (
+        "target",
+        "curr_tile",
+        "last_updated",
+        "is_removed",
+        "path",
+        "water_count",
+    )
 
     def __init__(self, target: Tile, curr_tile: Tile, turn: int) -> None:
         self.target: Tile = target
         self.curr_tile: Tile = curr_tile
         self.last_updated: int = turn
         self.is_removed: bool = False
+        # cells still to walk, the next step last; planned when the map
+        # had ``water_count`` water cells
+        self.path: List[int] = []
+        self.water_count: int = 0
+
+
+class Area:
+    """Territory held by one side: the tiles its ants' waves reach first,
+    merged where the waves of two of its ants meet.
+
+    Mirrors ``Strategy.Area`` (Strategy.java:668). The per-tile
+    ``isInMyArea`` flags live in the graph (``Tile.is_in_my_area``), so the
+    Java's tile list is not kept; ``border`` is filled in for fight areas
+    only.
+    """
+
+    __slots__ = ("is_mine", "ants", "hill", "border")
+
+    def __init__(self, is_mine: bool) -> None:
+        self.is_mine: bool = is_mine
+        self.ants: List[Ant] = []
+        # one of my hills inside the area, if any
+        self.hill: Optional[Tile] = None
+        self.border: List[Tile] = []
+
+    @property
+    def contains_hill(self) -> bool:
+        return self.hill is not None
+
+
+class Ball:
+    """The squares one ant covers for :meth:`XathisBot._distribute`, kept
+    for the rest of the turn.
+
+    ``cells`` are the squares within the check distance of ``centre``.
+    Until the ant moves, ``reach`` also lists every square one step
+    further, with its distance ``dist`` and first-step mask ``first`` (as
+    ``TorusBFS.search`` with ``track_first``); the ball around each of
+    ``centre``'s neighbours is read off these without another search.
+    ``reach`` stays empty on maps where that does not hold.
+    """
+
+    __slots__ = ("centre", "cells", "reach", "dist", "first")
+
+    def __init__(self, centre: int) -> None:
+        self.centre: int = centre
+        self.cells: List[int] = []
+        self.reach: List[int] = []
+        self.dist: List[int] = []
+        self.first: List[int] = []
+
+
+class FightSearch:
+    """Max-min search over the joint moves of one gamma group.
+
+    My ants move first, one ant per ply; the enemy then answers knowing
+    all of them, again one ant per ply. A joint move of mine is worth the
+    worst score the enemy can force against it (see
+    :meth:`XathisBot._eval_battle` for the battle rule), and the best one
+    is the joint move worth the most. Ties go to the joint move that comes
+    first with every ant's options in the order given, so "stay" wins
+    ties exactly as in an exhaustive search.
+
+    The enemy's reply is searched with alpha-beta cuts at each enemy ply:
+    it stops as soon as it is no better for me than the best joint move
+    found so far. To reach those cuts early, options are tried
+    attack-first (the move that reaches the most opponents goes first, but
+    my ants still try "stay" first), and each enemy ant first tries the
+    move of the last reply that cut. Which enemy destinations each of my
+    ants reaches is kept up to date as my ants are placed, and threat
+    counts as the enemy's are, so a leaf only settles deaths over the
+    pairs in range. An enemy ant none of whose moves reaches my ants is
+    left out of the reply. Replies are kept in a transposition table keyed
+    by the set of squares my ants end on, so joint moves that put them on
+    the same squares in a different assignment are searched once.
+
+    Every ant placed counts as a node. After ``max_nodes`` nodes, or once
+    ``expired()`` returns True, the search stops and :attr:`best` is the
+    best of the joint moves evaluated in full; :attr:`complete` says
+    whether that was all of them.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        my_options: Sequence[Sequence[int]],
+        enemy_options: Sequence[Sequence[int]],
+        alpha: Callable[[int, int], bool],
+        hill_bonus: Dict[int, int],
+        max_nodes: int,
+        expired: Callable[[], bool] = lambda: False,
+    ) -> None:
+        """``my_options[i]`` and ``enemy_options[j]`` are an ant's
+        destination cells, its own cell first; ``alpha(mine, theirs)`` is
+        the attack-range test and ``hill_bonus`` the extra score for one of
+        my ants ending on a cell.
+        """
+        self.enemy_options = enemy_options
+        self.hill_bonus = hill_bonus
+        self.max_nodes = max_nodes
+        self.expired = expired
+        # which of my ants are in range of each enemy destination, and the
+        # enemy destinations in range of each of mine
+        self._hits: Dict[int, List[int]] = {
+            cell: [] for options in enemy_options for cell in options
+        }
+        self._reaches: Dict[int, List[int]] = {
+            cell: [theirs for theirs in self._hits if alpha(cell, theirs)]
+            for options in my_options
+            for cell in options
+        }
+        # my ants' options as (position in options, cell): stay first,
+        # then the moves that reach the most enemy destinations
+        reaches = self._reaches
+        self._my_order = [
+            [(0, options[0])]
+            + sorted(enumerate(options[1:], 1), key=lambda o: -len(reaches[o[1]]))
+            for options in my_options
+        ]
+        # combo rank of a joint move: the position of each ant's option,
+        # the first ant's varying fastest
+        self._strides: List[int] = []
+        self._span = 1
+        for options in my_options:
+            self._strides.append(self._span)
+            self._span *= len(options)
+        self.table: Dict[FrozenSet[int], Tuple[int, bool]] = {}
+        self.nodes = 0
+        self.complete = True
+        self.best: Optional[Tuple[int, ...]] = None
+        self.value = 0
+        # state of the search in progress
+        self._best_key = _NO_BOUND
+        self._width = 0
+        self._mine: List[int] = [0] * len(my_options)
+        self._taken: Set[int] = set()
+        self._killer: List[int] = [options[0] for options in enemy_options]
+        self._score = 0
+        self._alpha = 0
+        self._replies: List[Tuple[int, List[Tuple[int, List[int]]]]] = []
+        self._cells: List[int] = []
+        self._chosen: List[List[int]] = []
+        self._my_threat: List[int] = []
+        self._enemy_threat: List[int] = []
+        self._taken_by_enemy: Set[int] = set()
+
+    def run(self) -> Optional[Tuple[int, ...]]:
+        """Search, and return my ants' destinations in the best joint move
+        (``None`` if none was evaluated in full). :attr:`value` is the
+        score the enemy can hold that joint move to.
+
+        The search is widened pass by pass: each pass lets every ant use
+        one more of its options, in search order. Replies found on earlier
+        passes stay in the table, so each pass mostly costs its new joint
+        moves, and a search cut short still has a best joint move drawn
+        from every ant's leading options.
+        """
+        widest = max(len(order) for order in self._my_order)
+        for width in range(min(2, widest), widest + 1):
+            self._width = width
+            self._place_mine(0, 0)
+            if not self.complete:
+                break
+        return self.best
+
+    def _tick(self) -> bool:
+        """Count a node; True once the search is out of nodes or time."""
+        self.nodes += 1
+        if self.nodes > self.max_nodes or (not self.nodes & 1023 and self.expired()):
+            self.complete = False
+        return not self.complete
+
+    def _place_mine(self, k: int, rank: int) -> None:
+        if k == len(self._mine):
+            # my joint move is an improvement only if its reply beats
+            # ``alpha``, which folds the tie-break on ``rank`` in
+            span = self._span
+            alpha = _NO_BOUND if self.best is None else (self._best_key + rank) // span
+            value = self._reply(alpha)
+            if self.complete and value > alpha:
+                self._best_key = value * span - rank
+                self.best = tuple(self._mine)
+                self.value = value
+            return
+        taken, hits, stride = self._taken, self._hits, self._strides[k]
+        for index, cell in self._my_order[k][: self._width]:
+            if cell in taken:
+                continue
+            if self._tick():
+                return
+            self._mine[k] = cell
+            taken.add(cell)
+            reaches = self._reaches[cell]
+            for theirs in reaches:
+                hits[theirs].append(k)
+            self._place_mine(k + 1, rank + index * stride)
+            for theirs in reaches:
+                hits[theirs].pop()
+            taken.discard(cell)
+            if not self.complete:
+                return
+
+    def _reply(self, alpha: int) -> int:
+        """The lowest score the enemy can force against ``self._mine``, or
+        some value no higher than ``alpha`` once one is found.
+        """
+        mine = self._mine
+        key = frozenset(mine)
+        entry = self.table.get(key)
+        if entry is not None and (entry[1] or entry[0] <= alpha):
+            return entry[0]
+        bonus = 0
+        for cell in mine:
+            bonus += self.hill_bonus.get(cell, 0)
+        hits, killer = self._hits, self._killer
+        # the reply that cut last time usually cuts again
+        if len(set(killer)) == len(killer):
+            chosen = [hits[cell] for cell in killer]
+            my_threat = [0] * len(mine)
+            for hit in chosen:
+                for i in hit:
+                    my_threat[i] += 1
+            value = _settle(chosen, [len(hit) for hit in chosen], my_threat) + bonus
+            if value <= alpha:
+                self.table[key] = (value, False)
+                return value
+        replies = []
+        for j, options in enumerate(self.enemy_options):
+            moves = [(cell, hits[cell]) for cell in options]
+            if not moves[0][1]:
+                # staying out of range cannot collide; other moves that
+                # stay out of range are no better for the enemy
+                moves = [move for move in moves if move[1]] + moves[:1]
+                if len(moves) == 1:
+                    continue
+            cut = killer[j]
+            moves.sort(key=lambda move: (move[0] != cut, -len(move[1])))
+            replies.append((j, moves))
+        self._replies = replies
+        self._cells = [0] * len(replies)
+        self._chosen = [[]] * len(replies)
+        self._my_threat = [0] * len(mine)
+        self._enemy_threat = [0] * len(replies)
+        self._alpha = alpha - bonus
+        self._score = -_NO_BOUND
+        cut = self._place_enemy(0)
+        if not self.complete:
+            return _NO_BOUND
+        value = self._score + bonus
+        self.table[key] = (value, not cut)
+        return value
+
+    def _place_enemy(self, k: int) -> bool:
+        """Fix the move of the ``k``-th replying enemy ant and search on;
+        True if the reply search should stop.
+        """
+        if k == len(self._replies):
+            score = _settle(self._chosen, self._enemy_threat, self._my_threat)
+            if score < self._score:
+                self._score = score
+            if score > self._alpha:
+                return False
+            for (j, _), cell in zip(self._replies, self._cells):
+                self._killer[j] = cell
+            return True
+        my_threat, taken = self._my_threat, self._taken_by_enemy
+        for cell, hits in self._replies[k][1]:
+            if cell in taken:
+                continue
+            if self._tick():
+                return True
+            taken.add(cell)
+            for i in hits:
+                my_threat[i] += 1
+            self._enemy_threat[k] = len(hits)
+            self._chosen[k] = hits
+            self._cells[k] = cell
+            stop = self._place_enemy(k + 1)
+            for i in hits:
+                my_threat[i] -= 1
+            taken.discard(cell)
+            if stop:
+                return True
+        return False
+
+
+def _settle(
+    hits: Sequence[Sequence[int]],
+    enemy_threat: Sequence[int],
+    my_threat: Sequence[int],
+) -> int:
+    """Score placed ants for :class:`FightSearch`: ``hits[j]`` lists my
+    ants in range of enemy ant ``j``, and each ant dies if an opponent in
+    range has no more threats on it than it has itself.
+    """
+    my_dead: Set[int] = set()
+    enemy_dead = 0
+    for j, hit in enumerate(hits):
+        threat = enemy_threat[j]
+        dies = False
+        for i in hit:
+            if my_threat[i] >= threat:
+                my_dead.add(i)
+            if threat >= my_threat[i]:
+                dies = True
+        enemy_dead += dies
+    return (enemy_dead - len(my_dead)) * 1000
 
 
 # ---------------------------------------------------------------------------
@@ -299,9 +852,11 @@ class XathisBot:
         # first do_turn (we need rows/cols from the engine).
         self.rows: int = 0
         self.cols: int = 0
-        self.tiles: List[List[Tile]] = []
+        self.graph: Optional[TileGraph] = None
+        self.tiles: List[TileRow] = []
         self.turn: int = 0
         self.start_time_ms: float = 0.0
+        self.time_budget_ms: float = TURN_TIME_BUDGET_MS
         self.is_timeout: bool = False
 
         # Per-turn data (rebuilt each turn from the engine state).
@@ -312,52 +867,79 @@ class XathisBot:
         self.enemy_hills: List[Tile] = []
         self.dangered_ants: List[Ant] = []
 
-        # Long-running missions (persist across turns).
+        # Long-running missions (persist across turns). Moves made while
+        # the missions are walked do not cancel them (isMissionPhase).
         self.missions: List[Mission] = []
+        self._is_mission_phase: bool = False
+
+        # This turn's territories; see _create_areas.
+        self.areas: List[Area] = []
+        self.fight_areas: List[Area] = []
+
+        # Searcher over the graph's neighbour table for the BFS phases;
+        # built on first use.
+        self._bfs: Optional[TorusBFS] = None
+        # This turn's ants as (position in my_ants/enemy_ants, ant),
+        # bucketed by square; see _init_turn.
+        self._my_near: Optional[SpatialHash] = None
+        self._enemy_near: Optional[SpatialHash] = None
+        # This turn's coverage for _distribute: my ants' balls, how many
+        # of them hold each square, and the enemy's distance to each
+        # square it reaches. Built by the first call that moves an ant.
+        self._balls: Dict[Ant, Ball] = {}
+        self._cover = array("i")
+        self._enemy_reach: Dict[int, int] = {}
 
     # ------------------------------------------------------------------
     # Initialization (called on first turn once we know map dimensions)
     # ------------------------------------------------------------------
     def _ensure_initialized(self, ants: Ants) -> None:
-        if self.tiles:
-            return
-        self.rows = ants.height
-        self.cols = ants.width
-        self.tiles = [[Tile(r, c) for c in range(self.cols)] for r in range(self.rows)]
-        # Precompute neighbors. We don't yet know which tiles are water
-        # (UNSEEN starts everywhere); we'll prune water neighbors lazily
-        # when we encounter them in update_map_state. For now every tile
-        # has 4 cardinal neighbors with torus wrap.
-        for r in range(self.rows):
-            for c in range(self.cols):
-                tile = self.tiles[r][c]
-                tile.neighbors = (
-                    self.tiles[(r - 1) % self.rows][c],  # n
-                    self.tiles[r][(c + 1) % self.cols],  # e
-                    self.tiles[(r + 1) % self.rows][c],  # s
-                    self.tiles[r][(c - 1) % self.cols],  # w
-                )
-
-    def _prune_water_neighbors(self, ants: Ants) -> None:
-        """Mark known-water tiles and prune them from neighbors lists.
+        if self.graph is None:
+            self._init_tiles(ants.height, ants.width)
+            # Water seen before the bot's first turn is only on the map;
+            # from here on ``ants.new_water`` reports every new cell.
+            self._prune_water_neighbors(
+                (r, c)
+                for r, row in enumerate(ants.map)
+                for c, square in enumerate(row)
+                if square == WATER
+            )
+
+    def _init_tiles(self, rows: int, cols: int) -> None:
+        """Create the tile graph. We don't yet know which tiles are water
+        (UNSEEN starts everywhere); water is pruned as it is observed, so
+        for now every tile has 4 cardinal neighbors with torus wrap.
+        """
+        self.rows = rows
+        self.cols = cols
+        self.graph = TileGraph(rows, cols)
+        self.tiles = [TileRow(self.graph, r * cols) for r in range(rows)]
+        self._bfs = None
+        self._my_near = SpatialHash(rows, cols, CLOSE_ENEMY_RADIUS)
+        self._enemy_near = SpatialHash(rows, cols, CLOSE_ENEMY_RADIUS)
+
+    def _prune_water_neighbors(self, locs: Iterable[Tuple[int, int]]) -> None:
+        """Mark the water tiles at ``locs`` and prune them from the
+        neighbour table; each turn that is ``ants.new_water``, the water
+        first seen in that turn's update.
 
         xathis treats water as a permanent edge in the navigation graph;
         the original ``Tile.removeNeighbor`` (Tile.java:67) is called
         once per tile when water is first observed.
         """
-        for r in range(self.rows):
-            for c in range(self.cols):
-                if ants.map[r][c] == WATER:
-                    tile = self.tiles[r][c]
-                    if tile.tile_type != WATER:
-                        tile.tile_type = WATER
-                        # Remove this tile from each of its (former) neighbors.
-                        for n in tile.neighbors:
-                            if tile in n.neighbors:
-                                n.neighbors = tuple(
-                                    x for x in n.neighbors if x is not tile
-                                )
-                        tile.neighbors = ()
+        graph = self.graph
+        cols = self.cols
+        for r, c in locs:
+            graph.add_water(r * cols + c)
+
+    def _grid(self) -> TorusBFS:
+        """The shared searcher over the tile graph; tile ``t`` is cell
+        ``t.index`` and ``self.graph.tile(index)`` maps back. It searches the
+        graph's own neighbour table, so water pruning reaches it directly.
+        """
+        if self._bfs is None:
+            self._bfs = TorusBFS(self.rows, self.cols, neighbors=self.graph.neighbors)
+        return self._bfs
 
     # ------------------------------------------------------------------
     # Torus geometry
@@ -385,38 +967,48 @@ class XathisBot:
     # beta  = "could attack next turn after one move (incl. me staying)"
     # gamma = "could attack within two moves"
     #
-    # These match Strategy.java:1726, 1732, 1742 exactly.
+    # These match Strategy.java:1726, 1732, 1742 exactly, and are looked
+    # up in the graph's tables, built once per game.
     def is_alpha_dist(self, t1: Tile, t2: Tile) -> bool:
-        dr = self.dist_row(t1, t2)
-        dc = self.dist_col(t1, t2)
-        return (dc <= 1 and dr <= 2) or (dc == 2 and dr <= 1)
+        cols = self.cols
+        return bool(
+            self.graph.in_alpha[
+                ((t1.row - t2.row) % self.rows) * cols + (t1.col - t2.col) % cols
+            ]
+        )
 
     def is_beta_dist(self, t1: Tile, t2: Tile) -> bool:
-        dr = self.dist_row(t1, t2)
-        dc = self.dist_col(t1, t2)
-        if dr + dc <= 4:
-            if (dr == 0 and dc == 4) or (dc == 0 and dr == 4):
-                return False
-            return True
-        return False
+        """alpha plus one step: dr + dc <= 4, except (0,4)/(4,0)."""
+        cols = self.cols
+        return bool(
+            self.graph.in_beta[
+                ((t1.row - t2.row) % self.rows) * cols + (t1.col - t2.col) % cols
+            ]
+        )
 
     def is_gamma_dist(self, t1: Tile, t2: Tile) -> bool:
-        dr = self.dist_row(t1, t2)
-        dc = self.dist_col(t1, t2)
-        if dr + dc <= 5:
-            if (dr == 0 and dc == 5) or (dc == 0 and dr == 5):
-                return False
-            return True
-        return False
+        """beta plus one step: dr + dc <= 5, except (0,5)/(5,0)."""
+        cols = self.cols
+        return bool(
+            self.graph.in_gamma[
+                ((t1.row - t2.row) % self.rows) * cols + (t1.col - t2.col) % cols
+            ]
+        )
 
     # ------------------------------------------------------------------
     # Main turn entry point
     # ------------------------------------------------------------------
     def do_turn(self, ants: Ants) -> None:
-        self.start_time_ms = time.monotonic() * 1000.0
+        # Count from when the engine's "go" arrived, not from here, so the
+        # time spent parsing the update is charged to the budget too.
+        if ants.turn_start is not None:
+            self.start_time_ms = ants.turn_start * 1000.0
+        else:
+            self.start_time_ms = time.monotonic() * 1000.0
+        self.time_budget_ms = ants.turntime * TURN_TIME_BUDGET_MS / ENGINE_TURNTIME_MS
         self.turn += 1
         self._ensure_initialized(ants)
-        self._prune_water_neighbors(ants)
+        self._prune_water_neighbors(ants.new_water)
         self._sync_engine_state(ants)
         self._actions(ants)
 
@@ -427,13 +1019,11 @@ class XathisBot:
         equivalent work after each engine update.
         """
         # Reset per-turn flags on tiles. Persistent fields (explore_value,
-        # neighbors, is_hill, etc.) are not touched here.
-        for row in self.tiles:
-            for tile in row:
-                if tile.tile_type != WATER:  # keep water permanent
-                    tile.tile_type = LAND
-                tile.ant = None
-                tile.old_ant = None
+        # neighbors, is_hill, etc.) are not touched here, and water stays.
+        graph = self.graph
+        graph.clear()
+        tile_type, ant_at, old_ant_at = graph.tile_type, graph.ant, graph.old_ant
+        tile_at, cols = self.graph.tile, self.cols
 
         # Refresh ant / food / hill positions.
         self.my_ants = []
@@ -444,24 +1034,24 @@ class XathisBot:
         self.dangered_ants = []
 
         for (r, c), owner in ants.ant_list.items():
-            tile = self.tiles[r][c]
-            tile.tile_type = owner  # 0 = me, 1..9 = enemy player N
-            ant = Ant(tile)
-            tile.ant = ant
-            tile.old_ant = ant
+            index = r * cols + c
+            tile_type[index] = owner  # 0 = me, 1..9 = enemy player N
+            ant = Ant(tile_at(index))
+            ant_at[index] = ant
+            old_ant_at[index] = ant
             if owner == MY_ANT:
                 self.my_ants.append(ant)
             else:
                 self.enemy_ants.append(ant)
 
         for r, c in ants.food_list:
-            tile = self.tiles[r][c]
-            if tile.tile_type == LAND:  # don't override an ant on the food
-                tile.tile_type = FOOD
-            self.foods.append(tile)
+            index = r * cols + c
+            if tile_type[index] == LAND:  # don't override an ant on the food
+                tile_type[index] = FOOD
+            self.foods.append(tile_at(index))
 
         for (r, c), owner in ants.hill_list.items():
-            tile = self.tiles[r][c]
+            tile = tile_at(r * cols + c)
             tile.is_hill = True
             tile.hill_player = owner
             if owner == MY_ANT:
@@ -496,26 +1086,6 @@ class XathisBot:
         self._create_missions()
         self._distribute(only_near_enemy=False)
         self._clean_areas()
-        # Final fallback: ants still sitting on our hill block new spawns.
-        # This is a minimal stand-in for `distribute()` until that phase
-        # lands; without it the colony plateaus at 1–2 ants because the
-        # hill stays occupied. xathis's full distribute (Strategy.java:990)
-        # is much smarter — it spreads ants by maximizing reachable tiles.
-        self._off_hill_fallback()
-
-    def _off_hill_fallback(self) -> None:
-        """Move any my-ant that's still on a my-hill and has no orders to
-        a free, safe neighbor. Keeps the spawn pipeline unblocked until
-        the real ``distribute`` / ``explore`` phases land.
-        """
-        my_hill_set = set(self.my_hills)
-        for ant in self.my_ants:
-            if ant.has_moved or ant.tile not in my_hill_set:
-                continue
-            for n in ant.tile.neighbors:
-                if n.is_free() and not n.is_hill and self.is_tile_safe(ant, n):
-                    self.do_move(ant.tile, n, "off-hill")
-                    break
 
     # ------------------------------------------------------------------
     # Phase: _init_turn (Strategy.java:78-202)
@@ -529,17 +1099,36 @@ class XathisBot:
         Direct port of ``Strategy.initTurn()`` (Strategy.java:78–202).
         """
 
+        # ---- bucket the ants ------------------------------------------
+        # Every pair scan below only looks at ants within
+        # CLOSE_ENEMY_RADIUS rows and cols, i.e. in neighbouring buckets.
+        # Candidates are put back in list order, so ties and appends come
+        # out as in a scan over the whole list.
+        my_ants, enemy_ants = self.my_ants, self.enemy_ants
+        my_near, enemy_near = self._my_near, self._enemy_near
+        my_near.clear()
+        enemy_near.clear()
+        self._balls = {}
+        for i, ant in enumerate(my_ants):
+            my_near.add(ant.tile.row, ant.tile.col, (i, ant))
+        for j, ant in enumerate(enemy_ants):
+            enemy_near.add(ant.tile.row, ant.tile.col, (j, ant))
+
         # ---- count close own-ant pairs (numCloseOwnAnts) -------------
         # Two of my ants are "close" if both row- and col-distance ≤ 5.
-        # Used as an aggression signal in `_fight`. O(n²) over my ants;
-        # xathis just iterates every pair.
-        my_ants = self.my_ants
+        # Used as an aggression signal in `_fight`. xathis iterates every
+        # pair; we only look at each ant's neighbouring buckets.
+        graph, rows, cols = self.graph, self.rows, self.cols
+        in_close = graph.in_close
         for i, a in enumerate(my_ants):
-            for b in my_ants[i + 1 :]:
-                if (
-                    self.dist_row(a.tile, b.tile) <= 5
-                    and self.dist_col(a.tile, b.tile) <= 5
-                ):
+            ta = a.tile
+            for j, b in my_near.near(ta.row, ta.col):
+                if j <= i:
+                    continue
+                tb = b.tile
+                if in_close[
+                    ((ta.row - tb.row) % rows) * cols + (ta.col - tb.col) % cols
+                ]:
                     a.num_close_own_ants += 1
                     b.num_close_own_ants += 1
 
@@ -547,18 +1136,16 @@ class XathisBot:
         # For each (my_ant, enemy_ant) pair within CLOSE_ENEMY_RADIUS
         # rows AND cols, compute Euclidean² distance and populate the
         # ant-level lookup tables that drive safety / fight / escape.
-        cer = CLOSE_ENEMY_RADIUS
         cer2 = CLOSE_ENEMY_RADIUS2
-        for my_ant in self.my_ants:
+        dist2, in_beta, in_gamma = graph.dist2, graph.in_beta, graph.in_gamma
+        for my_ant in my_ants:
+            tm = my_ant.tile
             close: List[Tuple[int, Ant]] = []
-            for enemy_ant in self.enemy_ants:
-                dy = self.dist_row(my_ant.tile, enemy_ant.tile)
-                if dy > cer:
-                    continue
-                dx = self.dist_col(my_ant.tile, enemy_ant.tile)
-                if dx > cer:
-                    continue
-                d2 = dy * dy + dx * dx
+            for _, enemy_ant in sorted(enemy_near.near(tm.row, tm.col)):
+                te = enemy_ant.tile
+                offset = ((tm.row - te.row) % rows) * cols + (tm.col - te.col) % cols
+                # within the radius is within it on rows and cols too
+                d2 = dist2[offset]
                 if d2 > cer2:
                     continue
                 close.append((d2, enemy_ant))
@@ -567,22 +1154,13 @@ class XathisBot:
                 my_ant.close_enemy_dists_sum += d2
                 enemy_ant.close_enemy_dists_sum += d2
                 # gamma: dr+dc ≤ 5, except the two corner cases (0,5)/(5,0)
-                if (
-                    dx + dy <= 5
-                    and not (dx == 0 and dy == 5)
-                    and not (dy == 0 and dx == 5)
-                ):
+                if in_gamma[offset]:
                     if not my_ant.is_indirectly_dangered:
                         my_ant.is_indirectly_dangered = True
                     my_ant.gamma_dist_enemies.append(enemy_ant)
                     enemy_ant.gamma_dist_enemies.append(my_ant)
-                    # dangered: dr+dc ≤ 4, except (0,4)/(4,0)
-                    if (
-                        not my_ant.is_dangered
-                        and dx + dy <= 4
-                        and not (dx == 0 and dy == 4)
-                        and not (dy == 0 and dx == 4)
-                    ):
+                    # dangered: beta, dr+dc ≤ 4, except (0,4)/(4,0)
+                    if not my_ant.is_dangered and in_beta[offset]:
                         my_ant.is_dangered = True
                         self.dangered_ants.append(my_ant)
             if close:
@@ -598,42 +1176,44 @@ class XathisBot:
 
         # ---- enemy-ant detached check + ordering --------------------
         # An enemy is "detached" if no other enemy is within (5,5) of it.
-        # Used by attackDetachedEnemies. O(n²) again.
-        for i, a in enumerate(self.enemy_ants):
-            for b in self.enemy_ants[i + 1 :]:
-                if (
-                    self.dist_row(a.tile, b.tile) <= 5
-                    and self.dist_col(a.tile, b.tile) <= 5
-                ):
+        # Used by attackDetachedEnemies. Neighbouring buckets only.
+        for i, a in enumerate(enemy_ants):
+            ta = a.tile
+            for j, b in enemy_near.near(ta.row, ta.col):
+                if j <= i:
+                    continue
+                tb = b.tile
+                if in_close[
+                    ((ta.row - tb.row) % rows) * cols + (ta.col - tb.col) % cols
+                ]:
                     a.is_detached = False
                     b.is_detached = False
 
         # ---- exploreValue aging + isBorder reset --------------------
         # Every tile's explore_value increments by 1 each turn; the
         # explore phase later resets it to 0 for tiles within reach.
-        for row in self.tiles:
-            for tile in row:
-                tile.explore_value += 1
-                tile.is_border = False
-                if tile.ant is None:
-                    tile.stay_value = -1
+        # Tiles without an ant forget their stay bookkeeping.
+        self.graph.age(ant.tile.index for ant in self.my_ants + self.enemy_ants)
 
         # ---- willStay detection -------------------------------------
         # If an enemy ant has had the same neighborhood for ≥5 turns we
         # treat it as a permanent obstacle — saves combat search depth.
+        graph = self.graph
+        tile_type, neighbors = graph.tile_type, graph.neighbors
+        stay_value, stay_turn_count = graph.stay_value, graph.stay_turn_count
         for enemy in self.enemy_ants:
+            index = enemy.tile.index
             curr_stay = 0
-            for i, n in enumerate(enemy.tile.neighbors):
-                if n.is_enemy():
+            for i, n in enumerate(neighbors[index]):
+                if tile_type[n] > MY_ANT:
                     curr_stay |= 1 << i
-            tile = enemy.tile
-            if tile.stay_value == curr_stay:
-                tile.stay_turn_count += 1
-                if tile.stay_turn_count >= 5:
+            if stay_value[index] == curr_stay:
+                stay_turn_count[index] += 1
+                if stay_turn_count[index] >= 5:
                     enemy.will_stay = True
             else:
-                tile.stay_value = curr_stay
-                tile.stay_turn_count = 0
+                stay_value[index] = curr_stay
+                stay_turn_count[index] = 0
                 enemy.will_stay = False
 
     def _calc_num_close_enemies(self) -> None:
@@ -643,39 +1223,37 @@ class XathisBot:
 
         Direct port of ``Strategy.calcNumCloseEnemies`` (Strategy.java:224).
         """
+        bfs = self._grid()
+        stamp, dist = bfs.stamp, bfs.dist
+        cells = [(ant.tile.index, ant) for ant in self.my_ants]
         for enemy in self.enemy_ants:
             if not enemy.close_enemy_dists:
                 continue
-            open_list: Deque[Tile] = deque()
-            changed: List[Tile] = []
-            enemy_tile = enemy.tile
-            open_list.append(enemy_tile)
-            enemy_tile.dist = 0
-            enemy_tile.is_reached = True
-            changed.append(enemy_tile)
-            while open_list:
-                t = open_list.popleft()
-                if t.dist >= 12:
-                    break
-                for n in t.neighbors:
-                    if n.is_reached:
-                        continue
-                    n.is_reached = True
-                    n.dist = t.dist + 1
-                    changed.append(n)
-                    open_list.append(n)
-                    if n.tile_type == MY_ANT and n.ant is not None:
-                        n.ant.num_close_enemies += 1
-                        if n.ant.closest_enemy_dist > n.dist:
-                            n.ant.closest_enemy = enemy
-                            n.ant.closest_enemy_dist = n.dist
-            for t in changed:
-                t.is_reached = False
+            bfs.search([enemy.tile.index], max_depth=12)
+            generation = bfs.generation
+            for index, ant in cells:
+                if stamp[index] == generation:
+                    ant.num_close_enemies += 1
+                    if ant.closest_enemy_dist > dist[index]:
+                        ant.closest_enemy = enemy
+                        ant.closest_enemy_dist = dist[index]
 
     def _init_missions(self) -> None:
-        """TODO: re-attach ongoing missions to current ants.
-        Strategy.java:263-280."""
-        pass
+        """Drop finished missions and hand the rest to the ants on their
+        tiles. Direct port of ``Strategy.initMissions`` (Strategy.java:263).
+        """
+        kept: List[Mission] = []
+        for m in self.missions:
+            if m.is_removed:
+                continue
+            # an enemy may stand where the mission's ant was last seen
+            ant = m.curr_tile.ant
+            if ant is None or m.curr_tile.tile_type != MY_ANT:
+                continue
+            ant.has_mission = True
+            ant.mission = m
+            kept.append(m)
+        self.missions = kept
 
     def _enemy_hills(self) -> None:
         """Send up to ``count`` attackers per enemy hill via BFS outward.
@@ -696,41 +1274,39 @@ class XathisBot:
         if not self.enemy_hills:
             return
         count_per_hill = 1 if len(self.my_ants) <= 10 else 4
+        bfs = self._grid()
+        tile_at, parent = self.graph.tile, bfs.parent
+        tile_type, ant_at = self.graph.tile_type, self.graph.ant
         for hill in self.enemy_hills:
             count = count_per_hill
-            open_list: Deque[Tile] = deque()
-            changed: List[Tile] = [hill]
-            hill.dist = 0
-            hill.is_reached = True
-            open_list.append(hill)
-            while open_list:
-                t = open_list.popleft()
-                if t.dist >= 20:
-                    break
-                for n in t.neighbors:
-                    if n.is_reached:
-                        continue
-                    n.is_reached = True
-                    if n.tile_type == MY_ANT and n.ant is not None:
-                        ant = n.ant
-                        # Try to send this ant one step closer to the hill
-                        # (i.e. to the tile we expanded from). Skip if the
-                        # predecessor is another my-ant, the ant already
-                        # moved, or it's unsafe.
-                        if (
-                            not ant.has_moved
-                            and t.tile_type != MY_ANT
-                            and self.is_tile_safe(ant, t)
-                        ):
-                            self.do_move(n, t, "enemy hill")
-                        count -= 1
-                    n.dist = t.dist + 1
-                    changed.append(n)
-                    open_list.append(n)
-                if count <= 0:
-                    break
-            for tile in changed:
-                tile.is_reached = False
+            # The Java counts ants as the wave reaches them and checks the
+            # count once per expanded tile, so the siblings of the ant that
+            # used up the count still get their turn.
+            last_parent = -1
+
+            def visit(index: int) -> Optional[int]:
+                nonlocal count, last_parent
+                prev = parent[index]
+                if count <= 0 and prev != last_parent:
+                    return STOP
+                ant = ant_at[index]
+                if prev >= 0 and tile_type[index] == MY_ANT and ant is not None:
+                    t = tile_at(prev)
+                    # Try to send this ant one step closer to the hill
+                    # (i.e. to the tile we expanded from). Skip if the
+                    # predecessor is another my-ant, the ant already
+                    # moved, or it's unsafe.
+                    if (
+                        not ant.has_moved
+                        and tile_type[prev] != MY_ANT
+                        and self.is_tile_safe(ant, t)
+                    ):
+                        self.do_move(tile_at(index), t, "enemy hill")
+                    count -= 1
+                    last_parent = prev
+                return None
+
+            bfs.search([hill.index], max_depth=20, visit=visit)
 
     def _food(self) -> None:
         """Multi-source BFS from every food tile simultaneously. The first
@@ -743,87 +1319,73 @@ class XathisBot:
         if not self.foods:
             return
 
-        # ``source[tile]`` = which food this BFS branch came from.
+        # Each reached tile's ``label`` is the food its branch came from.
         # ``enemy_near[food]`` flags food sources that have an enemy at
         # dist ≤ 2 — those get abandoned (don't fight to the death over
         # one piece of food).
-        enemy_near: Dict[Tile, bool] = {}
-        # Food sources we've already abandoned/claimed; tiles whose
-        # ``source`` is in here get skipped on dequeue.
+        enemy_near: Dict[Tile, bool] = {food: False for food in self.foods}
+        # Food sources we've already abandoned/claimed; tiles labelled
+        # with one of these are skipped on dequeue.
         dead_sources: Set[Tile] = set()
+        bfs = self._grid()
+        tile_at, dist, parent, label = self.graph.tile, bfs.dist, bfs.parent, bfs.label
+        tile_type, ant_at = self.graph.tile_type, self.graph.ant
 
-        open_list: Deque[Tile] = deque()
-        changed: List[Tile] = []
-        for food in self.foods:
-            food.dist = 0
-            food.is_reached = True
-            food.source = food
-            food.prev = None
-            enemy_near[food] = False
-            changed.append(food)
-            open_list.append(food)
-
-        while open_list:
-            t = open_list.popleft()
-            src = t.source
-            if src is None or src in dead_sources:
-                continue
+        def visit(index: int) -> Optional[int]:
+            src = label[index]
+            if src in dead_sources:
+                return SKIP
 
             # Enemy-near-food early-warning: if the wave reaches an enemy
             # ant within dist 2 of the food, mark that food source as
             # contested.
-            if t.dist <= 2 and t.is_enemy():
+            if dist[index] <= 2 and tile_type[index] > MY_ANT:
                 enemy_near[src] = True
 
             # If we're past the contested zone and the food is contested,
             # abandon it entirely.
-            if t.dist > 2 and enemy_near.get(src, False):
+            if dist[index] > 2 and enemy_near[src]:
                 dead_sources.add(src)
-                continue
+                return SKIP
 
             # If the wave reached one of my ants, that ant claims the food.
+            ant = ant_at[index]
+            prev_index = parent[index]
             if (
-                t.tile_type == MY_ANT
-                and t.ant is not None
-                and not t.ant.has_moved
-                and t.prev is not None
-                and t.prev.tile_type != MY_ANT
+                tile_type[index] == MY_ANT
+                and ant is not None
+                and not ant.has_moved
+                and prev_index >= 0
+                and tile_type[prev_index] != MY_ANT
             ):
-                ant = t.ant
+                t, prev = tile_at(index), tile_at(prev_index)
                 # If the food is adjacent (prev is the food itself), just
                 # stay put and let the ant pick it up next turn.
-                if t.prev is src:
+                if prev is src:
                     ant.has_moved = True
-                elif not self.is_suicide(ant, t.prev):
-                    enemy_block = self.is_tile_safe2(ant, t.prev)
+                elif not self.is_suicide(ant, prev):
+                    enemy_block = self.is_tile_safe2(ant, prev)
                     if enemy_block is None:
                         # safe move; just go
-                        self.do_move(t, t.prev, "food")
+                        self.do_move(t, prev, "food")
                     else:
                         # not safe — only proceed if we have backup
                         if self._food_has_backup(src, ant, enemy_block):
-                            self.do_move(t, t.prev, "food")
+                            self.do_move(t, prev, "food")
                 # food source consumed regardless of whether we managed
                 # to actually move (avoids two ants chasing the same food).
                 dead_sources.add(src)
-                continue
+                return SKIP
 
             # Otherwise expand if still within food horizon.
-            if t.dist < FOOD_BFS_HORIZON:
-                next_dist = t.dist + 1
-                for n in t.neighbors:
-                    if n.is_reached:
-                        continue
-                    n.is_reached = True
-                    n.prev = t
-                    n.dist = next_dist
-                    n.source = src
-                    changed.append(n)
-                    open_list.append(n)
+            return None
 
-        for t in changed:
-            t.is_reached = False
-            t.source = None
+        bfs.search(
+            [food.index for food in self.foods],
+            labels=self.foods,
+            max_depth=FOOD_BFS_HORIZON,
+            visit=visit,
+        )
 
     def _food_has_backup(self, food: Tile, claimer: Ant, blocker: Ant) -> bool:
         """Return True if I have a my-ant near the food source that's
@@ -833,14 +1395,20 @@ class XathisBot:
         (Strategy.java:548–560). The logic is "I can sacrifice the
         closer ant only if a follow-up ant is en route."
         """
-        # Find the closest 3 ants (any owner) within dist 8 of the food.
+        # Find the closest 3 ants (any owner) within dist 8 of the food,
+        # taking them in list order, my ants first. They are searched for
+        # in the buckets _init_turn filed them under: an ant has moved at
+        # most one step since, and the buckets span CLOSE_ENEMY_RADIUS.
         candidates: List[Tuple[int, Ant]] = []
-        for ant in self.my_ants + self.enemy_ants:
-            d = self.dist(food, ant.tile)
-            if d < 8:
-                candidates.append((d, ant))
-                if len(candidates) >= 3:
-                    break
+        for near in (self._my_near, self._enemy_near):
+            for _, ant in sorted(near.near(food.row, food.col)):
+                d = self.dist(food, ant.tile)
+                if d < 8:
+                    candidates.append((d, ant))
+                    if len(candidates) >= 3:
+                        break
+            if len(candidates) >= 3:
+                break
         candidates.sort(key=lambda kv: kv[0])
         for _, ant in candidates:
             if ant is claimer or ant is blocker:
@@ -860,65 +1428,132 @@ class XathisBot:
         """
         if not self.my_ants:
             return
-        open_list: Deque[Tile] = deque()
-        changed: List[Tile] = []
-        for ant in self.my_ants:
-            t = ant.tile
-            if t.is_reached:
-                continue
-            t.dist = 0
-            t.is_reached = True
-            t.start_tile = t
-            changed.append(t)
-            open_list.append(t)
+        bfs = self._grid()
         # Java uses `if (tile.dist > 10) break` — process dist 0..10 inclusive.
-        horizon = EXPLORE_BFS_HORIZON - 1  # = 10
-        while open_list:
-            t = open_list.popleft()
-            if t.dist > horizon:
-                break
-            t.explore_value = 0
-            for n in t.neighbors:
-                if n.is_reached:
-                    continue
-                n.is_reached = True
-                n.prev = t
-                n.dist = t.dist + 1
-                n.start_tile = t.start_tile
-                changed.append(n)
-                open_list.append(n)
-        for t in changed:
-            t.is_reached = False
+        count = bfs.search(
+            [ant.tile.index for ant in self.my_ants],
+            max_depth=EXPLORE_BFS_HORIZON - 1,
+        )
+        explored, clock = self.graph.explored, self.graph.clock
+        for index in bfs.order[:count]:
+            explored[index] = clock
 
     def _create_areas(self) -> None:
-        """TODO: territory flood-fill + border tile detection.
-        Strategy.java:678-771."""
-        pass
+        """Split the map into territories and mark the border of mine.
+
+        Port of ``Strategy.createAreas`` (Strategy.java:678-771). One BFS
+        from every ant at once, up to ``AREA_DIST`` steps, labels each
+        tile with the ant whose wave reached it first. Two ants of the same
+        side share an area when their waves touch, unless both tiles are
+        at the edge of the search; areas are merged with a union-find once
+        the search is done, which gives the same areas as the Java's
+        merging while it searches. My areas with one of my hills or at least
+        5 ants are fight areas, and a tile of a fight area with a neighbour
+        outside my territory is on its border.
+
+        Tiles are flagged by stamping them with the graph's ``area_mark``,
+        so :meth:`_clean_areas` only has to bump it.
+        """
+        graph = self.graph
+        graph.area_mark += 1
+        mark = graph.area_mark
+        self.areas = []
+        self.fight_areas = []
+        # enemies are queued first and win ties, as in the Java
+        ants = self.enemy_ants + self.my_ants
+        if not ants:
+            return
+        num_enemy = len(self.enemy_ants)
+        bfs = self._grid()
+        count = bfs.search(
+            [ant.tile.index for ant in ants],
+            labels=range(len(ants)),
+            max_depth=AREA_DIST,
+        )
+        stamp, gen, label, dist = bfs.stamp, bfs.generation, bfs.label, bfs.dist
+        neighbors, in_my_area = graph.neighbors, graph.in_my_area
+        root = list(range(len(ants)))
+
+        def find(i: int) -> int:
+            while root[i] != i:
+                root[i] = root[root[i]]
+                i = root[i]
+            return i
+
+        # One pass over the reached tiles: flag mine, join the areas of
+        # waves that meet, and note my tiles next to foreign ones.
+        edge: List[int] = []
+        for index in bfs.order[:count]:
+            source = label[index]
+            mine = source >= num_enemy
+            if mine:
+                in_my_area[index] = mark
+            expanded = dist[index] < AREA_DIST
+            for n in neighbors[index]:
+                if stamp[n] != gen:
+                    if mine:
+                        edge.append(index)
+                        mine = False  # noted once is enough
+                    continue
+                other = label[n]
+                if other == source:
+                    continue
+                if (other >= num_enemy) == (source >= num_enemy):
+                    if expanded or dist[n] < AREA_DIST:
+                        a, b = find(source), find(other)
+                        if a != b:
+                            root[max(a, b)] = min(a, b)
+                elif mine:
+                    edge.append(index)
+                    mine = False
+
+        by_root: Dict[int, Area] = {}
+        for i, ant in enumerate(ants):
+            r = find(i)
+            area = by_root.get(r)
+            if area is None:
+                area = by_root[r] = Area(i >= num_enemy)
+                self.areas.append(area)
+            area.ants.append(ant)
+        for hill in self.my_hills:
+            if stamp[hill.index] == gen:
+                area = by_root[find(label[hill.index])]
+                if area.hill is None:
+                    area.hill = hill
+        for area in self.areas:
+            if area.is_mine and (area.contains_hill or len(area.ants) >= 5):
+                self.fight_areas.append(area)
+
+        border, tile_at = graph.border, graph.tile
+        for index in edge:
+            area = by_root[find(label[index])]
+            if area.is_mine and (area.contains_hill or len(area.ants) >= 5):
+                border[index] = mark
+                area.border.append(tile_at(index))
 
     def _fight(self) -> None:
         """Group-based depth-1 minimax over gamma-distance combat groups.
 
         This is a *simplified* port of ``Strategy.fight`` (Strategy.java:781-874).
-        xathis's full version uses dependency tables, alpha-beta cuts, and
-        prec-grouping to handle large groups; we use exhaustive search
-        capped at ``FIGHT_GROUP_CAP`` ants per side, which empirically
-        handles 1v1, 1v2, 2v2, 3v2, 3v3 — the cases that matter most for
-        breaking ties against scripted bots.
+        xathis's full version uses dependency tables and prec-grouping to
+        handle large groups; we run an alpha-beta :class:`FightSearch`
+        capped at ``FIGHT_GROUP_CAP`` ants per side and ``FIGHT_NODE_CAP``
+        nodes per group.
 
         For each gamma group (connected component via ``gamma_dist_enemies``):
 
-        1. Enumerate every my-move combination (each my-ant: 4 neighbours
-           + stay, with collision filtering).
-        2. For each my-combo, find the *worst-case* enemy combo using the
-           same enumeration.
+        1. My-move combinations: each my-ant takes one of its 4
+           neighbours or stays, with collision filtering.
+        2. For each my-combo, find the *worst-case* enemy combo over the
+           same kind of moves.
         3. Score = my_kills − my_losses (computed via the actual AI
            Challenge battle-resolution rule).
         4. Pick the my-combo whose worst-case score is highest. Ties go
            to "stay" combos (more conservative).
         5. Apply the chosen moves; mark all ants in the group as moved.
 
-        Bounded by ``TURN_TIME_BUDGET_MS`` (420ms) to avoid engine timeouts
-        in heavy combat scenarios.
+        Bounded by ``time_budget_ms`` (420ms of a 500ms turn) to avoid engine
+        timeouts in heavy combat scenarios.
         """
         if not self.my_ants or not self.enemy_ants:
             return
@@ -934,10 +1569,8 @@ class XathisBot:
                 continue
             if start_ant.is_gamma_grouped:
                 continue
-            # Time budget — bail if we're past 420ms.
-            elapsed = time.monotonic() * 1000.0 - self.start_time_ms
-            if elapsed > TURN_TIME_BUDGET_MS:
-                self.is_timeout = True
+            # Time budget — bail if we're past it.
+            if self._time_is_up():
                 break
 
             my_group, enemy_group = self._find_gamma_group(start_ant)
@@ -1000,8 +1633,9 @@ class XathisBot:
         return opts
 
     def _fight_group(self, my_group: List[Ant], enemy_group: List[Ant]) -> None:
-        """Exhaustive minimax over all (my, enemy) move combinations,
-        scored by the AI Challenge's mutual-destruction rule.
+        """Max-min search over all (my, enemy) move combinations, scored
+        by the AI Challenge's mutual-destruction rule (see
+        :class:`FightSearch`).
         """
         my_tiles = {a.tile for a in my_group}
         enemy_tiles = {e.tile for e in enemy_group}
@@ -1012,47 +1646,24 @@ class XathisBot:
         enemy_options: List[List[Tile]] = [
             self._fight_options(e, enemy_tiles - {e.tile}) for e in enemy_group
         ]
-
-        # Combination size sanity gate — even with cap=4 this can hit
-        # 5^4 * 5^4 = ~390k combinations. Skip pathological branches.
-        my_size = 1
-        for opts in my_options:
-            my_size *= len(opts)
-        enemy_size = 1
-        for opts in enemy_options:
-            enemy_size *= len(opts)
-        if my_size * enemy_size > FIGHT_BRANCHING_CAP:
-            # Too expensive — fall through and let safety gates handle it.
-            return
-
-        best_score = -(1 << 30)
-        best_combo: Optional[Tuple[Tile, ...]] = None
-
-        for my_combo in self._iter_combos(my_options):
-            # Quick collision check inside the my-side combo.
-            if len(set(my_combo)) != len(my_combo):
-                continue
-            # Time check inside the inner loop too — combat search must
-            # stay under budget.
-            elapsed = time.monotonic() * 1000.0 - self.start_time_ms
-            if elapsed > TURN_TIME_BUDGET_MS:
-                self.is_timeout = True
-                break
-            worst_score = 1 << 30
-            for enemy_combo in self._iter_combos(enemy_options):
-                if len(set(enemy_combo)) != len(enemy_combo):
-                    continue
-                score = self._eval_battle(my_combo, enemy_combo)
-                if score < worst_score:
-                    worst_score = score
-                    if worst_score <= best_score:
-                        # Alpha-prune: this my-combo can't beat the
-                        # current best regardless of further enemy moves.
-                        break
-            if worst_score > best_score:
-                best_score = worst_score
-                best_combo = my_combo
-
+        graph = self.graph
+        tile_at = graph.tile
+        search = FightSearch(
+            [[t.index for t in opts] for opts in my_options],
+            [[t.index for t in opts] for opts in enemy_options],
+            alpha=lambda mine, theirs: graph.in_alpha[graph.offset(mine, theirs)],
+            # Hill-based tie-breaker: razing an enemy hill is worth more
+            # than a trade.
+            hill_bonus={
+                t.index: 50
+                for opts in my_options
+                for t in opts
+                if t.is_hill and t.hill_player > 0
+            },
+            max_nodes=FIGHT_NODE_CAP,
+            expired=self._time_is_up,
+        )
+        best_combo = search.run()
         if best_combo is None:
             return
 
@@ -1062,36 +1673,17 @@ class XathisBot:
         for ant, dest in zip(my_group, best_combo):
             if ant.has_moved:
                 continue
-            if dest is ant.tile:
+            if dest == ant.tile.index:
                 ant.has_moved = True
                 continue
-            self.do_move(ant.tile, dest, "fight")
+            self.do_move(ant.tile, tile_at(dest), "fight")
 
-    def _iter_combos(self, options: List[List[Tile]]):
-        """Generator of every combination of one tile from each list.
-
-        Plain Cartesian product, but we keep it as an explicit loop to
-        allow alpha-pruning by the caller (the Python builtin
-        ``itertools.product`` is fine but tuple-allocates eagerly).
-        """
-        n = len(options)
-        if n == 0:
-            yield ()
-            return
-        idx = [0] * n
-        sizes = [len(o) for o in options]
-        while True:
-            yield tuple(options[i][idx[i]] for i in range(n))
-            # increment
-            i = 0
-            while i < n:
-                idx[i] += 1
-                if idx[i] < sizes[i]:
-                    break
-                idx[i] = 0
-                i += 1
-            if i == n:
-                return
+    def _time_is_up(self) -> bool:
+        """True, and ``is_timeout`` set, once the turn's budget is spent."""
+        if time.monotonic() * 1000.0 - self.start_time_ms > self.time_budget_ms:
+            self.is_timeout = True
+            return True
+        return False
 
     def _eval_battle(
         self, my_combo: Tuple[Tile, ...], enemy_combo: Tuple[Tile, ...]
@@ -1111,35 +1703,23 @@ class XathisBot:
          * Add a tiny "ground covered" bonus to break stay/move ties so
            the bot doesn't freeze in place.
         """
-        my_dead = 0
-        enemy_dead = 0
+        # Pairs in attack range, one table lookup each.
+        rows, cols, in_alpha = self.rows, self.cols, self.graph.in_alpha
+        pairs = [
+            (i, j)
+            for i, mt in enumerate(my_combo)
+            for j, et in enumerate(enemy_combo)
+            if in_alpha[((mt.row - et.row) % rows) * cols + (mt.col - et.col) % cols]
+        ]
         # Threat counts.
         my_threat = [0] * len(my_combo)
         enemy_threat = [0] * len(enemy_combo)
-        for i, mt in enumerate(my_combo):
-            for j, et in enumerate(enemy_combo):
-                if self.is_alpha_dist(mt, et):
-                    my_threat[i] += 1
-                    enemy_threat[j] += 1
+        for i, j in pairs:
+            my_threat[i] += 1
+            enemy_threat[j] += 1
         # Death pass.
-        for i, mt in enumerate(my_combo):
-            if my_threat[i] == 0:
-                continue
-            for j, et in enumerate(enemy_combo):
-                if not self.is_alpha_dist(mt, et):
-                    continue
-                if my_threat[i] >= enemy_threat[j]:
-                    my_dead += 1
-                    break
-        for j, et in enumerate(enemy_combo):
-            if enemy_threat[j] == 0:
-                continue
-            for i, mt in enumerate(my_combo):
-                if not self.is_alpha_dist(mt, et):
-                    continue
-                if enemy_threat[j] >= my_threat[i]:
-                    enemy_dead += 1
-                    break
+        my_dead = len({i for i, j in pairs if my_threat[i] >= enemy_threat[j]})
+        enemy_dead = len({j for i, j in pairs if enemy_threat[j] >= my_threat[i]})
 
         score = (enemy_dead - my_dead) * 1000
 
@@ -1175,63 +1755,52 @@ class XathisBot:
         avoids needing A* until later phases.
 
         Algorithm:
-        1. BFS from ``hill``, depth ≤ 14, also setting ``hill_dist`` on
-           reached tiles. Collect every enemy ant tile encountered.
-        2. Sort the threats by ``hill_dist`` (closest first).
-        3. For each threat, walk back along the prev chain. If we hit a
+        1. BFS from ``hill``, depth ≤ 14. Collect every enemy ant tile
+           encountered.
+        2. Sort the threats by distance to the hill (closest first).
+        3. For each threat, walk back along the BFS parents. If we hit a
            my-ant on the path, that ant is the defender — move it one
-           step toward the enemy (the unique neighbour whose
-           ``prev`` == defender's tile).
+           step toward the enemy (the path tile just past the defender).
         4. ``is_suicide`` gate before issuing the move.
         """
-        open_list: Deque[Tile] = deque()
-        changed: List[Tile] = [hill]
-        threats: List[Tile] = []
-        hill.hill_dist = 0
-        hill.is_reached = True
-        hill.prev = None
-        open_list.append(hill)
-        while open_list:
-            t = open_list.popleft()
-            if t.hill_dist >= DEFENCE_HORIZON:
-                break
-            for n in t.neighbors:
-                if n.is_reached:
-                    continue
-                n.is_reached = True
-                n.hill_dist = t.hill_dist + 1
-                n.prev = t
-                # Strategy.java:394 — tiles within 10 of any hill count
-                # as "known territory" for explore purposes.
-                if n.hill_dist <= 10:
-                    n.explore_value = 0
-                changed.append(n)
-                open_list.append(n)
-                if n.is_enemy():
-                    threats.append(n)
-
-        # Sort enemies by hill_dist ascending (closest first), with a
+        bfs = self._grid()
+        graph = self.graph
+        tile_at, dist, parent = self.graph.tile, bfs.dist, bfs.parent
+        count = bfs.search([hill.index], max_depth=DEFENCE_HORIZON)
+        tile_type, explored, clock = graph.tile_type, graph.explored, graph.clock
+        threats: List[int] = []
+        for index in bfs.order[1:count]:
+            # Strategy.java:394 — tiles within 10 of any hill count
+            # as "known territory" for explore purposes.
+            if dist[index] <= 10:
+                explored[index] = clock
+            if tile_type[index] > MY_ANT:
+                threats.append(index)
+
+        # Sort enemies by hill distance ascending (closest first), with a
         # stable secondary order on (row, col) to keep tests deterministic.
-        threats.sort(key=lambda t: (t.hill_dist, t.row, t.col))
+        threats.sort(key=lambda index: (dist[index], index))
 
-        for enemy_tile in threats:
-            # Walk back along prev chain looking for a my-ant defender.
-            t: Optional[Tile] = enemy_tile
+        for enemy_index in threats:
+            # Walk back along the parent chain looking for a my-ant defender.
+            index = enemy_index
             defender: Optional[Ant] = None
             step_after_defender: Optional[Tile] = None  # the step toward enemy
-            while t is not None and not t.is_hill:
+            while index >= 0 and not tile_at(index).is_hill:
+                t = tile_at(index)
                 if t.tile_type == MY_ANT and t.ant is not None and not t.ant.has_moved:
                     defender = t.ant
                     break
                 step_after_defender = t
-                t = t.prev
+                index = parent[index]
 
             if defender is None:
                 # Fallback: also check the immediate cardinal neighbours
-                # of the prev-chain. This catches a defender adjacent to
+                # of the parent chain. This catches a defender adjacent to
                 # the path (xathis's logic at Strategy.java:434).
-                t = enemy_tile
-                while t is not None and not t.is_hill:
+                index = enemy_index
+                while index >= 0 and not tile_at(index).is_hill:
+                    t = tile_at(index)
                     for n in t.neighbors:
                         if (
                             n.tile_type == MY_ANT
@@ -1243,7 +1812,7 @@ class XathisBot:
                             break
                     if defender is not None:
                         break
-                    t = t.prev
+                    index = parent[index]
 
             if defender is None or step_after_defender is None:
                 continue
@@ -1259,11 +1828,6 @@ class XathisBot:
                 continue
             self.do_move(defender.tile, step_after_defender, "defend")
 
-        # Cleanup is_reached. hill_dist / prev are kept until next turn
-        # (they get overwritten on the next BFS, no correctness issue).
-        for tile in changed:
-            tile.is_reached = False
-
     def _approach_enemies(self) -> None:
         """TODO: A* path toward closest enemy for fight-area ants.
         Strategy.java:876-889."""
@@ -1280,9 +1844,166 @@ class XathisBot:
         pass
 
     def _distribute(self, only_near_enemy: bool) -> None:
-        """TODO: spread out by maximizing reachable-tile count.
-        Strategy.java:990-1014."""
-        pass
+        """Step each idle ant to the neighbour that adds the most squares
+        to what the colony covers. With ``only_near_enemy`` just the ants
+        with close enemies move.
+
+        Port of ``Strategy.distribute`` / ``distributeAnt``
+        (Strategy.java:990-1014). Every ant covers its ball, the squares
+        within ``check`` steps. A step is worth each square of its ball
+        that no other ant of mine covers and no enemy reaches as soon,
+        ``10 + check - dist`` for one ``dist`` steps away; the best free,
+        safe, non-hill step is taken even if it is worth nothing. The Java
+        prices a step with a search from every ant near it
+        (``calcSpaceValueE``). Here each ant is searched once a turn, one
+        step past its ball, and a step is priced from that search and the
+        per-square cover counts (see :class:`Ball`). Both calls in a turn
+        share the counts; a ball is moved only when its ant moves. Ants
+        left when the turn's budget is spent stay where they are.
+
+        Reading a step's ball off the ant's search needs every square to be
+        one step nearer or further from each neighbour, which fails once an
+        odd loop round the torus fits in the ball (:meth:`_odd_wrap`). On
+        such maps each step is priced with a search of its own.
+        """
+        movers = [
+            ant
+            for ant in self.my_ants
+            if not ant.has_moved and (ant.num_close_enemies > 0 or not only_near_enemy)
+        ]
+        if not movers:
+            return
+        check = DISTRIBUTE_CHECK_DIST
+        if len(self.my_ants) >= DISTRIBUTE_CROWDED_ANTS:
+            check -= 1
+        self._update_balls(check)
+        balls, cover = self._balls, self._cover
+        enemy_reach = self._enemy_reach.get
+        neighbors = self.graph.neighbors
+        tile_at = self.graph.tile
+        odd_wrap = self._odd_wrap(check)
+        bfs = self._grid()
+        order, dist = bfs.order, bfs.dist
+
+        unreached = check + 1
+        for ant in movers:
+            if self._time_is_up():
+                return
+            ball = balls[ant]
+            for index in ball.cells:
+                cover[index] -= 1
+            slots = neighbors[ball.centre]
+            values = [0] * len(slots)
+            if odd_wrap:
+                for slot, n in enumerate(slots):
+                    count = bfs.search([n], max_depth=check)
+                    for index in order[1:count]:
+                        d = dist[index]
+                        if not cover[index] and d < enemy_reach(index, unreached):
+                            values[slot] += check + 10 - d
+            else:
+                # a square d steps from the ant is d - 1 steps from the
+                # neighbours its shortest paths leave through, d + 1 from
+                # the rest
+                for index, d, first in zip(ball.reach, ball.dist, ball.first):
+                    if cover[index]:
+                        continue
+                    enemy = enemy_reach(index, unreached)
+                    near = check + 11 - d if 1 < d and d - 1 < enemy else 0
+                    far = check + 9 - d if d < check and d + 1 < enemy else 0
+                    if near or far:
+                        for slot in range(len(slots)):
+                            values[slot] += near if first >> slot & 1 else far
+            for index in ball.cells:
+                cover[index] += 1
+
+            best: Optional[Tile] = None
+            best_value = 0
+            for value, n in zip(values, slots):
+                dest = tile_at(n)
+                if (
+                    not dest.is_free()
+                    or dest.is_hill
+                    or not self.is_tile_safe(ant, dest)
+                ):
+                    continue
+                if best is None or value > best_value:
+                    best, best_value = dest, value
+            if best is not None:
+                self.do_move(ant.tile, best, "distribute")
+                self._move_ball(ball, best.index, check)
+
+    def _odd_wrap(self, check: int) -> bool:
+        """True if a side of the map is odd and no longer than
+        ``2 * check + 2``, so a loop round it fits in the ``check + 1``
+        squares searched around an ant.
+        """
+        graph = self.graph
+        return any(
+            side % 2 and side < 2 * check + 3 for side in (graph.rows, graph.cols)
+        )
+
+    def _update_balls(self, check: int) -> None:
+        """Search every ant's :class:`Ball` on the turn's first call to
+        :meth:`_distribute`; on later calls move the balls of ants that
+        other phases moved since.
+        """
+        balls = self._balls
+        if balls:
+            for ant in self.my_ants:
+                ball = balls[ant]
+                if ball.centre != ant.tile.index:
+                    self._move_ball(ball, ant.tile.index, check)
+            return
+        bfs = self._grid()
+        order, dist, first = bfs.order, bfs.dist, bfs.first
+        count = bfs.search([ant.tile.index for ant in self.enemy_ants], max_depth=check)
+        self._enemy_reach = {index: dist[index] for index in order[:count]}
+        self._cover = cover = array("i", [0]) * self.graph.size
+        if self._odd_wrap(check):
+            # steps are searched one by one; see _distribute
+            for ant in self.my_ants:
+                ball = balls[ant] = Ball(ant.tile.index)
+                count = bfs.search([ball.centre], max_depth=check)
+                ball.cells = order[:count]
+                for index in ball.cells:
+                    cover[index] += 1
+            return
+        for ant in self.my_ants:
+            ball = balls[ant] = Ball(ant.tile.index)
+            count = bfs.search([ball.centre], max_depth=check + 1, track_first=True)
+            ball.reach = reach = order[:count]
+            ball.dist = [dist[index] for index in reach]
+            ball.first = [first[index] for index in reach]
+            ball.cells = [index for index in reach if dist[index] <= check]
+            for index in ball.cells:
+                cover[index] += 1
+
+    def _move_ball(self, ball: Ball, centre: int, check: int) -> None:
+        """Recentre ``ball`` on ``centre`` and update the cover counts.
+
+        A move to a neighbour is read off the ball's ``reach``; anything
+        else is searched again.
+        """
+        cover = self._cover
+        for index in ball.cells:
+            cover[index] -= 1
+        slots = self.graph.neighbors[ball.centre]
+        if ball.reach and centre in slots:
+            bit = 1 << slots.index(centre)
+            ball.cells = [
+                index
+                for index, d, first in zip(ball.reach, ball.dist, ball.first)
+                if (d - 1 if first & bit else d + 1) <= check
+            ]
+        else:
+            bfs = self._grid()
+            count = bfs.search([centre], max_depth=check)
+            ball.cells = bfs.order[:count]
+        ball.centre = centre
+        ball.reach, ball.dist, ball.first = [], [], []
+        for index in ball.cells:
+            cover[index] += 1
 
     def _explore(self) -> None:
         """For each idle, non-indirectly-dangered ant, run :meth:`_explore_ant`
@@ -1304,13 +2025,13 @@ class XathisBot:
         1. BFS from the ant's tile, depth ≤ 10.
         2. The 4 cardinal neighbours are the candidate "first steps". For
            each tile reached on a *shortest* path, record which first
-           steps lead to it (``prev_firsts`` — multiple ties accumulate).
+           steps lead to it (``TorusBFS.first`` — multiple ties accumulate).
         3. When a tile is dequeued at the horizon (dist > 10), do **not**
            expand it. Instead distribute its accumulated ``explore_value``
            equally to every first step that owns a shortest path to it.
         4. The first step with the highest summed value wins. Ties go to
-           whichever entry was inserted first (i.e. dict order — that's
-           the cardinal order ``n``/``e``/``s``/``w``).
+           the earlier neighbour slot (the cardinal order
+           ``n``/``e``/``s``/``w``).
         5. The destination must be ``is_free()`` AND not a hill (avoid
            overwriting food/ant tiles or stalling on a friendly hill).
         6. After picking the destination, zero out the ``explore_value``
@@ -1321,70 +2042,48 @@ class XathisBot:
         fall through to other phases — ``_distribute`` etc.).
         """
         ant_tile = ant.tile
-        # values[first_step_tile] = cumulative explore_value from frontier.
-        # Insertion order matters because we tie-break by it.
-        values: Dict[Tile, int] = {}
-        open_list: Deque[Tile] = deque()
-        changed: List[Tile] = [ant_tile]
-        ant_tile.is_reached = True
-        ant_tile.dist = 0
-
-        for n in ant_tile.neighbors:
-            values[n] = 0
-            n.dist = 1
-            n.is_reached = True
-            n.prev_firsts.add(n)
-            changed.append(n)
-            open_list.append(n)
-
+        bfs = self._grid()
+        tile_at, dist, first = self.graph.tile, bfs.dist, bfs.first
+        explored, clock = self.graph.explored, self.graph.clock
+        start = ant_tile.index
         horizon = EXPLORE_BFS_HORIZON - 1  # = 10
-        while open_list:
-            t = open_list.popleft()
-            if t.dist > horizon:
-                # Frontier tile: distribute its exploreValue to each
-                # first-step that has a shortest path to it.
-                ev = t.explore_value
-                if ev:
-                    for first in t.prev_firsts:
-                        if first in values:
-                            values[first] += ev
+        count = bfs.search([start], max_depth=horizon + 1, track_first=True)
+
+        # values[slot] = cumulative explore_value from frontier for the
+        # first step ``neighbors[start][slot]``; tie-break by slot order.
+        first_steps = [tile_at(n) for n in bfs.neighbors[start]]
+        values = [0] * len(first_steps)
+        frontier: List[int] = []
+        for index in bfs.order[:count]:
+            if dist[index] <= horizon:
                 continue
-            for n in t.neighbors:
-                if n.is_reached:
-                    # Equal-distance tie: this neighbour was reached via
-                    # a different first-step on the same depth, so unify
-                    # the prev_firsts sets.
-                    if n.dist == t.dist + 1:
-                        n.prev_firsts.update(t.prev_firsts)
-                    continue
-                n.is_reached = True
-                n.prev = t
-                n.dist = t.dist + 1
-                n.prev_firsts.update(t.prev_firsts)
-                changed.append(n)
-                open_list.append(n)
+            # Frontier tile: distribute its exploreValue to each first
+            # step that has a shortest path to it.
+            frontier.append(index)
+            ev = clock - explored[index]
+            if ev:
+                mask = first[index]
+                for slot in range(len(values)):
+                    if mask >> slot & 1:
+                        values[slot] += ev
 
         # Pick the best free, non-hill first step.
         best_value = 0
-        best_dest: Optional[Tile] = None
-        for tile, v in values.items():
-            if v > best_value and tile.is_free() and not tile.is_hill:
-                best_value = v
-                best_dest = tile
-
-        if best_dest is None or best_value == 0:
-            for t in changed:
-                t.is_reached = False
-                t.prev_firsts.clear()
+        best_slot = -1
+        for slot, tile in enumerate(first_steps):
+            if values[slot] > best_value and tile.is_free() and not tile.is_hill:
+                best_value = values[slot]
+                best_slot = slot
+
+        if best_slot < 0:
             return False
+        best_dest = first_steps[best_slot]
 
         # Zero out frontier explore_values that the chosen first-step owns,
         # so other ants don't all swarm the same fog blob.
-        for t in changed:
-            if t.dist > horizon and best_dest in t.prev_firsts:
-                t.explore_value = 0
-            t.is_reached = False
-            t.prev_firsts.clear()
+        for index in frontier:
+            if first[index] >> best_slot & 1:
+                explored[index] = clock
 
         # Final safety gate: don't walk into death. The Java doesn't gate
         # explore (it relies on `isIndirectlyDangered` excluding ants in
@@ -1395,19 +2094,186 @@ class XathisBot:
         return True
 
     def _do_missions(self) -> None:
-        """TODO: A* each mission ant toward its target tile.
-        Strategy.java:281-304."""
-        pass
+        """Walk every mission ant one step toward its target.
+
+        Port of ``Strategy.doMissions`` / ``doMission`` (Strategy.java:
+        281-304). The target is moved to the nearest border tile every
+        ``MISSION_UPDATE_TURNS`` turns, or every turn while time is
+        plentiful. A mission that cannot take a safe step is dropped; one
+        whose ant needs a new path once the turn's budget is spent waits
+        in place.
+        """
+        self._is_mission_phase = True
+        for m in self.missions:
+            self._do_mission(m)
+        self._is_mission_phase = False
+
+    def _do_mission(self, m: Mission) -> None:
+        if m.is_removed:
+            return
+        ant = m.curr_tile.ant
+        if (
+            ant is None
+            or m.curr_tile.tile_type != MY_ANT
+            or ant.mission is not m
+            or ant.has_moved
+        ):
+            return
+        elapsed = time.monotonic() * 1000.0 - self.start_time_ms
+        early = MISSION_UPDATE_TIME_MS * self.time_budget_ms / TURN_TIME_BUDGET_MS
+        if elapsed < early or (
+            self.turn - m.last_updated >= MISSION_UPDATE_TURNS
+            and not self._time_is_up()
+        ):
+            self._update_mission(m)
+        dest = self._mission_step(ant, m)
+        if dest is None:
+            if self.is_timeout:
+                ant.has_moved = True
+                return
+            m.is_removed = True
+            ant.has_mission = False
+            return
+        ant.has_mission = True
+        self.do_move(ant.tile, dest, "mission")
+        if dest is m.target:
+            m.is_removed = True
+        else:
+            m.curr_tile = dest
+
+    def _update_mission(self, m: Mission) -> None:
+        """Retarget ``m`` at the border tile nearest its target (or its
+        ant, if the target turned out to be water). Strategy.java:305.
+        """
+        start = m.curr_tile if m.target.tile_type == WATER else m.target
+        border = self._find_border(start)
+        m.last_updated = self.turn
+        if border is not None:
+            m.target = border
+
+    def _mission_step(self, ant: Ant, m: Mission) -> Optional[Tile]:
+        """The next tile on ``m``'s path, planning one if needed.
+
+        The stored path is followed while it still leads to the target,
+        no water seen since it was planned lies on it, and its next step
+        passes the same checks as the first step of a new path (see
+        :meth:`_plan_path`). Otherwise a path is planned again, unless the
+        turn's budget is spent. Returns None if there is no usable path.
+        """
+        graph = self.graph
+        tile_at = graph.tile
+        path = m.path
+        if path and m.water_count != graph.water_count:
+            terrain = graph.terrain
+            if any(terrain[index] == WATER for index in path):
+                path.clear()
+            m.water_count = graph.water_count
+        if path and path[0] == m.target.index:
+            step = tile_at(path[-1])
+            if (
+                step.is_free()
+                and not (step.is_hill and step.hill_player == MY_ANT)
+                and self.is_tile_safe(ant, step)
+            ):
+                path.pop()
+                return step
+        if self._time_is_up():
+            return None
+        planned = self._plan_path(ant, m.target)
+        if planned is None:
+            m.path = []
+            return None
+        m.path = planned
+        m.water_count = graph.water_count
+        return tile_at(planned.pop())
+
+    def _plan_path(self, ant: Ant, target: Tile) -> Optional[List[int]]:
+        """A* from ``ant`` to ``target``, as ``Strategy.aStar2``
+        (Strategy.java:1572) with ``firstFree``: the first step must be
+        free and safe, later steps may pass through my ants, and no step
+        enters one of my hills.
+
+        Returns the path's cells with the next step last, or None.
+        """
+        graph = self.graph
+        tile_at = graph.tile
+        start = ant.tile.index
+        is_hill, hill_player = graph.is_hill, graph.hill_player
+
+        def enter(cell: int, n: int) -> bool:
+            if is_hill[n] and hill_player[n] == MY_ANT:
+                return False
+            if cell == start:
+                return tile_at(n).is_free() and self.is_tile_safe(ant, tile_at(n))
+            return True
+
+        path = self._grid().astar(start, target.index, MISSION_MAX_DIST, enter)
+        if path is None:
+            return None
+        path.reverse()
+        return path
+
+    def _find_border(self, start: Tile) -> Optional[Tile]:
+        """The border tile nearest ``start`` by BFS, or None.
+
+        Port of ``Strategy.findBorder`` (Strategy.java:337).
+        """
+        if start.is_border:
+            return start
+        graph = self.graph
+        border, mark = graph.border, graph.area_mark
+        found: List[int] = []
+
+        def visit(index: int) -> Optional[int]:
+            if border[index] == mark:
+                found.append(index)
+                return STOP
+            return None
+
+        self._grid().search([start.index], max_depth=MISSION_MAX_DIST, visit=visit)
+        return self.graph.tile(found[0]) if found else None
 
     def _create_missions(self) -> None:
-        """TODO: assign new missions to idle ants in fight areas.
-        Strategy.java:313-336."""
-        pass
+        """Send idle ants of each fight area to its border.
+
+        Port of ``Strategy.createMissions`` (Strategy.java:313). An ant
+        standing on a hill takes a border tile picked by turn number, where
+        the Java draws one from a per-turn random generator; the others head
+        for the border tile nearest them.
+        """
+        if self.is_timeout:
+            return
+        for area in self.fight_areas:
+            if len(area.ants) < 2 or not area.border:
+                continue
+            for ant in area.ants:
+                if ant.has_mission or ant.has_moved:
+                    continue
+                if ant.tile.is_hill:
+                    target: Optional[Tile] = area.border[self.turn % len(area.border)]
+                else:
+                    target = self._find_border(ant.tile)
+                if target is None:
+                    continue
+                path = self._plan_path(ant, target)
+                if path is None:
+                    continue
+                dest = self.graph.tile(path.pop())
+                self.do_move(ant.tile, dest, "new mission")
+                m = Mission(target, dest, self.turn)
+                m.path = path
+                m.water_count = self.graph.water_count
+                ant.has_mission = True
+                ant.mission = m
+                self.missions.append(m)
 
     def _clean_areas(self) -> None:
-        """TODO: reset is_in_my_area flags for next turn.
-        Strategy.java:773-777."""
-        pass
+        """Clear every tile's ``is_in_my_area`` and ``is_border`` flags.
+
+        ``Strategy.cleanAreas`` (Strategy.java:773-777) walks the tiles of
+        my areas; here the flags are stamps, so bumping the mark is enough.
+        """
+        self.graph.area_mark += 1
 
     # ------------------------------------------------------------------
     # Safety gates (Strategy.java:1673-1724)
@@ -1507,12 +2373,18 @@ class XathisBot:
             return True
         direction = src.dir_to(dest)
         # Update the tile graph.
-        dest.tile_type = src.tile_type
-        dest.ant = src.ant
-        src.tile_type = LAND
-        src.ant.tile = dest
-        src.ant.has_moved = True
-        src.ant = None
+        graph = self.graph
+        ant = graph.ant[src.index]
+        # any other phase moving a mission ant ends its mission
+        if not self._is_mission_phase and ant.mission is not None and ant.has_mission:
+            ant.mission.is_removed = True
+            ant.has_mission = False
+        graph.tile_type[dest.index] = graph.tile_type[src.index]
+        graph.ant[dest.index] = ant
+        graph.tile_type[src.index] = LAND
+        graph.ant[src.index] = None
+        ant.tile = dest
+        ant.has_moved = True
         # Tell the engine.
         self._engine.issue_order((src.row, src.col, direction))
         return True
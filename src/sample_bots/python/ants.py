@@ -2,6 +2,7 @@
 import sys
 import traceback
 import random
+from collections import deque
 
 try:
     from sys import maxint
@@ -50,6 +51,10 @@ class Ants():
         self.food_list = []
         self.dead_list = []
         self.hill_list = {}
+        # unseen squares next to seen, passable ones, and the distance
+        # field grown from them (see closest_unseen)
+        self.unseen_frontier = set()
+        self._unseen_nearest = None
 
     def setup(self, data):
         'parse initial input and setup starting game state'
@@ -93,6 +98,7 @@ class Ants():
         self.hill_list = {}
 
         # update map and create new ant and food lists
+        revealed = []
         for line in data.split('\n'):
             line = line.strip().lower()
             if len(line) > 0:
@@ -100,6 +106,8 @@ class Ants():
                 if len(tokens) >= 3:
                     row = int(tokens[1])
                     col = int(tokens[2])
+                    if tokens[0] in ('a', 'f', 'w', 'l') and self.map[row][col] == UNSEEN:
+                        revealed.append((row, col))
                     if tokens[0] == 'a':
                         owner = int(tokens[3])
                         self.map[row][col] = owner
@@ -121,6 +129,8 @@ class Ants():
                     elif tokens[0] == 'h':
                         owner = int(tokens[3])
                         self.hill_list[(row, col)] = owner
+        if revealed:
+            self._reveal(revealed)
 
     def issue_order(self, order):
         sys.stdout.write('o %s %s %s\n' % (order[0], order[1], order[2]))
@@ -232,19 +242,63 @@ class Ants():
                     closest_hill = hill[0]
         return closest_hill   
 
+    def _reveal(self, locs):
+        'move newly seen squares out of the unseen frontier'
+        for row, col in locs:
+            self.unseen_frontier.discard((row, col))
+            if self.map[row][col] == WATER:
+                continue
+            for direction in AIM:
+                n_row, n_col = self.destination(row, col, direction)
+                if self.map[n_row][n_col] == UNSEEN:
+                    self.unseen_frontier.add((n_row, n_col))
+        self._unseen_nearest = None
+
+    def _unseen_field(self):
+        'nearest frontier square for every seen square, by walking distance'
+        if self._unseen_nearest is None:
+            nearest = {}
+            queue = deque()
+            for loc in sorted(self.unseen_frontier):
+                nearest[loc] = loc
+                queue.append(loc)
+            while queue:
+                row, col = queue.popleft()
+                for direction in AIM:
+                    n_loc = self.destination(row, col, direction)
+                    if (n_loc not in nearest and
+                            self.map[n_loc[0]][n_loc[1]] not in (UNSEEN, WATER)):
+                        nearest[n_loc] = nearest[(row, col)]
+                        queue.append(n_loc)
+            self._unseen_nearest = nearest
+        return self._unseen_nearest
+
     def closest_unseen(self,row1,col1,filter=None):
-        #find the closest unseen from this row/col
-        min_dist=maxint
-        closest_unseen = None
-        for row in range(self.height):
-            for col in range(self.width):
-                if filter is None or (row, col) not in filter:
-                    if self.map[row][col] == UNSEEN:
-                        dist = self.distance(row1,col1,row,col)
-                        if dist<min_dist:
-                            min_dist = dist
-                            closest_unseen = (row, col)
-        return closest_unseen
+        #find the closest unseen by walking distance from this row/col
+        loc = (row1 % self.height, col1 % self.width)
+        target = self._unseen_field().get(loc)
+        if target is not None and (filter is None or target not in filter):
+            return target
+        # the shared answer is filtered out: search outwards from this ant
+        excluded = set(filter or ())
+        if self.map[loc[0]][loc[1]] == UNSEEN and loc not in excluded:
+            return loc
+        seen = set([loc])
+        queue = deque([loc])
+        while queue:
+            row, col = queue.popleft()
+            for direction in AIM:
+                n_loc = self.destination(row, col, direction)
+                if n_loc in seen:
+                    continue
+                seen.add(n_loc)
+                square = self.map[n_loc[0]][n_loc[1]]
+                if square == UNSEEN:
+                    if n_loc not in excluded:
+                        return n_loc
+                elif square != WATER:
+                    queue.append(n_loc)
+        return None
 
     def render_text_map(self):
         tmp = ''
@@ -741,6 +741,21 @@ def run_rounds(opts, args):
                         )
                     )
                 print(" ".join(fields))
+                # Per-turn response latency (ms from resume to "go") for
+                # every player, in turn order. Parsed by scripts/benchmark.py.
+                #   LATENCY game_id=0 turntime=1000 player_0=12.1,10.4 player_1=...
+                latency = result.get("turn_latency_ms", [])
+                fields = [
+                    "LATENCY",
+                    "game_id={0}".format(game_id),
+                    "turntime={0}".format(opts.turntime),
+                ]
+                for i in range(len(player_names)):
+                    samples = latency[i] if i < len(latency) else []
+                    fields.append(
+                        "player_{0}={1}".format(i, ",".join(map(str, samples)))
+                    )
+                print(" ".join(fields))
             except Exception:
                 # never let summary printing break a game run
                 traceback.print_exc()
@@ -7,6 +7,7 @@ fake ``ants`` object that satisfies the helper API surface used by the bot.
 from __future__ import annotations
 
 import importlib.util
+import random
 import sys
 from pathlib import Path
 
@@ -14,6 +15,7 @@ import pytest
 
 from bots import ants as bot_helper_ants
 from bots.ants import AIM, BEHIND, LEFT, RIGHT
+from bots.bfs import TorusBFS
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 
@@ -74,12 +76,18 @@ class FakeAnts:
         self._food = list(food_locs)
         self._water = set(water_locs)
         self.orders = []
+        self.new_water = []
+        self.turntime = 1000
+        self.debug = None
         self.map = [[-2 for _ in range(width)] for _ in range(height)]
         # mark water as -4 (matches WATER constant in bots.ants)
         for r, c in self._water:
             self.map[r][c] = -4
 
     # query helpers
+    def time_remaining(self):
+        return self.turntime
+
     def my_ants(self):
         return list(self._my_ants)
 
@@ -160,6 +168,12 @@ class FakeAnts:
             return None
         return min(candidates, key=lambda loc: self.distance(r, c, loc[0], loc[1]))
 
+    def searcher(self):
+        bfs = TorusBFS(self.height, self.width)
+        for r, c in self._water:
+            bfs.block(bfs.index(r, c))
+        return bfs
+
     def issue_order(self, order):
         self.orders.append(order)
 
@@ -242,3 +256,93 @@ class TestAdvancedBotDoTurn:
         for expected in range(1, 4):
             bot.do_turn(ants)
             assert bot.turn_count == expected
+
+
+class TestAdvancedBotAssignment:
+    def test_closest_pair_is_served_first(self) -> None:
+        """The ant beside a food takes it, even if another ant comes first."""
+        bot = AdvancedBot()
+        ants = FakeAnts(
+            width=20,
+            my_ants_locs=[(0, 0), (0, 5)],
+            food_locs=[(0, 3), (0, 12)],
+        )
+        bot.do_turn(ants)
+        steps = {order[2]: order[1] for order in bot.standing_orders}
+        assert steps == {(0, 3): (0, 4), (0, 12): (0, 19)}
+
+    def test_food_behind_water_is_further_away(self) -> None:
+        bot = AdvancedBot()
+        ants = FakeAnts(
+            my_ants_locs=[(5, 5)],
+            food_locs=[(5, 7), (5, 1)],
+            water_locs=[(row, 6) for row in range(10)],
+        )
+        bot.do_turn(ants)
+        assert ants.orders == [(5, 5, "w")]
+        assert bot.standing_orders[0][2] == (5, 1)
+
+    def test_ants_out_of_straight_line_reach_are_not_searched_for(self) -> None:
+        bot = AdvancedBot()
+        ants = FakeAnts(width=40, height=40)
+        bot.bfs = ants.searcher()
+        near = bot.within_reach(ants, [(0, 0), (20, 20), (0, 38)], [(0, 3)], 5)
+        assert near == [(0, 0), (0, 38)]
+
+    @pytest.mark.parametrize("exclusive", [True, False])
+    def test_filtering_and_stopping_early_keep_the_pairs(
+        self, monkeypatch, exclusive
+    ) -> None:
+        rng = random.Random(4)
+        for _ in range(20):
+            cells = rng.sample([(r, c) for r in range(30) for c in range(40)], 140)
+            ants = FakeAnts(width=40, height=30, water_locs=cells[40:])
+            free, targets = cells[:25], cells[25:40]
+            max_distance = rng.choice([6, 12, 25])
+            found = []
+            for pairs in (0, 10_000):
+                monkeypatch.setattr(bot_module, "ASSIGN_FILTER_PAIRS", pairs)
+                bot = AdvancedBot()
+                bot.bfs = ants.searcher()
+                found.append(bot.assign(ants, free, targets, max_distance, exclusive))
+            assert found[0] == found[1]
+
+
+class TestAdvancedBotPaths:
+    def test_order_steps_around_water(self) -> None:
+        """The straight-line step is water; the path goes round it."""
+        bot = AdvancedBot()
+        ants = FakeAnts(
+            my_ants_locs=[(5, 5)],
+            food_locs=[(5, 7)],
+            water_locs=[(5, 6)],
+        )
+        bot.do_turn(ants)
+        assert len(ants.orders) == 1
+        assert ants.orders[0][2] in ("n", "s")
+
+    def test_path_tree_is_kept_until_water_is_seen_on_the_path(self) -> None:
+        bot = AdvancedBot()
+        ants = FakeAnts(my_ants_locs=[(5, 3)], food_locs=[(5, 7)])
+        bot.do_turn(ants)
+        assert ants.orders == [(5, 3, "e")]
+        tree = bot.paths[(5, 7)]
+
+        # water off the ant's path leaves the tree in use
+        ants = FakeAnts(
+            my_ants_locs=[(5, 4)], food_locs=[(5, 7)], water_locs=[(3, 7)]
+        )
+        ants.new_water = [(3, 7)]
+        bot.bfs.block(3 * 10 + 7)  # the helper blocks water in the shared table
+        bot.do_turn(ants)
+        assert bot.paths[(5, 7)] is tree
+        assert tree.water == {3 * 10 + 7}
+
+        ants = FakeAnts(
+            my_ants_locs=[(5, 5)], food_locs=[(5, 7)], water_locs=[(5, 6)]
+        )
+        ants.new_water = [(5, 6)]
+        bot.bfs.block(5 * 10 + 6)  # the helper blocks water in the shared table
+        bot.do_turn(ants)
+        assert bot.paths[(5, 7)] is not tree
+        assert ants.orders[0][2] in ("n", "s")
@@ -222,3 +222,31 @@ class TestAgainstBundledStats:
         assert len(analyzer.df) >= 1
         # Should not crash even though game_data is empty.
         analyzer.full_analysis()
+
+
+class TestResultStoreLoading:
+    def test_loads_jsonl_store_without_replays(
+        self, analyzer_module, tmp_path: Path
+    ) -> None:
+        path = tmp_path / "games.jsonl"
+        rows = [
+            {"test_name": "vs RandomBot", "timestamp": "t", "game": 1,
+             "result": "WIN", "our_score": 5, "enemy_score": 1, "turns": 200,
+             "food_collected": 5, "enemy_food_collected": 1,
+             "replay_path": str(tmp_path / "missing.json")},
+            {"test_name": "vs RandomBot", "timestamp": "t", "game": 2,
+             "result": "LOSS", "our_score": 1, "enemy_score": 4, "turns": 300,
+             "food_collected": 2, "enemy_food_collected": 6,
+             "replay_path": str(tmp_path / "missing.json")},
+        ]
+        path.write_text("".join(json.dumps(r) + "\n" for r in rows))
+
+        analyzer = analyzer_module.AntsAIAnalyzer(str(path))
+        assert len(analyzer.df) == 1
+        assert analyzer.df.iloc[0]["wins"] == 1
+        assert analyzer.df.iloc[0]["average_turns"] == 250.0
+        assert len(analyzer.game_data) == 2
+        assert list(analyzer.game_data["food_collected"]) == [5, 2]
+        assert "replay_path" not in analyzer.game_data.columns
+        analyzer.full_analysis()
+        analyzer.statistical_significance()
@@ -198,3 +198,284 @@ def test_main_reports_summary_outside_repo(benchmark_mod, tmp_path, capsys):
     assert f"Summary written to {output_dir}" in captured
     assert list(output_dir.glob("summary_*.md"))
     assert list(output_dir.glob("summary_*.json"))
+
+
+def _fake_run_counter(benchmark_mod, monkeypatch):
+    calls = []
+
+    def fake_run(cmd, **_kwargs):
+        calls.append(cmd)
+        return SimpleNamespace(stdout=SAMPLE_WIN, stderr="", returncode=0)
+
+    monkeypatch.setattr(benchmark_mod.subprocess, "run", fake_run)
+    return calls
+
+
+def _bot_files(tmp_path):
+    bot = tmp_path / "bot.py"
+    opp = tmp_path / "opp.py"
+    game_map = tmp_path / "map.map"
+    bot.write_text("# bot v1\n")
+    opp.write_text("# opponent\n")
+    game_map.write_text("rows 1\n")
+    return bot, opp, game_map
+
+
+def _matchup(benchmark_mod, tmp_path, bot, opp, game_map, cache, games=3, jobs=1):
+    return benchmark_mod.run_matchup(
+        name="vs_Opp",
+        bots=[f"python {bot}", f"python {opp}"],
+        map_file=game_map,
+        games=games,
+        log_dir=tmp_path,
+        turns=30,
+        rng=benchmark_mod.random.Random(7),
+        jobs=jobs,
+        cache=cache,
+    )
+
+
+def test_cache_replays_untouched_games(benchmark_mod, monkeypatch, tmp_path):
+    calls = _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+    cache_path = tmp_path / "cache.jsonl"
+
+    first = _matchup(
+        benchmark_mod, tmp_path, bot, opp, game_map, benchmark_mod.ResultCache(cache_path)
+    )
+    assert len(calls) == 3
+
+    second = _matchup(
+        benchmark_mod, tmp_path, bot, opp, game_map, benchmark_mod.ResultCache(cache_path)
+    )
+    assert len(calls) == 3
+    assert all(g.cached for g in second.games)
+    assert [g.engine_seed for g in second.games] == [g.engine_seed for g in first.games]
+
+    # Editing the bot changes its content hash, so every game is replayed.
+    benchmark_mod.file_sha256.cache_clear()
+    bot.write_text("# bot v2\n")
+    _matchup(
+        benchmark_mod, tmp_path, bot, opp, game_map, benchmark_mod.ResultCache(cache_path)
+    )
+    assert len(calls) == 6
+
+
+def test_cache_replays_games_when_an_imported_helper_changes(
+    benchmark_mod, monkeypatch, tmp_path
+):
+    calls = _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+    helper = tmp_path / "helper.py"
+    unrelated = tmp_path / "unrelated.py"
+    helper.write_text("STEP = 1\n")
+    unrelated.write_text("X = 1\n")
+    bot.write_text(
+        "try:\n    from helper import STEP\n"
+        f"except ImportError:\n    from {tmp_path.name}.helper import STEP\n"
+    )
+    cache_path = tmp_path / "cache.jsonl"
+
+    def run():
+        benchmark_mod.file_sha256.cache_clear()
+        _matchup(
+            benchmark_mod, tmp_path, bot, opp, game_map,
+            benchmark_mod.ResultCache(cache_path),
+        )
+
+    run()
+    assert len(calls) == 3
+    unrelated.write_text("X = 2\n")
+    run()
+    assert len(calls) == 3
+    helper.write_text("STEP = 2\n")
+    run()
+    assert len(calls) == 6
+
+
+def test_cache_key_covers_the_engine(benchmark_mod, monkeypatch, tmp_path):
+    engine = tmp_path / "engine.py"
+    engine.write_text("# engine v1\n")
+    game_map = tmp_path / "map.map"
+    game_map.write_text("rows 1\n")
+    monkeypatch.setattr(benchmark_mod, "ENGINE_PATHS", (engine,))
+    monkeypatch.setattr(benchmark_mod, "REPO_ROOT", tmp_path)
+    key = dict(
+        bots=["python bot.py"], map_file=game_map, turns=10, engine_seed=1, player_seed=2
+    )
+
+    benchmark_mod.file_sha256.cache_clear()
+    benchmark_mod.engine_fingerprint.cache_clear()
+    before = benchmark_mod.game_cache_key(**key)
+    engine.write_text("# engine v2\n")
+    benchmark_mod.file_sha256.cache_clear()
+    benchmark_mod.engine_fingerprint.cache_clear()
+    after = benchmark_mod.game_cache_key(**key)
+    benchmark_mod.engine_fingerprint.cache_clear()
+    assert before != after
+
+
+def test_cache_resumes_after_truncated_write(benchmark_mod, monkeypatch, tmp_path):
+    calls = _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+    cache_path = tmp_path / "cache.jsonl"
+
+    _matchup(
+        benchmark_mod, tmp_path, bot, opp, game_map,
+        benchmark_mod.ResultCache(cache_path), games=2,
+    )
+    # Simulate a run killed while appending its third game.
+    with open(cache_path, "a") as fh:
+        fh.write('{"key": "abc", "outc')
+
+    _matchup(
+        benchmark_mod, tmp_path, bot, opp, game_map,
+        benchmark_mod.ResultCache(cache_path), games=4,
+    )
+    assert len(calls) == 4
+
+
+def test_error_outcomes_are_not_cached(benchmark_mod, tmp_path):
+    cache = benchmark_mod.ResultCache(tmp_path / "cache.jsonl")
+    outcome = benchmark_mod.GameOutcome(
+        game_id=-1, turns=0, winner="error", players=[], duration_s=1.0
+    )
+    cache.put("k", outcome)
+    assert cache.get("k") is None
+    assert not (tmp_path / "cache.jsonl").exists()
+
+
+def test_parallel_jobs_keep_game_order(benchmark_mod, monkeypatch, tmp_path):
+    _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+
+    serial = _matchup(benchmark_mod, tmp_path, bot, opp, game_map, None, games=4)
+    parallel = _matchup(
+        benchmark_mod, tmp_path, bot, opp, game_map, None, games=4, jobs=4
+    )
+    assert [g.engine_seed for g in parallel.games] == [
+        g.engine_seed for g in serial.games
+    ]
+
+
+def test_sprt_decides_above_and_below(benchmark_mod):
+    rule = benchmark_mod.SprtRule(threshold=0.5, margin=0.2, alpha=0.05, beta=0.05)
+    # ln(19) / ln(0.7 / 0.3) ~= 3.5, so four straight wins cross the upper bound.
+    assert rule.decide(3, 3) is None
+    assert rule.decide(4, 4) == "above"
+    assert rule.decide(0, 4) == "below"
+    assert rule.decide(5, 10) is None
+
+
+def test_sprt_matchup_stops_early_and_records_rule(
+    benchmark_mod, monkeypatch, tmp_path
+):
+    calls = _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+    summary = benchmark_mod.run_matchup(
+        name="vs_Opp",
+        bots=[f"python {bot}", f"python {opp}"],
+        map_file=game_map,
+        games=20,
+        log_dir=tmp_path,
+        turns=30,
+        rng=benchmark_mod.random.Random(7),
+        jobs=2,
+        sprt=benchmark_mod.SprtRule(),
+    )
+
+    assert len(calls) == 4
+    rule = summary.stopping_rule
+    assert rule["rule"] == "sprt"
+    assert rule["decision"] == "above"
+    assert rule["games_played"] == 4
+    assert rule["games_saved"] == 16
+
+    markdown_path = benchmark_mod.write_summary([summary], tmp_path, master_seed=7)
+    json_payload = json.loads(markdown_path.with_suffix(".json").read_text())
+    assert json_payload[0]["stopping_rule"]["games_saved"] == 16
+    assert "Sequential stopping (SPRT)" in markdown_path.read_text()
+
+
+def test_fixed_matchup_records_fixed_rule(benchmark_mod, monkeypatch, tmp_path):
+    _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+    summary = _matchup(benchmark_mod, tmp_path, bot, opp, game_map, None, games=2)
+    assert summary.stopping_rule == {"rule": "fixed", "games": 2}
+
+
+SAMPLE_LATENCY = "LATENCY game_id=0 turntime=500 player_0=10.0,20.0,30.0,450.0 player_1="
+
+
+def test_parse_attaches_latency_samples(benchmark_mod):
+    o = benchmark_mod.parse_result_line(SAMPLE_WIN + "\n" + SAMPLE_LATENCY + "\n")
+    assert o.turntime_ms == 500
+    assert o.latency_ms == [[10.0, 20.0, 30.0, 450.0], []]
+    assert benchmark_mod.GameOutcome.from_dict(o.to_dict()).latency_ms == o.latency_ms
+
+
+def test_parse_without_latency_line_keeps_empty_samples(benchmark_mod):
+    o = benchmark_mod.parse_result_line(SAMPLE_WIN)
+    assert o.turntime_ms is None
+    assert o.latency_ms == []
+
+
+def test_latency_percentiles_and_warning(benchmark_mod):
+    stats = benchmark_mod.latency_stats(float(v) for v in range(1, 101))
+    assert stats["p50"] == 50.0
+    assert stats["p95"] == 95.0
+    assert stats["p99"] == 99.0
+    assert stats["max"] == 100.0
+    assert benchmark_mod.latency_warnings({"bot.py": stats}, 1000, 0.8) == []
+    warnings = benchmark_mod.latency_warnings({"bot.py": stats}, 110, 0.8)
+    assert len(warnings) == 1 and warnings[0].startswith("bot.py p99=99ms")
+
+
+def test_summary_reports_latency_by_matchup_and_map_size(benchmark_mod, tmp_path):
+    outcome = benchmark_mod.parse_result_line(SAMPLE_WIN + "\n" + SAMPLE_LATENCY)
+    summary = benchmark_mod.MatchupSummary(
+        name="vs_RandomBot", games=[outcome], map_size="60x96"
+    )
+    markdown_path = benchmark_mod.write_summary([summary], tmp_path, master_seed=1)
+    payload = json.loads(markdown_path.with_suffix(".json").read_text())
+    assert payload[0]["latency"]["bot.py"]["max"] == 450.0
+    assert payload[0]["map_size"] == "60x96"
+
+    latency_file = next(tmp_path.glob("latency_*.json"))
+    report = json.loads(latency_file.read_text())
+    assert report["by_map_size"]["60x96"]["bot.py"]["p99"] == 450.0
+    assert report["warnings"] == ["vs_RandomBot: bot.py p99=450ms is 90% of turntime 500ms"]
+    assert "Latency warnings" in markdown_path.read_text()
+
+
+def test_seat_labels_disambiguate_self_play(benchmark_mod):
+    line = SAMPLE_DRAW.replace("LeftyBot.py", "bot.py")
+    assert benchmark_mod.parse_result_line(line).seat_labels() == ["bot.py[0]", "bot.py[1]"]
+
+
+def test_fresh_games_are_appended_to_result_store(benchmark_mod, monkeypatch, tmp_path):
+    _fake_run_counter(benchmark_mod, monkeypatch)
+    bot, opp, game_map = _bot_files(tmp_path)
+    store = benchmark_mod.ResultStore(tmp_path / "games.jsonl")
+    cache = benchmark_mod.ResultCache(tmp_path / "cache.jsonl")
+    kwargs = dict(
+        name="vs_Opp",
+        bots=[f"python {bot}", f"python {opp}"],
+        map_file=game_map,
+        games=2,
+        log_dir=tmp_path,
+        turns=30,
+        cache=cache,
+        store=store,
+        timestamp="ts",
+    )
+    summary = benchmark_mod.run_matchup(rng=benchmark_mod.random.Random(7), **kwargs)
+    # Replaying from the cache must not duplicate history rows.
+    benchmark_mod.run_matchup(rng=benchmark_mod.random.Random(7), **kwargs)
+
+    rows = [json.loads(line) for line in (tmp_path / "games.jsonl").read_text().splitlines()]
+    assert [r["game"] for r in rows] == [1, 2]
+    assert rows[0]["test_name"] == "vs_Opp"
+    assert rows[0]["result"] == "WIN"
+    assert rows[0]["our_score"] == 4 and rows[0]["enemy_score"] == 1
+    assert rows[0]["engine_seed"] == summary.games[0].engine_seed
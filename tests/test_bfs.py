@@ -0,0 +1,157 @@
+"""Unit tests for src/bots/bfs.py — the flat-index torus BFS the bots share."""
+
+from __future__ import annotations
+
+from bots.bfs import SKIP, STOP, TorusBFS
+
+
+def _reached(bfs: TorusBFS, count: int):
+    return {bfs.loc(index): bfs.dist[index] for index in bfs.order[:count]}
+
+
+class TestSearch:
+    def test_distances_wrap_around_the_torus(self) -> None:
+        bfs = TorusBFS(5, 7)
+        count = bfs.search([bfs.index(0, 0)])
+        assert count == 35
+        dist = _reached(bfs, count)
+        assert dist[(4, 0)] == 1
+        assert dist[(0, 6)] == 1
+        assert dist[(2, 3)] == 5
+        assert max(dist.values()) == 2 + 3
+
+    def test_blocked_cells_are_walked_around(self) -> None:
+        bfs = TorusBFS(3, 10)
+        for row in (0, 1):
+            bfs.block(bfs.index(row, 5))
+        bfs.search([bfs.index(0, 4)])
+        assert not bfs.reached(bfs.index(0, 5))
+        assert bfs.dist[bfs.index(0, 6)] == 4
+        # a blocked cell can still start a search
+        bfs.search([bfs.index(0, 5)], max_depth=1)
+        assert bfs.reached(bfs.index(0, 4)) and bfs.reached(bfs.index(0, 6))
+
+    def test_depth_limit_reaches_but_does_not_expand(self) -> None:
+        bfs = TorusBFS(20, 20)
+        count = bfs.search([bfs.index(10, 10)], max_depth=3)
+        dist = _reached(bfs, count)
+        assert max(dist.values()) == 3
+        assert len(dist) == 1 + 4 + 8 + 12
+
+    def test_labels_follow_the_nearest_source(self) -> None:
+        bfs = TorusBFS(1, 10)
+        bfs.search([bfs.index(0, 1), bfs.index(0, 6)], labels=["a", "b"])
+        labels = [bfs.label[bfs.index(0, col)] for col in range(10)]
+        assert labels == ["a", "a", "a", "a", "b", "b", "b", "b", "b", "a"]
+
+    def test_visit_can_skip_and_stop(self) -> None:
+        bfs = TorusBFS(1, 9)
+        wall = bfs.index(0, 2)
+        seen = []
+
+        def visit(index):
+            seen.append(index)
+            if index == wall:
+                return SKIP
+            if bfs.dist[index] == 3:
+                return STOP
+            return None
+
+        bfs.search([bfs.index(0, 0)], visit=visit)
+        assert wall in seen
+        assert not bfs.reached(bfs.index(0, 3))
+        assert bfs.loc(seen[-1]) in ((0, 6), (0, 7))
+
+    def test_passable_flags_keep_the_search_out(self) -> None:
+        bfs = TorusBFS(1, 6)
+        passable = bytearray([1, 1, 0, 1, 1, 1])
+        bfs.search([0], passable=passable)
+        assert not bfs.reached(2)
+        assert bfs.dist[3] == 3
+
+    def test_first_step_masks_merge_equal_paths(self) -> None:
+        bfs = TorusBFS(9, 9)
+        start = bfs.index(4, 4)
+        slots = {bfs.loc(n): slot for slot, n in enumerate(bfs.neighbors[start])}
+        bfs.search([start], track_first=True)
+        north, east = 1 << slots[(3, 4)], 1 << slots[(4, 5)]
+        assert bfs.first[bfs.index(2, 4)] == north
+        assert bfs.first[bfs.index(3, 5)] == north | east
+
+    def test_first_step_masks_without_callbacks_match(self) -> None:
+        bfs = TorusBFS(12, 15)
+        for index in (20, 21, 22, 50, 65, 80, 81, 130):
+            bfs.block(index)
+        start = bfs.index(5, 6)
+        count = bfs.search([start], max_depth=6, track_first=True)
+        plain = {n: (bfs.dist[n], bfs.first[n]) for n in bfs.order[:count]}
+        count = bfs.search([start], max_depth=6, track_first=True, visit=lambda n: None)
+        assert plain == {n: (bfs.dist[n], bfs.first[n]) for n in bfs.order[:count]}
+
+    def test_generations_invalidate_earlier_searches(self) -> None:
+        bfs = TorusBFS(10, 10)
+        far = bfs.index(5, 5)
+        bfs.search([0])
+        assert bfs.reached(far)
+        bfs.search([0], max_depth=2)
+        assert not bfs.reached(far)
+        assert bfs.path(bfs.index(1, 1))[0] == 0
+        assert len(bfs.path(bfs.index(1, 1))) == 3
+
+    def test_shared_neighbour_table_sees_blocks(self) -> None:
+        first = TorusBFS(4, 4)
+        second = TorusBFS(4, 4, neighbors=first.neighbors)
+        first.block(1)
+        second.search([0])
+        assert not second.reached(1)
+        assert first.reached(0) is False
+
+
+class TestAstar:
+    def test_path_wraps_around_the_torus(self) -> None:
+        bfs = TorusBFS(10, 10)
+        path = bfs.astar(bfs.index(0, 1), bfs.index(0, 8), max_cost=50)
+        assert [bfs.loc(index) for index in path] == [(0, 0), (0, 9), (0, 8)]
+
+    def test_path_goes_around_blocked_cells(self) -> None:
+        bfs = TorusBFS(10, 20)
+        for row in range(1, 9):
+            bfs.block(bfs.index(row, 5))
+        path = bfs.astar(bfs.index(5, 3), bfs.index(5, 7), max_cost=50)
+        assert path is not None and path[-1] == bfs.index(5, 7)
+        # up to the gap at row 9, across, and back down
+        assert len(path) == 4 + 4 + 4
+        assert all(bfs.loc(index)[1] != 5 or bfs.loc(index)[0] in (0, 9) for index in path)
+
+    def test_enter_forbids_steps(self) -> None:
+        bfs = TorusBFS(1, 10)
+        start = bfs.index(0, 5)
+
+        def enter(cell, n):
+            # no first step to the east
+            return not (cell == start and n == bfs.index(0, 6))
+
+        path = bfs.astar(start, bfs.index(0, 7), max_cost=50, enter=enter)
+        assert len(path) == 8
+        assert bfs.astar(start, bfs.index(0, 7), max_cost=50, enter=lambda c, n: False) is None
+
+    def test_cost_limit(self) -> None:
+        bfs = TorusBFS(20, 20)
+        assert bfs.astar(bfs.index(0, 0), bfs.index(0, 6), max_cost=5) is None
+        assert len(bfs.astar(bfs.index(0, 0), bfs.index(0, 6), max_cost=6)) == 6
+
+    def test_paths_are_walkable(self) -> None:
+        # cells are closed when first reached, so a path is not always a
+        # shortest one; it never beats the search distance, though
+        bfs = TorusBFS(12, 9)
+        for index in (13, 40, 77):
+            bfs.block(index)
+        for target in range(0, bfs.size, 7):
+            if target in (13, 40, 77, 0):
+                continue
+            bfs.search([0])
+            want = bfs.dist[target]
+            path = bfs.astar(0, target, max_cost=100)
+            assert len(path) >= want
+            steps = [0] + path
+            assert all(b in bfs.neighbors[a] for a, b in zip(steps, steps[1:]))
@@ -2,6 +2,10 @@
 
 from __future__ import annotations
 
+import io
+import time
+from types import SimpleNamespace
+
 import pytest
 
 from bots import ants as bot_ants
@@ -10,15 +14,20 @@ from bots.ants import (
     ANTS,
     BEHIND,
     DEAD,
+    ESSENTIAL,
     FOOD,
+    HIGH,
     HILL,
     LAND,
     LEFT,
+    LOW,
     MY_ANT,
+    NORMAL,
     RIGHT,
     UNSEEN,
     WATER,
     Ants,
+    TurnScheduler,
 )
 
 
@@ -128,6 +137,13 @@ class TestUpdate:
         assert populated_ants.map[4][4] == WATER
         assert populated_ants.map[4][5] == WATER
 
+    def test_new_water_is_only_first_sightings(self, populated_ants: Ants) -> None:
+        assert populated_ants.new_water == [(4, 4), (4, 5)]
+        populated_ants.update("\n".join(["turn 2", "w 4 4", "w 6 6"]))
+        assert populated_ants.new_water == [(6, 6)]
+        populated_ants.update("turn 3")
+        assert populated_ants.new_water == []
+
     def test_clears_previous_state(self, populated_ants: Ants) -> None:
         next_update = "\n".join(["turn 2", "a 1 1 0", "f 0 5"])
         populated_ants.update(next_update)
@@ -137,6 +153,26 @@ class TestUpdate:
         assert (3, 3) not in populated_ants.food()
         assert (7, 2) not in populated_ants.food()
 
+    def test_only_vacated_cells_revert_to_land(self, populated_ants: Ants) -> None:
+        populated_ants.update("\n".join(["turn 2", "a 3 3 0", "d 2 8 1", "f 5 5"]))
+        assert populated_ants.map[3][3] == MY_ANT  # ant stepped onto old food
+        assert populated_ants.map[5][5] == FOOD  # food spawned under old ant
+        assert populated_ants.map[2][8] == DEAD
+        assert populated_ants.map[1][1] == LAND
+        assert populated_ants.map[7][2] == LAND
+        assert populated_ants.map[4][4] == WATER
+
+    def test_dead_ant_does_not_hide_food(self, populated_ants: Ants) -> None:
+        populated_ants.update("\n".join(["turn 2", "f 1 1", "d 1 1 0"]))
+        assert populated_ants.map[1][1] == FOOD
+        assert populated_ants.dead_list == {(1, 1): None}
+
+    def test_returned_lists_are_copies(self, populated_ants: Ants) -> None:
+        populated_ants.my_ants().pop()
+        populated_ants.food().clear()
+        assert len(populated_ants.my_ants()) == 2
+        assert len(populated_ants.food()) == 2
+
 
 class TestGeometry:
     @pytest.mark.parametrize(
@@ -238,6 +274,26 @@ class TestClosestQueries:
         r, c = result
         assert populated_ants.map[r][c] == UNSEEN
 
+    def test_unseen_frontier_borders_seen_land(self, fresh_ants: Ants) -> None:
+        fresh_ants.update("turn 1\na 5 5 0\nw 4 5")
+        assert fresh_ants.unseen_frontier == {(5, 4), (5, 6), (6, 5)}
+        fresh_ants.update("turn 2\na 5 6 0")
+        assert (5, 6) not in fresh_ants.unseen_frontier
+        assert {(4, 6), (5, 7), (6, 6)} <= fresh_ants.unseen_frontier
+
+    def test_closest_unseen_walks_around_water(self, fresh_ants: Ants) -> None:
+        # a seen corridor along row 5 walled by water on row 4; the square
+        # straight north of (5, 5) is water, so the nearest unseen by walking
+        # distance is beside the ant, not through the wall
+        fresh_ants.update(
+            "turn 1\n"
+            + "".join("w 4 {0}\nl 5 {0}\nw 6 {0}\n".format(c) for c in range(2, 9))
+            + "a 5 5 0\n"
+        )
+        assert fresh_ants.closest_unseen(5, 5) == (5, 1)
+        assert fresh_ants.closest_unseen(5, 5, filter=[(5, 1)]) == (5, 9)
+        assert fresh_ants.closest_unseen(5, 5, filter=[(5, 1), (5, 9)]) is None
+
 
 class TestRender:
     def test_render_text_map_shape(self, populated_ants: Ants) -> None:
@@ -247,3 +303,129 @@ class TestRender:
         for line in lines:
             assert line.startswith("# ")
             assert len(line) == 2 + populated_ants.width
+
+
+class TestBufferedIO:
+    def test_read_blocks_splits_on_ready_and_go_across_chunks(self) -> None:
+        stream = io.BytesIO(SETUP_DATA.encode() + b"turn 1\na 1 1 0\r\nGO\r\nturn 2\n")
+        stream.read1 = lambda size: stream.read(7)  # type: ignore[method-assign]
+        blocks = list(Ants.read_blocks(stream))
+        assert [terminator for _, terminator in blocks] == ["ready", "go"]
+        assert blocks[0][0].startswith("turn 0\nloadtime 3000\n")
+        assert blocks[1][0] == "turn 1\na 1 1 0\r\n"
+
+    def test_read_blocks_scans_each_byte_once(self, monkeypatch) -> None:
+        data = b"turn 1\n" + b"f 2 2\n" * 2000 + b"go\nturn 2\nREADY\n"
+        stream = io.BytesIO(data)
+        stream.read1 = lambda size: stream.read(3)  # type: ignore[method-assign]
+        scanned = []
+        pattern = bot_ants.BLOCK_END
+
+        class Counted:
+            def finditer(self, buf, pos=0):
+                scanned.append(len(buf) - pos)
+                return pattern.finditer(buf, pos)
+
+        monkeypatch.setattr(bot_ants, "BLOCK_END", Counted())
+        blocks = list(Ants.read_blocks(stream))
+        assert [terminator for _, terminator in blocks] == ["go", "ready"]
+        assert blocks[0][0].count("f 2 2\n") == 2000
+        assert sum(scanned) < 4 * len(data)
+
+    def test_orders_are_written_once_per_turn(self, fresh_ants: Ants, monkeypatch) -> None:
+        writes = []
+        monkeypatch.setattr(
+            bot_ants.sys, "stdout", SimpleNamespace(write=writes.append, flush=lambda: None)
+        )
+        fresh_ants.issue_order((1, 1, "n"))
+        fresh_ants.issue_order((5, 5, "e"))
+        assert writes == []
+        fresh_ants.finish_turn()
+        assert writes == ["o 1 1 n\no 5 5 e\ngo\n"]
+        fresh_ants.finish_turn()
+        assert writes[-1] == "go\n"
+
+    def test_run_drives_the_bot_and_stops_at_eof(self, monkeypatch) -> None:
+        seen = []
+
+        class Bot:
+            def do_turn(self, ants):
+                seen.append(ants.my_ants())
+                ants.issue_order((1, 1, "s"))
+
+        stdin = io.TextIOWrapper(io.BytesIO((SETUP_DATA + "turn 1\na 1 1 0\ngo\n").encode()))
+        out = io.StringIO()
+        monkeypatch.setattr(bot_ants.sys, "stdin", stdin)
+        monkeypatch.setattr(bot_ants.sys, "stdout", out)
+        Ants.run(Bot())
+        assert seen == [[(1, 1)]]
+        assert out.getvalue() == "go\no 1 1 s\ngo\n"
+
+
+class TestTurnScheduler:
+    @staticmethod
+    def _spent(ants: Ants, ms: float) -> None:
+        ants.turn_start = time.monotonic() - ms / 1000
+
+    def test_time_remaining_counts_down_from_turn_start(self, fresh_ants: Ants) -> None:
+        assert fresh_ants.time_remaining() == 1000
+        self._spent(fresh_ants, 400)
+        assert 500 < fresh_ants.time_remaining() <= 600
+
+    def test_phases_run_in_the_order_added(self, fresh_ants: Ants) -> None:
+        ran = []
+        scheduler = TurnScheduler()
+        scheduler.add("b", lambda: ran.append("b"), LOW)
+        scheduler.add("a", lambda: ran.append("a"), ESSENTIAL)
+        scheduler.add("c", lambda: ran.append("c"))
+        scheduler.run(fresh_ants)
+        assert ran == ["b", "a", "c"]
+        assert set(scheduler.last) == {"a", "b", "c"}
+        assert scheduler.phases == []
+
+    def test_low_priority_phases_give_way_when_time_is_short(
+        self, fresh_ants: Ants
+    ) -> None:
+        ran = []
+        scheduler = TurnScheduler()
+        for name, priority in (("must", ESSENTIAL), ("high", HIGH), ("low", LOW)):
+            scheduler.add(name, lambda name=name: ran.append(name), priority)
+        # 300ms left: above HIGH's 100+50ms reserve, below LOW's 350+50ms
+        self._spent(fresh_ants, 700)
+        scheduler.run(fresh_ants)
+        assert ran == ["must", "high"]
+        assert scheduler.totals["low"] == [0.0, 0, 1, 0]
+        # past the deadline only ESSENTIAL phases still run
+        scheduler.add("must", lambda: ran.append("must"), ESSENTIAL)
+        scheduler.add("normal", lambda: ran.append("normal"), NORMAL)
+        self._spent(fresh_ants, 1200)
+        scheduler.run(fresh_ants)
+        assert ran == ["must", "high", "must"]
+
+    def test_generator_phases_are_cut_between_units(self, fresh_ants: Ants) -> None:
+        done = []
+
+        def explore():
+            for unit in range(5):
+                done.append(unit)
+                if unit == 1:
+                    self._spent(fresh_ants, 900)
+                yield
+
+        scheduler = TurnScheduler()
+        scheduler.add("explore", explore, LOW)
+        self._spent(fresh_ants, 0)
+        scheduler.run(fresh_ants)
+        assert done == [0, 1]
+        assert scheduler.totals["explore"][1:] == [1, 0, 1]
+
+    def test_debug_stream_gets_one_line_per_turn(self, fresh_ants: Ants) -> None:
+        fresh_ants.debug = io.StringIO()
+        scheduler = TurnScheduler()
+        scheduler.add("food", lambda: None, HIGH)
+        scheduler.add("explore", lambda: None, LOW)
+        self._spent(fresh_ants, 700)
+        scheduler.run(fresh_ants)
+        line = fresh_ants.debug.getvalue()
+        assert line.startswith("# phases turn=1 left=")
+        assert " food=" in line and line.endswith(" explore=skipped\n")
@@ -6,6 +6,7 @@
 from __future__ import annotations
 
 import importlib.util
+import random
 import sys
 from pathlib import Path
 
@@ -64,6 +65,9 @@ class FakeAnts:
         self._food = list(food)
         self.my_ants_calls = 0
         self.orders = []
+        self.turntime = 1000
+        self.debug = None
+        self.new_water = list(water)
         self.map = [[LAND for _ in range(width)] for _ in range(height)]
         for row, col in water:
             self.map[row][col] = WATER
@@ -74,6 +78,9 @@ class FakeAnts:
         for (row, col), owner in self._enemy_ants:
             self.map[row][col] = owner
 
+    def time_remaining(self):
+        return self.turntime
+
     def my_ants(self):
         self.my_ants_calls += 1
         return list(self._my_ants)
@@ -176,6 +183,56 @@ def test_stale_visibility_edges_become_exploration_targets() -> None:
     assert all(bot.visibility_map[row][col] >= 5 for row, col in edges)
 
 
+def test_spread_influence_matches_the_per_source_reference() -> None:
+    rng = random.Random(7)
+    cells = [(row, col) for row in range(12) for col in range(15)]
+    rng.shuffle(cells)
+    water, my_ants, rest = cells[:30], cells[30:40], cells[40:]
+    ants = FakeAnts(height=12, width=15, my_ants=my_ants, water=water)
+    bot = InfluenceBot()
+    bot.do_setup(ants)
+    amap = [row[:] for row in ants.map]
+    bot.set_stop_locs(amap)
+    kinds = [
+        FOOD,
+        influence_module.MY_HILL,
+        influence_module.WAVE,
+        influence_module.NOT_VISIBLE,
+        influence_module.ENEMY_HILL,
+    ]
+    locs = []
+    for (row, col), kind in zip(rest[:25], kinds * 5):
+        amap[row][col] = kind
+        locs.append(((row, col), influence_module.influence_values.get(kind, 50)))
+    bot.add_to_map(amap, my_ants, influence_module.ALLY_ANT)
+
+    expected = bot.add_influence(
+        bot.map_zeros(amap), bot.map_influence(amap, locs, my_ants)
+    )
+    spread = bot.map_zeros(amap)
+    for start in range(0, len(locs), 4):
+        bot.spread_influence(spread, amap, locs[start : start + 4], my_ants)
+
+    assert spread == expected
+
+    # the same sources replayed from cached hill fields
+    for (row, col), _ in locs[::3]:
+        cell = row * 15 + col
+        bot._fields[cell] = influence_module.HillField(bot._bfs, cell)
+    cached = bot.spread_influence(bot.map_zeros(amap), amap, locs, my_ants)
+
+    assert cached == expected
+
+    # water found later is patched into the fields, not just ignored
+    bot.set_stop_locs(amap, rest[25:40])
+    expected = bot.add_influence(
+        bot.map_zeros(amap), bot.map_influence(amap, locs, my_ants)
+    )
+    cached = bot.spread_influence(bot.map_zeros(amap), amap, locs, my_ants)
+
+    assert cached == expected
+
+
 def test_orders_reserve_unique_destinations() -> None:
     ants = FakeAnts(
         my_ants=[(7, 6), (7, 8)],
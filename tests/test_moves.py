@@ -0,0 +1,53 @@
+"""Unit tests for src/bots/moves.py — colony-wide conflict-free moves."""
+
+from __future__ import annotations
+
+import random
+
+from bots.moves import resolve
+
+
+class TestResolve:
+    def test_contested_square_goes_to_the_earlier_ant(self) -> None:
+        assert resolve([0, 2], [[1, 0], [1, 3, 2]]) == [1, 3]
+
+    def test_best_rank_is_served_before_order(self) -> None:
+        # ant 0 only wants 5 as a second choice; ant 1 wants it first
+        assert resolve([0, 1], [[4, 5, 0], [5, 1]]) == [4, 5]
+        assert resolve([0, 1, 4], [[4, 5, 0], [5, 1], [4]]) == [0, 5, 4]
+
+    def test_ant_moves_into_a_square_being_vacated(self) -> None:
+        # a chain: 0 -> 1 -> 2 -> 3, resolved whatever the order
+        assert resolve([0, 1, 2], [[1], [2], [3]]) == [1, 2, 3]
+        assert resolve([2, 1, 0], [[3], [2], [1]]) == [3, 2, 1]
+
+    def test_square_of_an_ant_that_stays_is_refused(self) -> None:
+        assert resolve([0, 1], [[1, 7, 0], [1]]) == [7, 1]
+
+    def test_swaps_and_rotations_give_way(self) -> None:
+        assert resolve([0, 1], [[1, 0], [0, 1]]) == [0, 1]
+        assert resolve([0, 1, 2], [[1, 5], [2], [0, 6]]) == [1, 2, 6]
+
+    def test_choices_after_staying_are_ignored(self) -> None:
+        assert resolve([0, 1], [[1, 0, 9], [1, 0]]) == [0, 1]
+        assert resolve([0], [[]]) == [0]
+
+    def test_random_colonies_never_collide(self) -> None:
+        rng = random.Random(3)
+        for _ in range(300):
+            width = rng.randint(2, 8)
+            cells = list(range(width * width))
+            starts = rng.sample(cells, rng.randint(1, len(cells)))
+            choices = []
+            for start in starts:
+                row, col = divmod(start, width)
+                moves = [
+                    ((row + d_row) % width) * width + (col + d_col) % width
+                    for d_row, d_col in ((-1, 0), (1, 0), (0, 1), (0, -1), (0, 0))
+                ]
+                rng.shuffle(moves)
+                choices.append(moves)
+            dest = resolve(starts, choices)
+            assert len(set(dest)) == len(dest)
+            for start, ranked, cell in zip(starts, choices, dest):
+                assert cell in ranked[: ranked.index(start) + 1]
@@ -121,3 +121,25 @@ def test_json_mode_suppresses_result_line(tmp_path: Path) -> None:
         "RESULT line should be suppressed in --json mode"
     )
     assert '"score"' in proc.stdout, "JSON output should include scores"
+
+
+LATENCY_RE = re.compile(
+    r"^LATENCY\s+game_id=(?P<gid>\d+)\s+turntime=(?P<turntime>\d+)(?P<players>.*)$",
+    re.MULTILINE,
+)
+
+
+def test_latency_line_has_one_sample_per_turn(tmp_path: Path) -> None:
+    """The ``LATENCY`` line follows ``RESULT`` with per-turn response times."""
+
+    proc = _play_short(tmp_path, turns=20)
+    assert proc.returncode == 0
+    result = list(RESULT_RE.finditer(proc.stdout))[-1]
+    m = list(LATENCY_RE.finditer(proc.stdout))[-1]
+    assert int(m.group("turntime")) == 1000
+    seats = dict(re.findall(r"player_(\d+)=([\d.,]*)", m.group("players")))
+    assert sorted(seats) == ["0", "1"]
+    for raw in seats.values():
+        samples = [float(v) for v in raw.split(",") if v]
+        assert len(samples) == int(result.group("turns"))
+        assert all(0.0 <= v < 1000.0 for v in samples)
@@ -0,0 +1,102 @@
+"""Tests for ``scripts/replay_miner.py`` on small hand-built replays."""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MINER = REPO_ROOT / "scripts" / "replay_miner.py"
+
+
+@pytest.fixture(scope="module")
+def miner():
+    spec = importlib.util.spec_from_file_location("replay_miner_under_test", MINER)
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["replay_miner_under_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
+
+def _replay(turns=6):
+    """Two players on a 20x20 torus walking towards each other along row 0."""
+
+    return {
+        "players": 2,
+        "turns": 10,
+        "viewradius2": 16,
+        "map": {"rows": 20, "cols": 20, "data": ["." * 20] * 20},
+        "engine_seed": 11,
+        "player_seed": 12,
+        # [row, col, spawn, end, owner, orders]
+        "ants": [
+            [0, 0, 0, turns + 1, 0, "eeeeee"[:turns]],
+            [0, 10, 0, 4, 1, "www"],
+            [5, 5, 2, turns + 1, 0, "-" * (turns - 2)],
+        ],
+        # [row, col, start, end, owner?]
+        "food": [[5, 5, 0, 2, 0], [9, 9, 0, turns + 1], [8, 8, 1, 5, 1]],
+        # [row, col, owner, end]
+        "hills": [[0, 0, 0, turns + 1], [0, 10, 1, 5]],
+        "scores": [[1] * (turns + 1), [1] * 6],
+    }
+
+
+def test_interval_aggregates(miner):
+    replay = _replay()
+    length = miner.game_length(replay)
+    assert length == 6
+    assert miner.ants_alive(replay, length) == [
+        [1, 1, 2, 2, 2, 2, 2],
+        [1, 1, 1, 1, 0, 0, 0],
+    ]
+    assert miner.food_taken(replay, length) == [
+        [0, 0, 1, 1, 1, 1, 1],
+        [0, 0, 0, 0, 0, 1, 1],
+    ]
+    assert miner.hills_razed(replay, length) == [
+        [0] * 7,
+        [0, 0, 0, 0, 0, 1, 1],
+    ]
+
+
+def test_first_contact_replays_orders_across_the_wrap(miner):
+    # Player 0 walks east from col 0, player 1 west from col 10: gap 10, 8, 6, 4.
+    replay = _replay()
+    assert miner.first_contact(replay, 6) == [3, 3]
+    # Five columns apart through the wrap, moving in step: never in view.
+    replay["ants"][1][:2] = [0, 15]
+    replay["ants"][1][5] = "eee"
+    assert miner.first_contact(replay, 6) == [None, None]
+    replay["ants"][0][5] = "------"
+    assert miner.first_contact(replay, 6) == [1, 1]
+
+
+def test_mine_writes_one_row_per_metric_and_skips_mined_replays(miner, tmp_path):
+    logs = tmp_path / "logs"
+    logs.mkdir()
+    (logs / "1.replay").write_text(
+        json.dumps({"game_id": 1, "playernames": ["a", "b"], "replaydata": _replay()})
+    )
+    (logs / "2.replay").write_text("{truncated")
+    store = miner.ResultStore(tmp_path / "metrics.jsonl")
+    paths = miner.expand_inputs([str(logs)])
+
+    assert miner.mine(paths, store) == {"mined": 1, "skipped": 0, "failed": 1}
+    rows = list(miner.iter_records(store.path))
+    assert [r["metric"] for r in rows] == list(miner.METRICS) + ["error"]
+    assert rows[0]["game_id"] == 1 and rows[0]["map_size"] == "20x20"
+
+    assert miner.mine(paths, store) == {"mined": 0, "skipped": 2, "failed": 0}
+    (logs / "3.replay").write_text(json.dumps(_replay(turns=4)))
+    assert miner.mine(miner.expand_inputs([str(logs)]), store, jobs=2) == {
+        "mined": 1,
+        "skipped": 2,
+        "failed": 0,
+    }
+    assert len(store.path.read_text().splitlines()) == 2 * len(miner.METRICS) + 1
@@ -0,0 +1,96 @@
+"""Tests for bot-free re-simulation in ``scripts/resimulate.py``.
+
+One real game is played with ``--log_output``; re-running it from either
+order source must reproduce the recorded scores and replay exactly.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+RESIMULATE = REPO_ROOT / "scripts" / "resimulate.py"
+PLAYGAME = REPO_ROOT / "src" / "tools" / "playgame.py"
+SAMPLE_DIR = REPO_ROOT / "src" / "sample_bots" / "python"
+MAP_4P = REPO_ROOT / "maps" / "maze" / "maze_04p_01.map"
+
+
+@pytest.fixture(scope="module")
+def resim():
+    spec = importlib.util.spec_from_file_location("resimulate_under_test", RESIMULATE)
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["resimulate_under_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
+
+@pytest.fixture(scope="module")
+def recorded_game(tmp_path_factory) -> Path:
+    log_dir = tmp_path_factory.mktemp("resim")
+    bots = ("HunterBot.py", "ErrorBot.py", "GreedyBot.py", "LeftyBot.py")
+    cmd = [
+        sys.executable, str(PLAYGAME),
+        "--engine_seed", "9",
+        "--player_seed", "9",
+        "--game", "3",
+        "--log_output",
+        "--end_wait=0.1",
+        "--log_dir", str(log_dir),
+        "--turns", "80",
+        "--map_file", str(MAP_4P),
+        "--nolaunch",
+    ] + ["{0} {1}".format(sys.executable, SAMPLE_DIR / bot) for bot in bots]
+    proc = subprocess.run(cmd, cwd=str(REPO_ROOT), capture_output=True, text=True, timeout=180)
+    assert proc.returncode == 0, proc.stderr[-500:]
+    return log_dir / "3.replay"
+
+
+@pytest.mark.parametrize("orders", ["replay", "logs"])
+def test_resimulation_reproduces_recorded_game(resim, recorded_game, orders):
+    result = json.loads(recorded_game.read_text())
+    assert "crashed" in result["status"]  # ErrorBot exercises the kill path
+    check = resim.resimulate(recorded_game, orders=orders)
+    assert check.scores_match and check.replay_match, check.detail
+    assert check.turns == result["game_length"]
+
+
+def test_changed_orders_are_reported(resim, recorded_game, tmp_path):
+    result = json.loads(recorded_game.read_text())
+    ants = result["replaydata"]["ants"]
+    ant = next(a for a in ants if a[3] > 20 and a[5].count("-") < len(a[5]))
+    i = next(k for k, c in enumerate(ant[5]) if c != "-")
+    ant[5] = ant[5][:i] + "-" + ant[5][i + 1:]
+    tampered = tmp_path / "3.replay"
+    tampered.write_text(json.dumps(result))
+    check = resim.resimulate(tampered)
+    assert not check.replay_match
+    assert "ants" in check.detail
+    assert resim.main([str(tampered)]) == 1
+
+
+def test_map_text_restores_hills_and_water(resim):
+    replay = {
+        "players": 2,
+        "map": {"rows": 2, "cols": 4, "data": ["a%.*", "..%b"]},
+        "hills": [[0, 0, 0, 5], [1, 3, 1, 3]],
+    }
+    assert resim.map_text(replay) == "rows 2\ncols 4\nplayers 2\nm 0%..\nm ..%1\n"
+
+
+def test_orders_from_replay_track_position_across_the_wrap(resim):
+    replay = {
+        "players": 2,
+        "map": {"rows": 4, "cols": 4},
+        "ants": [[0, 0, 0, 4, 0, "n-w"], [3, 3, 1, 3, 1, "s"]],
+    }
+    assert resim.orders_from_replay(replay) == [
+        {1: ["o 0 0 n"], 3: ["o 3 0 w"]},
+        {2: ["o 3 3 s"]},
+    ]
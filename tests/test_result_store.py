@@ -0,0 +1,127 @@
+"""Tests for the append-only JSONL result store in ``scripts/result_store.py``."""
+
+from __future__ import annotations
+
+import importlib.util
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+STORE = REPO_ROOT / "scripts" / "result_store.py"
+
+
+@pytest.fixture(scope="module")
+def store_mod():
+    spec = importlib.util.spec_from_file_location("result_store_under_test", STORE)
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
+
+PLAYGAME_JSON = {
+    "score": [4, 1],
+    "status": ["survived", "eliminated"],
+    "game_length": 321,
+    "replaydata": {"hive_history": [[0, 2, 7], [0, 1, 3]], "turns": 321},
+}
+
+
+def test_append_moves_replay_to_sidecar(store_mod, tmp_path):
+    store = store_mod.ResultStore(tmp_path / "games.jsonl")
+    record = store_mod.record_from_playgame(PLAYGAME_JSON, test_name="vs X", game=1)
+    store.append(record, replaydata=PLAYGAME_JSON["replaydata"])
+
+    lines = (tmp_path / "games.jsonl").read_text().splitlines()
+    assert len(lines) == 1
+    row = json.loads(lines[0])
+    assert "replaydata" not in row
+    assert row["result"] == "WIN"
+    assert row["food_collected"] == 7
+    assert row["enemy_food_collected"] == 3
+    sidecar = Path(row["replay_path"])
+    assert sidecar.parent == tmp_path / "games_replays"
+    assert json.loads(sidecar.read_text()) == PLAYGAME_JSON["replaydata"]
+
+
+def test_embedded_replaydata_is_never_inlined(store_mod, tmp_path):
+    store = store_mod.ResultStore(tmp_path / "games.jsonl")
+    store.append({"test_name": "t", "game": 1, "replaydata": {"hive_history": []}})
+    row = json.loads((tmp_path / "games.jsonl").read_text())
+    assert "replaydata" not in row
+    assert row["food_collected"] == 0
+    assert "replay_path" in row
+
+
+def test_existing_replay_is_referenced_not_copied(store_mod, tmp_path):
+    store = store_mod.ResultStore(tmp_path / "games.jsonl")
+    replay = tmp_path / "17.replay"
+    store.append(
+        {"test_name": "t", "game": 1},
+        replaydata={"hive_history": [[5], [6]]},
+        replay_path=replay,
+    )
+    row = json.loads((tmp_path / "games.jsonl").read_text())
+    assert row["replay_path"] == str(replay)
+    assert row["food_collected"] == 5
+    assert not (tmp_path / "games_replays").exists()
+
+
+@pytest.mark.parametrize(
+    "scores,statuses,expected",
+    [
+        ([1, 3], ["crashed", "survived"], "LOSS"),
+        ([1, 3], ["survived", "timeout"], "WIN"),
+        ([2, 2], ["survived", "survived"], "DRAW"),
+        ([1, 3], ["survived", "survived"], "LOSS"),
+    ],
+)
+def test_record_classification_matches_shell_runners(store_mod, scores, statuses, expected):
+    record = store_mod.record_from_playgame({"score": scores, "status": statuses})
+    assert record["result"] == expected
+
+
+def test_loader_projects_columns_and_skips_torn_line(store_mod, tmp_path):
+    path = tmp_path / "games.jsonl"
+    store = store_mod.ResultStore(path)
+    for game, result in enumerate(["WIN", "LOSS", "WIN"], start=1):
+        store.append(
+            {"test_name": "vs X", "game": game, "result": result, "turns": 100 * game,
+             "extra": "x" * 100}
+        )
+    with open(path, "a") as fh:
+        fh.write('{"test_name": "vs X", "ga')
+
+    columns = store_mod.load_columns(path, ("game", "result"))
+    assert columns == {"game": [1, 2, 3], "result": ["WIN", "LOSS", "WIN"]}
+
+    rows = store_mod.aggregate_tests(store_mod.iter_records(path))
+    assert rows == [
+        {
+            "test_name": "vs X",
+            "timestamp": None,
+            "games": 3,
+            "wins": 2,
+            "losses": 1,
+            "draws": 0,
+            "win_rate": pytest.approx(200 / 3),
+            "average_turns": 200.0,
+        }
+    ]
+
+
+def test_cli_appends_playgame_json(store_mod, tmp_path, monkeypatch):
+    monkeypatch.setattr(sys, "stdin", io.StringIO(json.dumps(PLAYGAME_JSON)))
+    path = tmp_path / "stats.jsonl"
+    assert store_mod.main(
+        ["append", str(path), "--test-name", "vs X", "--game", "2", "--time", "1.5"]
+    ) == 0
+    row = json.loads(path.read_text())
+    assert row["game"] == 2
+    assert row["time"] == 1.5
+    assert row["turns"] == 321
+    assert row["food_collected"] == 7
@@ -0,0 +1,53 @@
+"""Unit tests for src/bots/spatial.py — the torus spatial hash."""
+
+from __future__ import annotations
+
+import random
+
+from bots.spatial import SpatialHash
+
+
+class TestSpatialHash:
+    def test_neighbours_wrap_around_the_torus(self) -> None:
+        near = SpatialHash(50, 50, 9)
+        near.add(49, 49, "corner")
+        near.add(25, 25, "middle")
+        assert list(near.near(0, 0)) == ["corner"]
+
+    def test_small_maps_visit_each_bucket_once(self) -> None:
+        near = SpatialHash(10, 4, 9)
+        near.add(0, 0, "a")
+        near.add(9, 3, "b")
+        assert sorted(near.near(5, 2)) == ["a", "b"]
+
+    def test_clear_keeps_the_layout(self) -> None:
+        near = SpatialHash(20, 20, 5)
+        near.add(3, 3, "a")
+        near.clear()
+        assert list(near.near(3, 3)) == []
+        near.add(3, 4, "b")
+        assert list(near.near(3, 3)) == ["b"]
+
+    def test_random_items_within_radius_are_found(self) -> None:
+        rng = random.Random(7)
+        for _ in range(100):
+            rows, cols = rng.randint(1, 60), rng.randint(1, 60)
+            radius = rng.randint(1, 12)
+            near = SpatialHash(rows, cols, radius)
+            items = [
+                (rng.randrange(rows), rng.randrange(cols))
+                for _ in range(rng.randint(0, 40))
+            ]
+            for item in items:
+                near.add(*item, item)
+            row, col = rng.randrange(rows), rng.randrange(cols)
+            found = list(near.near(row, col))
+            assert len(found) == len(set(map(id, found)))
+            for item in items:
+                d_row = abs(item[0] - row)
+                d_col = abs(item[1] - col)
+                if (
+                    min(d_row, rows - d_row) <= radius
+                    and min(d_col, cols - d_col) <= radius
+                ):
+                    assert any(other is item for other in found)
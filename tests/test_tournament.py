@@ -0,0 +1,166 @@
+"""Tests for the Elo tournament runner in ``scripts/tournament.py``.
+
+Real games are stubbed out; these cover pool/map discovery, the pairing
+schedules, the rating maths and checkpoint resume.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import json
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+TOURNAMENT = REPO_ROOT / "scripts" / "tournament.py"
+
+
+@pytest.fixture(scope="module")
+def tournament_mod():
+    spec = importlib.util.spec_from_file_location("tournament_under_test", TOURNAMENT)
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["tournament_under_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+    return mod
+
+
+def test_default_pool_covers_project_and_sample_bots(tournament_mod):
+    names = [e.name for e in tournament_mod.default_pool()]
+    assert names[:3] == ["AdvancedBot", "InfluenceBot", "XathisBot"]
+    for sample in ("RandomBot", "HoldBot", "HunterBot", "GreedyBot", "LeftyBot"):
+        assert sample in names
+    for faulty in ("ErrorBot", "InvalidBot", "TimeoutBot"):
+        assert faulty not in names
+
+
+def test_discover_maps_reads_player_counts(tournament_mod):
+    maps = tournament_mod.discover_maps(tournament_mod.DEFAULT_MAP_GLOBS)
+    by_path = {m.path: m.players for m in maps}
+    assert by_path["maps/maze/maze_02p_01.map"] == 2
+    assert by_path["maps/multi_hill_maze/maze_08p_01.map"] == 8
+    assert by_path["maps/random_walk/random_walk_10p_01.map"] == 10
+
+
+def test_elo_winner_gains_and_total_is_conserved(tournament_mod):
+    elo = tournament_mod.EloRatings(["a", "b", "c"])
+    elo.update(["a", "b", "c"], [0, 1, 2])
+    assert elo.ratings["a"] > 1500 > elo.ratings["c"]
+    assert elo.ratings["b"] == pytest.approx(1500)
+    assert sum(elo.ratings.values()) == pytest.approx(4500)
+    assert elo.games == {"a": 1, "b": 1, "c": 1}
+
+
+def test_elo_draw_between_equals_changes_nothing(tournament_mod):
+    elo = tournament_mod.EloRatings(["a", "b"])
+    elo.update(["a", "b"], [0, 0])
+    assert elo.ratings == {"a": 1500, "b": 1500}
+
+
+def _pool(tournament_mod, n):
+    return [tournament_mod.Entrant("bot{0}".format(i), "b{0}.py".format(i)) for i in range(n)]
+
+
+def test_round_robin_plays_every_pair_and_skips_oversized_maps(tournament_mod):
+    pool = _pool(tournament_mod, 4)
+    maps = [
+        tournament_mod.MapInfo("two.map", 2),
+        tournament_mod.MapInfo("four.map", 4),
+        tournament_mod.MapInfo("eight.map", 8),
+    ]
+    specs = tournament_mod.round_robin_round(pool, maps, random.Random(1), 36)
+    two = [s for s in specs if s["map"] == "two.map"]
+    assert len(two) == 6
+    assert {frozenset(s["seats"]) for s in two} == {
+        frozenset(p) for p in [("bot0", "bot1"), ("bot0", "bot2"), ("bot0", "bot3"),
+                               ("bot1", "bot2"), ("bot1", "bot3"), ("bot2", "bot3")]
+    }
+    assert len([s for s in specs if s["map"] == "four.map"]) == 1
+    assert not [s for s in specs if s["map"] == "eight.map"]
+    assert len({s["key"] for s in specs}) == len(specs)
+
+
+def test_round_robin_samples_when_over_group_cap(tournament_mod):
+    pool = _pool(tournament_mod, 8)
+    maps = [tournament_mod.MapInfo("four.map", 4)]
+    specs = tournament_mod.round_robin_round(pool, maps, random.Random(1), 10)
+    assert len(specs) == 10
+
+
+def test_swiss_seats_neighbours_by_rating(tournament_mod):
+    pool = _pool(tournament_mod, 5)
+    elo = tournament_mod.EloRatings([e.name for e in pool])
+    for i, entrant in enumerate(pool):
+        elo.ratings[entrant.name] = 1500 + 100 * i
+    maps = [tournament_mod.MapInfo("two.map", 2)]
+    specs = tournament_mod.swiss_round(pool, maps, elo, 0, random.Random(1))
+    assert len(specs) == 2  # one bye in a five-bot pool
+    groups = [frozenset(s["seats"]) for s in specs]
+    assert frozenset({"bot4", "bot3"}) in groups or frozenset({"bot3", "bot2"}) in groups
+
+
+def test_tournament_checkpoint_resumes(tournament_mod, monkeypatch, tmp_path):
+    played = []
+
+    def fake_play(self, spec):
+        played.append(spec["key"])
+        if len(played) == 3:
+            raise KeyboardInterrupt
+        return tournament_mod.GameOutcome(
+            game_id=0,
+            turns=10,
+            winner="player_0",
+            players=[
+                {"idx": i, "name": n, "rank": i, "score": 0, "status": "survived"}
+                for i, n in enumerate(spec["seats"])
+            ],
+            duration_s=0.0,
+        )
+
+    monkeypatch.setattr(tournament_mod.Tournament, "play", fake_play)
+    monkeypatch.setattr(tournament_mod, "file_sha256", lambda _path: "x")
+
+    def make():
+        return tournament_mod.Tournament(
+            pool=_pool(tournament_mod, 3),
+            maps=[tournament_mod.MapInfo("two.map", 2)],
+            pairing="round-robin",
+            rounds=2,
+            turns=10,
+            master_seed=5,
+            output_dir=tmp_path,
+            log_dir=tmp_path,
+        )
+
+    with pytest.raises(KeyboardInterrupt):
+        make().run()
+    state = json.loads((tmp_path / tournament_mod.CHECKPOINT_NAME).read_text())
+    assert state["round"] == 0
+    assert len(state["completed"]) == 2
+
+    ratings = make().run()
+    # 3 pairs x 2 rounds; the interrupted game is replayed once.
+    assert len(played) == 7
+    assert sum(ratings.games.values()) == 12
+    lines = (tmp_path / tournament_mod.GAMES_NAME).read_text().splitlines()
+    assert len(lines) == 6
+
+
+def test_checkpoint_rejects_changed_configuration(tournament_mod, monkeypatch, tmp_path):
+    monkeypatch.setattr(tournament_mod, "file_sha256", lambda _path: "x")
+    kwargs = dict(
+        pool=_pool(tournament_mod, 2),
+        maps=[tournament_mod.MapInfo("two.map", 2)],
+        pairing="round-robin",
+        rounds=1,
+        turns=10,
+        output_dir=tmp_path,
+        log_dir=tmp_path,
+    )
+    first = tournament_mod.Tournament(master_seed=1, **kwargs)
+    first.save_checkpoint({"round": 0, "current": None, "completed": []})
+    with pytest.raises(ValueError):
+        tournament_mod.Tournament(master_seed=2, **kwargs).load_checkpoint()
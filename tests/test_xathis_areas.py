@@ -0,0 +1,210 @@
+"""Tests for ``_create_areas`` / ``_clean_areas`` (Strategy.java:678-777)."""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Tuple
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_BOTS = REPO_ROOT / "src" / "bots"
+
+
+@pytest.fixture(scope="module")
+def xb():
+    prev_ants = sys.modules.get("ants")
+    spec_helper = importlib.util.spec_from_file_location("ants", SRC_BOTS / "ants.py")
+    assert spec_helper and spec_helper.loader
+    helper = importlib.util.module_from_spec(spec_helper)
+    sys.modules["ants"] = helper
+    spec_helper.loader.exec_module(helper)  # type: ignore[union-attr]
+
+    spec = importlib.util.spec_from_file_location(
+        "xathis_areas_under_test", SRC_BOTS / "xathis_bot.py"
+    )
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["xathis_areas_under_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+
+    yield mod
+
+    if prev_ants is None:
+        sys.modules.pop("ants", None)
+    else:
+        sys.modules["ants"] = prev_ants
+
+
+def _build(xb, rows: int = 60, cols: int = 60,
+           my_at: Iterable[Tuple[int, int]] = (),
+           enemy_at: Iterable[Tuple[int, int]] = (),
+           water_at: Iterable[Tuple[int, int]] = (),
+           my_hills_at: Iterable[Tuple[int, int]] = ()):
+    bot = xb.XathisBot()
+    bot._init_tiles(rows, cols)
+
+    for (r, c) in water_at:
+        bot.graph.add_water(r * cols + c)
+
+    for (r, c) in my_hills_at:
+        t = bot.tiles[r][c]
+        t.is_hill = True
+        t.hill_player = 0
+        bot.my_hills.append(t)
+
+    for (r, c) in my_at:
+        t = bot.tiles[r][c]
+        t.tile_type = 0
+        a = xb.Ant(t)
+        t.ant = a
+        t.old_ant = a
+        bot.my_ants.append(a)
+
+    for (r, c) in enemy_at:
+        t = bot.tiles[r][c]
+        t.tile_type = 1
+        a = xb.Ant(t)
+        t.ant = a
+        t.old_ant = a
+        bot.enemy_ants.append(a)
+    return bot
+
+
+def _java_areas(xb, bot):
+    """``Strategy.createAreas`` transcribed: merge areas while searching.
+
+    Returns (areas as sets of ant tiles with their side, tiles in my area,
+    border tiles).
+    """
+    area_of = {}
+    start = {}
+    dist = {}
+    queue = deque()
+    in_mine = set()
+    for ant in bot.enemy_ants + bot.my_ants:
+        t = ant.tile
+        mine = ant in bot.my_ants
+        if mine:
+            in_mine.add(t)
+        start[t] = t
+        dist[t] = 0
+        area_of[t] = {"ants": {t}, "mine": mine, "tiles": [t]}
+        queue.append(t)
+    while queue:
+        tile = queue.popleft()
+        if dist[tile] >= xb.AREA_DIST:
+            break
+        for n in tile.neighbors:
+            if n in start:
+                a, b = area_of[start[n]], area_of[start[tile]]
+                if start[n] is not start[tile] and a["mine"] == b["mine"] and a is not b:
+                    b["ants"] |= a["ants"]
+                    b["tiles"] += a["tiles"]
+                    for t in a["ants"]:
+                        area_of[t] = b
+            else:
+                start[n] = start[tile]
+                dist[n] = dist[tile] + 1
+                area_of[start[n]]["tiles"].append(n)
+                if area_of[start[n]]["mine"]:
+                    in_mine.add(n)
+                queue.append(n)
+    areas = {id(a): a for a in area_of.values()}.values()
+    hills = set(bot.my_hills)
+    border = set()
+    for area in areas:
+        if not area["mine"]:
+            continue
+        if not (hills & set(area["tiles"]) or len(area["ants"]) >= 5):
+            continue
+        for t in area["tiles"]:
+            if any(n not in in_mine for n in t.neighbors):
+                border.add(t)
+    shapes = {(frozenset(a["ants"]), a["mine"]) for a in areas}
+    return shapes, in_mine, border
+
+
+def _tiles(bot):
+    return [t for row in bot.tiles for t in row]
+
+
+def _flags(bot):
+    in_mine = {t for t in _tiles(bot) if t.is_in_my_area}
+    border = {t for t in _tiles(bot) if t.is_border}
+    return in_mine, border
+
+
+class TestCreateAreas:
+    def test_no_ants_no_areas(self, xb):
+        bot = _build(xb)
+        bot._create_areas()
+        assert bot.areas == [] and bot.fight_areas == []
+
+    def test_lone_ant_is_not_a_fight_area(self, xb):
+        bot = _build(xb, my_at=[(30, 30)])
+        bot._create_areas()
+        assert len(bot.areas) == 1
+        assert bot.fight_areas == []
+        assert bot.tiles[30][50].is_in_my_area  # 20 steps away
+        assert not bot.tiles[30][51].is_in_my_area
+        assert not any(t.is_border for t in _tiles(bot))
+
+    def test_hill_makes_a_fight_area(self, xb):
+        bot = _build(xb, my_at=[(30, 30)], my_hills_at=[(30, 31)])
+        bot._create_areas()
+        (area,) = bot.fight_areas
+        assert area.hill is bot.tiles[30][31]
+        # the edge of the search is the border
+        assert bot.tiles[30][50].is_border
+        assert not bot.tiles[30][49].is_border
+        assert bot.tiles[30][50] in area.border
+
+    def test_waves_that_meet_share_an_area(self, xb):
+        bot = _build(xb, rows=80, cols=80, my_at=[(10, 10), (10, 40)])
+        bot._create_areas()
+        assert len(bot.areas) == 1
+        assert len(bot.areas[0].ants) == 2
+
+    def test_enemy_territory_bounds_mine(self, xb):
+        mine = [(30, 20 + i) for i in range(5)]
+        bot = _build(xb, my_at=mine, enemy_at=[(30, 34)])
+        bot._create_areas()
+        (area,) = bot.fight_areas
+        assert len(area.ants) == 5
+        # my ant at (30, 24), the enemy at (30, 34): (30, 29) is a tie,
+        # which the enemy wins as in the Java
+        assert bot.tiles[30][28].is_border
+        assert not bot.tiles[30][29].is_in_my_area
+
+    def test_clean_areas_clears_the_flags(self, xb):
+        bot = _build(xb, my_at=[(30, 30)], my_hills_at=[(30, 31)])
+        bot._create_areas()
+        bot._clean_areas()
+        assert _flags(bot) == (set(), set())
+
+    def test_matches_the_java_merge_while_searching(self, xb):
+        rng = random.Random(11)
+        for _ in range(25):
+            rows, cols = rng.randint(20, 70), rng.randint(20, 70)
+            cells = rng.sample([(r, c) for r in range(rows) for c in range(cols)], 40)
+            n_mine, n_enemy = rng.randint(0, 15), rng.randint(0, 15)
+            bot = _build(
+                xb, rows, cols,
+                my_at=cells[:n_mine],
+                enemy_at=cells[n_mine:n_mine + n_enemy],
+                water_at=cells[30:],
+                my_hills_at=cells[n_mine + n_enemy:n_mine + n_enemy + rng.randint(0, 2)],
+            )
+            bot._create_areas()
+            shapes, in_mine, border = _java_areas(xb, bot)
+            assert {
+                (frozenset(a.tile for a in area.ants), area.is_mine)
+                for area in bot.areas
+            } == shapes
+            assert _flags(bot) == (in_mine, border)
+            assert {t for area in bot.fight_areas for t in area.border} == border
@@ -53,18 +53,7 @@ def xb():
 
 def _make_bot(xb, rows: int = 20, cols: int = 30):
     bot = xb.XathisBot()
-    bot.rows = rows
-    bot.cols = cols
-    bot.tiles = [[xb.Tile(r, c) for c in range(cols)] for r in range(rows)]
-    for r in range(rows):
-        for c in range(cols):
-            t = bot.tiles[r][c]
-            t.neighbors = (
-                bot.tiles[(r - 1) % rows][c],
-                bot.tiles[r][(c + 1) % cols],
-                bot.tiles[(r + 1) % rows][c],
-                bot.tiles[r][(c - 1) % cols],
-            )
+    bot._init_tiles(rows, cols)
     return bot
 
 
@@ -201,6 +190,21 @@ class TestCombatDistances:
         c = bot.tiles[19][0]
         assert bot.is_alpha_dist(a, c) is True
 
+    @pytest.mark.parametrize("rows,cols", [(30, 30), (7, 9), (4, 3)])
+    def test_tables_match_the_distance_rules(self, xb, rows, cols):
+        # Small maps wrap several offsets onto one cell.
+        bot = _make_bot(xb, rows, cols)
+        graph = bot.graph
+        a = bot.tiles[1][2]
+        for b in (t for row in bot.tiles for t in row):
+            dr, dc = bot.dist_row(a, b), bot.dist_col(a, b)
+            assert bot.is_alpha_dist(a, b) is ((dc <= 1 and dr <= 2) or (dc == 2 and dr <= 1))
+            assert bot.is_beta_dist(a, b) is (dr + dc <= 4 and 4 not in (dr, dc))
+            assert bot.is_gamma_dist(a, b) is (dr + dc <= 5 and 5 not in (dr, dc))
+            offset = graph.offset(a.index, b.index)
+            assert graph.dist2[offset] == dr * dr + dc * dc
+            assert graph.in_close[offset] == (dr <= 5 and dc <= 5)
+
 
 # ---------------------------------------------------------------------------
 # Tile graph wiring
@@ -217,6 +221,17 @@ class TestTileGraph:
             4 * 5 + 0,   # north wrap
         }
 
+    def test_tile_views_are_made_once_on_first_use(self, xb):
+        bot = _make_bot(xb, 6, 7)
+        graph = bot.graph
+        assert graph._views == [None] * 42
+        t = bot.tiles[2][3]
+        assert graph.tile(2 * 7 + 3) is t is bot.tiles[2][-4]
+        assert sum(v is not None for v in graph._views) == 1
+        assert [u.col for u in bot.tiles[5]] == list(range(7))
+        with pytest.raises(IndexError):
+            bot.tiles[0][7]
+
     def test_dir_to_cardinal(self, xb):
         bot = _make_bot(xb, 10, 10)
         t = bot.tiles[5][5]
@@ -234,6 +249,26 @@ class TestTileGraph:
         # tile (5,0) → tile (5,9) : "west" (wraps)
         assert bot.tiles[5][0].dir_to(bot.tiles[5][9]) == "w"
 
+    def test_water_is_pruned_as_it_is_reported(self, xb):
+        ants = xb.Ants()
+        ants.setup("rows 10\ncols 10\nready\n")
+        ants.update("turn 1\nw 2 2\na 5 5 0\n")
+        bot = xb.XathisBot()
+        bot._ensure_initialized(ants)
+        # setup prunes what is already on the map; new_water repeats it
+        bot._prune_water_neighbors(ants.new_water)
+        assert bot.tiles[2][2].tile_type == xb.WATER
+        assert bot.tiles[2][2].neighbors == ()
+        assert bot.tiles[2][2] not in bot.tiles[2][3].neighbors
+        ants.update("turn 2\nw 2 2\nw 2 3\na 5 5 0\n")
+        assert ants.new_water == [(2, 3)]
+        bot._prune_water_neighbors(ants.new_water)
+        assert bot.tiles[2][4].neighbors == (
+            bot.tiles[1][4],
+            bot.tiles[2][5],
+            bot.tiles[3][4],
+        )
+
 
 # ---------------------------------------------------------------------------
 # Ant / Mission data classes
@@ -0,0 +1,259 @@
+"""Tests for ``_distribute`` (Strategy.java:990-1014)."""
+
+from __future__ import annotations
+
+import importlib.util
+import random
+import sys
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterable, Tuple
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_BOTS = REPO_ROOT / "src" / "bots"
+
+
+@pytest.fixture(scope="module")
+def xb():
+    prev_ants = sys.modules.get("ants")
+    spec_helper = importlib.util.spec_from_file_location("ants", SRC_BOTS / "ants.py")
+    assert spec_helper and spec_helper.loader
+    helper = importlib.util.module_from_spec(spec_helper)
+    sys.modules["ants"] = helper
+    spec_helper.loader.exec_module(helper)  # type: ignore[union-attr]
+
+    spec = importlib.util.spec_from_file_location(
+        "xathis_distribute_under_test", SRC_BOTS / "xathis_bot.py"
+    )
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["xathis_distribute_under_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+
+    yield mod
+
+    if prev_ants is None:
+        sys.modules.pop("ants", None)
+    else:
+        sys.modules["ants"] = prev_ants
+
+
+class StubEngine:
+    def __init__(self):
+        self.orders = []
+
+    def issue_order(self, o):
+        self.orders.append(o)
+
+
+def _build(xb, rows: int = 40, cols: int = 40,
+           my_at: Iterable[Tuple[int, int]] = (),
+           enemy_at: Iterable[Tuple[int, int]] = (),
+           water_at: Iterable[Tuple[int, int]] = (),
+           my_hills_at: Iterable[Tuple[int, int]] = ()):
+    bot = xb.XathisBot()
+    bot._init_tiles(rows, cols)
+    bot._engine = StubEngine()
+    bot.start_time_ms = time.monotonic() * 1000.0
+    bot.time_budget_ms = 60_000.0
+
+    for (r, c) in water_at:
+        bot.graph.add_water(r * cols + c)
+
+    for (r, c) in my_hills_at:
+        t = bot.tiles[r][c]
+        t.is_hill = True
+        t.hill_player = 0
+        bot.my_hills.append(t)
+
+    for (r, c) in my_at:
+        t = bot.tiles[r][c]
+        t.tile_type = 0
+        a = xb.Ant(t)
+        t.ant = a
+        t.old_ant = a
+        bot.my_ants.append(a)
+
+    for (r, c) in enemy_at:
+        t = bot.tiles[r][c]
+        t.tile_type = 1
+        a = xb.Ant(t)
+        t.ant = a
+        t.old_ant = a
+        bot.enemy_ants.append(a)
+    bot._init_turn()
+    return bot
+
+
+def _ball(start, check):
+    dist = {start: 0}
+    queue = deque([start])
+    while queue:
+        tile = queue.popleft()
+        if dist[tile] >= check:
+            continue
+        for n in tile.neighbors:
+            if n not in dist:
+                dist[n] = dist[tile] + 1
+                queue.append(n)
+    return dist
+
+
+def _naive_distribute(xb, bot, only_near_enemy):
+    """``_distribute`` with every ball searched afresh for every step."""
+    check = xb.DISTRIBUTE_CHECK_DIST
+    enemy = {}
+    for e in bot.enemy_ants:
+        for t, d in _ball(e.tile, check).items():
+            enemy[t] = min(d, enemy.get(t, d))
+    for ant in list(bot.my_ants):
+        if ant.has_moved or not (ant.num_close_enemies > 0 or not only_near_enemy):
+            continue
+        covered = set()
+        for other in bot.my_ants:
+            if other is not ant:
+                covered |= set(_ball(other.tile, check))
+        best, best_value = None, 0
+        for dest in ant.tile.neighbors:
+            if not dest.is_free() or dest.is_hill or not bot.is_tile_safe(ant, dest):
+                continue
+            value = sum(
+                10 + check - d
+                for t, d in _ball(dest, check).items()
+                if d > 0 and t not in covered and enemy.get(t, check + 1) > d
+            )
+            if best is None or value > best_value:
+                best, best_value = dest, value
+        if best is not None:
+            bot.do_move(ant.tile, best, "distribute")
+
+
+class TestDistribute:
+    def test_idle_ant_on_hill_moves_off(self, xb):
+        bot = _build(xb, my_at=[(10, 10)], my_hills_at=[(10, 10)])
+        bot._distribute(only_near_enemy=False)
+        assert bot.my_ants[0].has_moved is True
+        assert [o[:2] for o in bot._engine.orders] == [(10, 10)]
+
+    def test_ants_step_apart(self, xb):
+        bot = _build(xb, my_at=[(20, 20), (20, 22)])
+        bot._distribute(only_near_enemy=False)
+        assert bot._engine.orders == [(20, 20, "w"), (20, 22, "e")]
+
+    def test_only_near_enemy_skips_quiet_ants(self, xb):
+        bot = _build(xb, my_at=[(20, 20), (5, 5)], enemy_at=[(20, 27)])
+        bot._calc_num_close_enemies()
+        assert [a.num_close_enemies for a in bot.my_ants] == [1, 0]
+        bot._distribute(only_near_enemy=True)
+        assert [o[:2] for o in bot._engine.orders] == [(20, 20)]
+
+    def test_enemy_reach_is_not_counted(self, xb):
+        bot = _build(xb, my_at=[(20, 20)], enemy_at=[(20, 30)])
+        bot._distribute(only_near_enemy=False)
+        assert bot._engine.orders == [(20, 20, "w")]
+
+    def test_moved_ant_stays(self, xb):
+        bot = _build(xb, my_at=[(20, 20)])
+        bot.my_ants[0].has_moved = True
+        bot._distribute(only_near_enemy=False)
+        assert bot._engine.orders == []
+
+    def test_no_moves_once_time_is_up(self, xb):
+        bot = _build(xb, my_at=[(20, 20)])
+        bot.time_budget_ms = -1.0
+        bot._distribute(only_near_enemy=False)
+        assert bot._engine.orders == []
+
+    def test_matches_searching_every_step(self, xb):
+        rng = random.Random(5)
+        moved = 0
+        for _ in range(15):
+            # past 2 * check + 3 squares a side, so no short odd cycle
+            # wraps round the torus
+            rows, cols = rng.randint(22, 50), rng.randint(22, 50)
+            cells = rng.sample([(r, c) for r in range(rows) for c in range(cols)], 90)
+            n_mine, n_enemy = rng.randint(1, 25), rng.randint(0, 6)
+            world = dict(
+                rows=rows,
+                cols=cols,
+                my_at=cells[:n_mine],
+                enemy_at=cells[n_mine:n_mine + n_enemy],
+                water_at=cells[40:],
+                my_hills_at=cells[n_mine + n_enemy:n_mine + n_enemy + 2],
+            )
+            bots = _build(xb, **world), _build(xb, **world)
+            for a in bots[0].my_ants[::3]:
+                a.has_moved = True
+            for a in bots[1].my_ants[::3]:
+                a.has_moved = True
+            bots[0]._distribute(only_near_enemy=False)
+            _naive_distribute(xb, bots[1], only_near_enemy=False)
+            assert bots[0]._engine.orders == bots[1]._engine.orders
+            moved += len(bots[0]._engine.orders)
+        assert moved > 100
+
+    def test_matches_searching_every_step_on_small_odd_maps(self, xb):
+        # 17 x 19, as submission_test/test.map: odd loops round the torus
+        # fit in a ball
+        rng = random.Random(6)
+        for _ in range(40):
+            cells = rng.sample([(r, c) for r in range(17) for c in range(19)], 60)
+            n_mine, n_enemy = rng.randint(1, 12), rng.randint(0, 4)
+            world = dict(
+                rows=17,
+                cols=19,
+                my_at=cells[:n_mine],
+                enemy_at=cells[n_mine:n_mine + n_enemy],
+                water_at=cells[30:],
+            )
+            bots = _build(xb, **world), _build(xb, **world)
+            for bot in bots:
+                bot._calc_num_close_enemies()
+            bots[0]._distribute(only_near_enemy=True)
+            _naive_distribute(xb, bots[1], only_near_enemy=True)
+            bots[0]._distribute(only_near_enemy=False)
+            _naive_distribute(xb, bots[1], only_near_enemy=False)
+            assert bots[0]._engine.orders == bots[1]._engine.orders
+
+    def test_searches_each_ant_once_a_turn(self, xb):
+        bot = _build(xb, my_at=[(20, 20), (20, 22), (5, 5)], enemy_at=[(20, 27)])
+        bot._calc_num_close_enemies()
+        bfs = bot._grid()
+        searches = []
+        search = bfs.search
+
+        def counted(*args, **kwargs):
+            searches.append(args[0])
+            return search(*args, **kwargs)
+
+        bfs.search = counted
+        bot._distribute(only_near_enemy=True)
+        # the enemies, then one search per ant of mine
+        assert len(searches) == 1 + 3
+        bot._distribute(only_near_enemy=False)
+        assert len(searches) == 1 + 3
+
+    def test_balls_follow_ants_moved_between_calls(self, xb):
+        rng = random.Random(8)
+        for _ in range(10):
+            cells = rng.sample([(r, c) for r in range(40) for c in range(40)], 60)
+            world = dict(my_at=cells[:20], enemy_at=cells[20:24], water_at=cells[30:])
+            bots = _build(xb, **world), _build(xb, **world)
+            for bot in bots:
+                bot._calc_num_close_enemies()
+            bots[0]._distribute(only_near_enemy=True)
+            _naive_distribute(xb, bots[1], only_near_enemy=True)
+            for bot in bots:
+                for ant in bot.my_ants[::2]:
+                    if ant.has_moved:
+                        continue
+                    for n in ant.tile.neighbors:
+                        if n.is_free() and not n.is_hill:
+                            bot.do_move(ant.tile, n, "explore")
+                            break
+            bots[0]._distribute(only_near_enemy=False)
+            _naive_distribute(xb, bots[1], only_near_enemy=False)
+            assert bots[0]._engine.orders == bots[1]._engine.orders
@@ -50,25 +50,10 @@ def _build(xb, rows: int = 40, cols: int = 40,
            food_at: Iterable[Tuple[int, int]] = (),
            water_at: Iterable[Tuple[int, int]] = ()):
     bot = xb.XathisBot()
-    bot.rows = rows
-    bot.cols = cols
-    bot.tiles = [[xb.Tile(r, c) for c in range(cols)] for r in range(rows)]
-    for r in range(rows):
-        for c in range(cols):
-            bot.tiles[r][c].neighbors = (
-                bot.tiles[(r - 1) % rows][c],
-                bot.tiles[r][(c + 1) % cols],
-                bot.tiles[(r + 1) % rows][c],
-                bot.tiles[r][(c - 1) % cols],
-            )
+    bot._init_tiles(rows, cols)
 
     for (r, c) in water_at:
-        t = bot.tiles[r][c]
-        t.tile_type = -4  # WATER
-        for n in t.neighbors:
-            if t in n.neighbors:
-                n.neighbors = tuple(x for x in n.neighbors if x is not t)
-        t.neighbors = ()
+        bot.graph.add_water(r * cols + c)
 
     for (r, c) in my_at:
         t = bot.tiles[r][c]
@@ -128,9 +113,11 @@ class TestInitExplore:
     def test_isReached_is_cleaned_up(self, xb):
         bot = _build(xb, my_at=[(20, 20)])
         bot._init_explore()
-        for row in bot.tiles:
-            for t in row:
-                assert t.is_reached is False
+        # Tiles carry no reached flag; the shared searcher's marks from
+        # _init_explore must not survive into the next search.
+        bfs = bot._grid()
+        bfs.search([0], max_depth=0)
+        assert [i for i in range(bfs.size) if bfs.reached(i)] == [0]
 
     def test_two_ants_overlap(self, xb):
         # Two ants 4 tiles apart. The intersection of their 10-radius
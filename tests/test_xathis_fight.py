@@ -4,6 +4,7 @@ Covers:
  * Battle-resolution math (1v1 mutual-destruction, 2v1 favourable trade).
  * Gamma-group BFS pulls in a connected component.
  * Group-size cap skips pathological branches (no orders).
+ * FightSearch agrees with an exhaustive max-min, and resolves 6v6/8v8.
  * Fight prefers favourable trades (kills more enemies than mine die).
  * Time-budget bail does not crash.
 """
@@ -11,6 +12,8 @@ Covers:
 from __future__ import annotations
 
 import importlib.util
+import itertools
+import random
 import sys
 from pathlib import Path
 from typing import Iterable, List, Tuple
@@ -59,25 +62,10 @@ def _build(xb, rows: int = 40, cols: int = 40,
            enemy_at: Iterable[Tuple[int, int]] = (),
            water_at: Iterable[Tuple[int, int]] = ()):
     bot = xb.XathisBot()
-    bot.rows = rows
-    bot.cols = cols
-    bot.tiles = [[xb.Tile(r, c) for c in range(cols)] for r in range(rows)]
-    for r in range(rows):
-        for c in range(cols):
-            bot.tiles[r][c].neighbors = (
-                bot.tiles[(r - 1) % rows][c],
-                bot.tiles[r][(c + 1) % cols],
-                bot.tiles[(r + 1) % rows][c],
-                bot.tiles[r][(c - 1) % cols],
-            )
+    bot._init_tiles(rows, cols)
 
     for (r, c) in water_at:
-        t = bot.tiles[r][c]
-        t.tile_type = -4
-        for n in t.neighbors:
-            if t in n.neighbors:
-                n.neighbors = tuple(x for x in n.neighbors if x is not t)
-        t.neighbors = ()
+        bot.graph.add_water(r * cols + c)
 
     for (r, c) in my_at:
         t = bot.tiles[r][c]
@@ -244,27 +232,98 @@ class TestFightIntegration:
         )
 
     def test_group_too_big_falls_through(self, xb):
-        # 5v5: bigger than FIGHT_GROUP_CAP (=4). _fight should skip and
-        # not crash; no orders issued from the fight phase.
+        # 9v9: bigger than FIGHT_GROUP_CAP (=8). _fight skips the group,
+        # so no ant is committed and no orders are issued.
+        bot = _build(
+            xb,
+            my_at=[(10, 10 + i) for i in range(9)],
+            enemy_at=[(12, 10 + i) for i in range(9)],
+        )
+        bot._init_turn()
+        bot._fight()
+        assert bot._engine.orders == []
+        assert not any(a.has_moved for a in bot.my_ants)
+
+    @pytest.mark.parametrize("size", [6, 8])
+    def test_big_groups_are_resolved(self, xb, size):
+        # 6v6 and 8v8 lines facing each other used to fall through; the
+        # search now commits every ant of the group.
         bot = _build(
             xb,
-            my_at=[(10, 10 + i) for i in range(5)],
-            enemy_at=[(11, 10 + i) for i in range(5)],
+            my_at=[(10, 10 + 2 * i) for i in range(size)],
+            enemy_at=[(13, 10 + 2 * i) for i in range(size)],
         )
         bot._init_turn()
         bot._fight()
-        # Either no orders or some "stay" commits — but no exception.
-        # We don't check exact orders since the safety gates may produce
-        # them in larger refactorings; just ensure the bot didn't crash.
+        assert all(a.has_moved for a in bot.my_ants)
 
-    def test_branching_cap_prevents_explosion(self, xb):
-        # Even within group cap, the branching-product cap keeps us out
-        # of trouble. We just verify no crash.
+    def test_node_cap_keeps_best_so_far(self, xb):
+        # Past max_nodes the search stops but still has a joint move.
         bot = _build(
             xb,
             my_at=[(10, 10), (10, 12), (12, 10), (12, 12)],
             enemy_at=[(10, 11), (11, 11), (11, 10), (11, 12)],
         )
         bot._init_turn()
-        bot._fight()
-        # No crash; exact orders depend on minimax outcome. Pass.
+        search = _search(xb, bot, max_nodes=100)
+        best = search.run()
+        assert search.complete is False
+        assert best is not None
+        assert len(best) == 4
+
+
+def _options(bot, ants):
+    tiles = {a.tile for a in ants}
+    return [bot._fight_options(a, tiles - {a.tile}) for a in ants]
+
+
+def _search(xb, bot, max_nodes: int = 10 ** 9):
+    """A FightSearch over every ant in ``bot``, as ``_fight_group`` builds it."""
+    tile = bot.graph.tile
+    return xb.FightSearch(
+        [[t.index for t in opts] for opts in _options(bot, bot.my_ants)],
+        [[t.index for t in opts] for opts in _options(bot, bot.enemy_ants)],
+        alpha=lambda mine, theirs: bot.is_alpha_dist(tile(mine), tile(theirs)),
+        hill_bonus={},
+        max_nodes=max_nodes,
+    )
+
+
+def _joint_moves(options):
+    """Collision-free joint moves, the first ant's option varying fastest."""
+    for combo in itertools.product(*reversed(options)):
+        combo = combo[::-1]
+        if len(set(combo)) == len(combo):
+            yield combo
+
+
+# ===========================================================================
+# FightSearch
+# ===========================================================================
+class TestFightSearch:
+    def test_matches_exhaustive_max_min(self, xb):
+        rng = random.Random(5)
+        for _ in range(40):
+            cells = rng.sample(
+                [(r, c) for r in range(10, 16) for c in range(10, 16)],
+                rng.randint(2, 5),
+            )
+            split = rng.randint(1, len(cells) - 1)
+            bot = _build(xb, my_at=cells[:split], enemy_at=cells[split:])
+            bot._init_turn()
+            search = _search(xb, bot)
+            best = search.run()
+
+            my_options = _options(bot, bot.my_ants)
+            enemy_options = _options(bot, bot.enemy_ants)
+            want, want_value = None, None
+            for mine in _joint_moves(my_options):
+                worst = min(
+                    bot._eval_battle(mine, theirs)
+                    for theirs in _joint_moves(enemy_options)
+                )
+                if want_value is None or worst > want_value:
+                    want, want_value = mine, worst
+            assert search.complete is True
+            assert best == tuple(t.index for t in want)
+            assert search.value == want_value
@@ -56,25 +56,10 @@ def _build(xb, rows: int = 40, cols: int = 40,
            my_hills_at: Iterable[Tuple[int, int]] = (),
            enemy_hills_at: Iterable[Tuple[int, int]] = ()):
     bot = xb.XathisBot()
-    bot.rows = rows
-    bot.cols = cols
-    bot.tiles = [[xb.Tile(r, c) for c in range(cols)] for r in range(rows)]
-    for r in range(rows):
-        for c in range(cols):
-            bot.tiles[r][c].neighbors = (
-                bot.tiles[(r - 1) % rows][c],
-                bot.tiles[r][(c + 1) % cols],
-                bot.tiles[(r + 1) % rows][c],
-                bot.tiles[r][(c - 1) % cols],
-            )
+    bot._init_tiles(rows, cols)
 
     for (r, c) in water_at:
-        t = bot.tiles[r][c]
-        t.tile_type = -4
-        for n in t.neighbors:
-            if t in n.neighbors:
-                n.neighbors = tuple(x for x in n.neighbors if x is not t)
-        t.neighbors = ()
+        bot.graph.add_water(r * cols + c)
 
     for (r, c) in my_hills_at:
         t = bot.tiles[r][c]
@@ -52,26 +52,11 @@ def _build(xb, rows: int = 30, cols: int = 30,
            water_at: Iterable[Tuple[int, int]] = ()):
     """Build a XathisBot with fully-set-up tile graph and ant lists."""
     bot = xb.XathisBot()
-    bot.rows = rows
-    bot.cols = cols
-    bot.tiles = [[xb.Tile(r, c) for c in range(cols)] for r in range(rows)]
-    for r in range(rows):
-        for c in range(cols):
-            bot.tiles[r][c].neighbors = (
-                bot.tiles[(r - 1) % rows][c],
-                bot.tiles[r][(c + 1) % cols],
-                bot.tiles[(r + 1) % rows][c],
-                bot.tiles[r][(c - 1) % cols],
-            )
+    bot._init_tiles(rows, cols)
 
     # Water
     for (r, c) in water_at:
-        t = bot.tiles[r][c]
-        t.tile_type = -4  # WATER
-        for n in t.neighbors:
-            if t in n.neighbors:
-                n.neighbors = tuple(x for x in n.neighbors if x is not t)
-        t.neighbors = ()
+        bot.graph.add_water(r * cols + c)
 
     # Ants
     for (r, c) in my_at:
@@ -342,34 +327,3 @@ class TestFood:
             r, c, d = orders[0]
             assert (r, c) == (5, 5)
             assert d in ("n", "s")  # going around the wall
-
-
-# ===========================================================================
-# Off-hill fallback
-# ===========================================================================
-class TestOffHillFallback:
-    def test_idle_ant_on_hill_moves_off(self, xb):
-        bot = _build(xb, my_at=[(10, 10)])
-        bot.tiles[10][10].is_hill = True
-        bot.tiles[10][10].hill_player = 0
-        bot.my_hills.append(bot.tiles[10][10])
-
-        orders = []
-
-        class StubEngine:
-            def issue_order(self, order):
-                orders.append(order)
-
-        bot._engine = StubEngine()
-        bot._init_turn()
-        bot._off_hill_fallback()
-        assert bot.my_ants[0].has_moved is True
-        assert len(orders) == 1
-        assert orders[0][:2] == (10, 10)
-
-    def test_idle_ant_off_hill_does_not_move(self, xb):
-        bot = _build(xb, my_at=[(10, 10)])
-        # No hill at (10,10), just an ant standing there.
-        bot._init_turn()
-        bot._off_hill_fallback()
-        assert bot.my_ants[0].has_moved is False
@@ -0,0 +1,215 @@
+"""Tests for the mission phase (Strategy.java:256-336).
+
+Missions keep the path they planned and walk it turn after turn; these
+tests check when that path is reused and when a new one is planned.
+"""
+
+from __future__ import annotations
+
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Tuple
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+SRC_BOTS = REPO_ROOT / "src" / "bots"
+
+
+@pytest.fixture(scope="module")
+def xb():
+    prev_ants = sys.modules.get("ants")
+    spec_helper = importlib.util.spec_from_file_location("ants", SRC_BOTS / "ants.py")
+    assert spec_helper and spec_helper.loader
+    helper = importlib.util.module_from_spec(spec_helper)
+    sys.modules["ants"] = helper
+    spec_helper.loader.exec_module(helper)  # type: ignore[union-attr]
+
+    spec = importlib.util.spec_from_file_location(
+        "xathis_missions_under_test", SRC_BOTS / "xathis_bot.py"
+    )
+    assert spec and spec.loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules["xathis_missions_under_test"] = mod
+    spec.loader.exec_module(mod)  # type: ignore[union-attr]
+
+    yield mod
+
+    if prev_ants is None:
+        sys.modules.pop("ants", None)
+    else:
+        sys.modules["ants"] = prev_ants
+
+
+class StubEngine:
+    def __init__(self):
+        self.orders = []
+
+    def issue_order(self, o):
+        self.orders.append(o)
+
+
+def _build(xb, rows: int = 40, cols: int = 40,
+           my_at: Iterable[Tuple[int, int]] = (),
+           enemy_at: Iterable[Tuple[int, int]] = (),
+           water_at: Iterable[Tuple[int, int]] = ()):
+    bot = xb.XathisBot()
+    bot._init_tiles(rows, cols)
+    bot._engine = StubEngine()
+    bot.start_time_ms = time.monotonic() * 1000.0
+    bot.time_budget_ms = 60_000.0
+
+    for (r, c) in water_at:
+        bot.graph.add_water(r * cols + c)
+
+    for (r, c) in my_at:
+        t = bot.tiles[r][c]
+        t.tile_type = 0
+        a = xb.Ant(t)
+        t.ant = a
+        t.old_ant = a
+        bot.my_ants.append(a)
+
+    for (r, c) in enemy_at:
+        t = bot.tiles[r][c]
+        t.tile_type = 1
+        a = xb.Ant(t)
+        t.ant = a
+        t.old_ant = a
+        bot.enemy_ants.append(a)
+    bot._init_turn()
+    return bot
+
+
+def _mission(xb, bot, target):
+    """Give the only ant a mission toward ``target``, as if created on
+    this turn, with ``_update_mission`` turned off."""
+    (ant,) = bot.my_ants
+    m = xb.Mission(bot.tiles[target[0]][target[1]], ant.tile, bot.turn)
+    bot.missions.append(m)
+    bot._update_mission = lambda m: None
+    return ant, m
+
+
+def _next_turn(bot, ant):
+    """Start a new turn with ``ant`` where it ended the last one."""
+    ant.has_moved = False
+    ant.has_mission = False
+    ant.mission = None
+    bot.turn += 1
+    bot._init_missions()
+
+
+def _count_plans(bot):
+    calls = []
+    plan = bot._plan_path
+
+    def counted(ant, target):
+        calls.append(target)
+        return plan(ant, target)
+
+    bot._plan_path = counted
+    return calls
+
+
+class TestMissions:
+    def test_path_is_planned_once_and_walked(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        calls = _count_plans(bot)
+        for _ in range(5):
+            _next_turn(bot, ant)
+            bot._do_missions()
+        assert ant.tile is bot.tiles[20][15]
+        assert len(calls) == 1
+        assert m.is_removed
+        assert [d for (_, _, d) in bot._engine.orders] == ["e"] * 5
+
+    def test_new_water_on_the_path_replans(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        calls = _count_plans(bot)
+        _next_turn(bot, ant)
+        bot._do_missions()
+        bot.graph.add_water(20 * 40 + 13)
+        _next_turn(bot, ant)
+        bot._do_missions()
+        assert len(calls) == 2
+        assert 20 * 40 + 13 not in m.path
+
+    def test_water_off_the_path_keeps_it(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        calls = _count_plans(bot)
+        _next_turn(bot, ant)
+        bot._do_missions()
+        bot.graph.add_water(5 * 40 + 5)
+        _next_turn(bot, ant)
+        bot._do_missions()
+        assert len(calls) == 1
+
+    def test_blocked_step_replans(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        calls = _count_plans(bot)
+        _next_turn(bot, ant)
+        bot._do_missions()
+        step = bot.tiles[20][12]
+        step.tile_type = -3  # food on the next step
+        _next_turn(bot, ant)
+        bot._do_missions()
+        assert len(calls) == 2
+        assert ant.tile is not step and ant.has_moved
+
+    def test_unreachable_target_drops_the_mission(self, xb):
+        walls = [(20 + dr, 30 + dc) for dr in (-1, 0, 1) for dc in (-1, 0, 1)
+                 if (dr, dc) != (0, 0)]
+        bot = _build(xb, my_at=[(20, 10)], water_at=walls)
+        ant, m = _mission(xb, bot, (20, 30))
+        _next_turn(bot, ant)
+        bot._do_missions()
+        assert m.is_removed and not ant.has_moved
+
+    def test_no_replan_once_time_is_up(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        calls = _count_plans(bot)
+        bot.time_budget_ms = -1.0
+        _next_turn(bot, ant)
+        bot._do_missions()
+        assert calls == []
+        # the mission waits for a turn with time left
+        assert not m.is_removed and ant.has_moved
+        assert bot._engine.orders == []
+
+    def test_init_drops_missions_without_an_ant(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        lost = xb.Mission(bot.tiles[5][5], bot.tiles[6][6], bot.turn)
+        done = xb.Mission(bot.tiles[5][5], ant.tile, bot.turn)
+        done.is_removed = True
+        bot.missions += [lost, done]
+        _next_turn(bot, ant)
+        assert bot.missions == [m]
+        assert ant.mission is m and ant.has_mission
+
+    def test_other_phases_cancel_the_mission(self, xb):
+        bot = _build(xb, my_at=[(20, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        _next_turn(bot, ant)
+        bot.do_move(ant.tile, bot.tiles[21][10], "food")
+        assert m.is_removed and not ant.has_mission
+
+    def test_enemy_on_the_mission_tile_is_not_given_it(self, xb):
+        bot = _build(xb, my_at=[(20, 10)], enemy_at=[(10, 10)])
+        ant, m = _mission(xb, bot, (20, 15))
+        m.curr_tile = bot.tiles[10][10]
+        _next_turn(bot, ant)
+        bot._do_missions()
+        (enemy,) = bot.enemy_ants
+        assert not enemy.has_mission and enemy.mission is None
+        assert bot.missions == []
+        assert bot._engine.orders == []
+        assert bot.tiles[10][10].ant is enemy